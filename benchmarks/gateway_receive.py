@@ -0,0 +1,202 @@
+"""
+Benchmarks how gateway messages are decompressed and parsed by
+:meth:`discord.gateway.DiscordWebSocket.received_message`, reporting the time
+taken and the peak memory allocated for each event.
+
+Frames are read from a recording if one is given with ``--frames``, otherwise a
+mix of typical events is generated and compressed the same way that Discord does.
+A recording is the binary frames of one ``zlib-stream`` connection in the order
+that they were received, each one prefixed with its length as a 4-byte big-endian
+integer. ``--save`` writes the generated frames in this format.
+
+Usage::
+
+    python benchmarks/gateway_receive.py
+    python benchmarks/gateway_receive.py --frames recording.bin --repeat 5
+
+Measuring the memory allocated needs Python 3.9 or later.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import struct
+import time
+import tracemalloc
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from discord import utils
+from discord.gateway import _ZlibStreamDecompressor
+
+
+ZLIB_SUFFIX = b'\x00\x00\xff\xff'
+
+
+def _user(rng: random.Random) -> Dict[str, Any]:
+    return {
+        'id': str(rng.getrandbits(60)),
+        'username': ''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(4, 16))),
+        'discriminator': '0',
+        'avatar': '%032x' % rng.getrandbits(128),
+        'global_name': None,
+    }
+
+
+def generate_events(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    events: List[Dict[str, Any]] = []
+    for sequence in range(1, count + 1):
+        roll = rng.random()
+        if roll < 0.01:
+            # GUILD_CREATE, big enough to be split over several frames
+            data = {
+                'id': str(rng.getrandbits(60)),
+                'name': 'guild',
+                'members': [{'user': _user(rng), 'roles': [], 'joined_at': '2022-01-01T00:00:00+00:00'} for _ in range(500)],
+                'channels': [{'id': str(rng.getrandbits(60)), 'type': 0, 'name': 'channel', 'position': i} for i in range(50)],
+            }
+            event = 'GUILD_CREATE'
+        elif roll < 0.6:
+            data = {
+                'id': str(rng.getrandbits(60)),
+                'channel_id': str(rng.getrandbits(60)),
+                'guild_id': str(rng.getrandbits(60)),
+                'author': _user(rng),
+                'content': ' '.join('word' for _ in range(rng.randint(1, 40))),
+                'timestamp': '2022-01-01T00:00:00+00:00',
+                'embeds': [],
+                'attachments': [],
+                'mentions': [],
+                'mention_roles': [],
+            }
+            event = 'MESSAGE_CREATE'
+        elif roll < 0.9:
+            data = {'user': {'id': str(rng.getrandbits(60))}, 'status': 'online', 'activities': [], 'client_status': {'desktop': 'online'}}
+            event = 'PRESENCE_UPDATE'
+        else:
+            data = {'user_id': str(rng.getrandbits(60)), 'channel_id': str(rng.getrandbits(60)), 'timestamp': 1640995200}
+            event = 'TYPING_START'
+        events.append({'op': 0, 's': sequence, 't': event, 'd': data})
+    return events
+
+
+def compress_events(events: Iterable[Dict[str, Any]], frame_size: int = 16 * 1024) -> List[bytes]:
+    # one sync flushed message per event, split into frames no bigger than frame_size
+    compressor = zlib.compressobj()
+    frames: List[bytes] = []
+    for event in events:
+        message = compressor.compress(json.dumps(event).encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        frames.extend(message[i:i + frame_size] for i in range(0, len(message), frame_size))
+    return frames
+
+
+def read_frames(path: str) -> List[bytes]:
+    frames: List[bytes] = []
+    with open(path, 'rb') as fp:
+        while header := fp.read(4):
+            (length,) = struct.unpack('>I', header)
+            frames.append(fp.read(length))
+    return frames
+
+
+def write_frames(path: str, frames: Iterable[bytes]) -> None:
+    with open(path, 'wb') as fp:
+        for frame in frames:
+            fp.write(struct.pack('>I', len(frame)))
+            fp.write(frame)
+
+
+def legacy_receiver() -> Callable[[bytes], Optional[Any]]:
+    # the receive path from before the buffer was reused
+    inflator = zlib.decompressobj()
+    state = {'buffer': bytearray()}
+
+    def receive(msg: bytes) -> Optional[Any]:
+        state['buffer'].extend(msg)
+        if len(msg) < 4 or msg[-4:] != ZLIB_SUFFIX:
+            return None
+        data = inflator.decompress(state['buffer']).decode('utf-8')
+        state['buffer'] = bytearray()
+        return utils._from_json(data)
+
+    return receive
+
+
+def current_receiver() -> Callable[[bytes], Optional[Any]]:
+    decompressor = _ZlibStreamDecompressor()
+
+    def receive(msg: bytes) -> Optional[Any]:
+        data = decompressor.decompress(msg)
+        if data is None:
+            return None
+        return utils._from_json(data)
+
+    return receive
+
+
+def time_receiver(factory: Callable[[], Callable[[bytes], Optional[Any]]], frames: List[bytes], repeat: int) -> float:
+    # returns the best time per event, in microseconds
+    best = float('inf')
+    for _ in range(repeat):
+        receive = factory()
+        events = 0
+        started = time.perf_counter()
+        for frame in frames:
+            if receive(frame) is not None:
+                events += 1
+        best = min(best, (time.perf_counter() - started) / max(events, 1))
+    return best * 1_000_000
+
+
+def measure_allocations(factory: Callable[[], Callable[[bytes], Optional[Any]]], frames: List[bytes]) -> List[int]:
+    # returns the peak memory allocated while handling each event, in bytes
+    receive = factory()
+    peaks: List[int] = []
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for frame in frames:
+            if receive(frame) is None:
+                continue
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--frames', help='a recording of zlib-stream frames to use')
+    parser.add_argument('--events', type=int, default=5_000, help='the number of events to generate')
+    parser.add_argument('--frame-size', type=int, default=16 * 1024, help='the largest frame to generate')
+    parser.add_argument('--repeat', type=int, default=3, help='the number of times to time each receiver')
+    parser.add_argument('--save', help='write the generated frames to this file')
+    args = parser.parse_args()
+
+    if args.frames:
+        frames = read_frames(args.frames)
+    else:
+        frames = compress_events(generate_events(args.events), args.frame_size)
+        if args.save:
+            write_frames(args.save, frames)
+
+    print(f'{len(frames)} frames, {sum(map(len, frames))} bytes, JSON parser: {"orjson" if utils.HAS_ORJSON else "json"}')
+    for name, factory in (('legacy', legacy_receiver), ('current', current_receiver)):
+        per_event = time_receiver(factory, frames, args.repeat)
+        peaks = measure_allocations(factory, frames)
+        print(
+            f'{name:>8}: {per_event:8.2f} us/event, peak allocated per event: '
+            f'{statistics.mean(peaks):10.0f} bytes mean, {statistics.median(peaks):8.0f} bytes median'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -50,6 +50,7 @@ from .enums import *
 from .embeds import *
 from .mentions import *
 from .shard import *
+from .session_store import *
 from .player import *
 from .webhook import *
 from .voice_client import *
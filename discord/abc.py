@@ -107,6 +107,9 @@ class _Undefined:
 
 _undefined: Any = _Undefined()
 
+# The number of members that have their permissions cached per channel
+_PERMISSIONS_CACHE_SIZE = 1000
+
 
 @runtime_checkable
 class Snowflake(Protocol):
@@ -601,6 +604,40 @@ class GuildChannel:
 
             return base
 
+        # Member permissions are cached on the guild, keyed by the member's roles
+        # so that role changes from any source are picked up. Role and overwrite
+        # changes are invalidated by the gateway event handlers.
+        channel_cache = self._get_permissions_cache()
+        if channel_cache is None:
+            return self._resolve_member_permissions(obj, base)
+        roles_key = obj._roles.tobytes()
+        cached = channel_cache.get(obj.id)
+        if cached is not None and cached[0] == roles_key:
+            return Permissions(cached[1])
+        base = self._resolve_member_permissions(obj, base)
+        if len(channel_cache) >= _PERMISSIONS_CACHE_SIZE:
+            del channel_cache[next(iter(channel_cache))]
+        channel_cache[obj.id] = (roles_key, base.value)
+        return base
+
+    def _get_permissions_cache(self) -> Optional[Dict[int, Tuple[bytes, int]]]:
+        # Copies of channels (such as the ``before`` of an update event) share
+        # our ID but not our overwrites, so they shouldn't touch the cache
+        cache = self.guild._permissions_cache
+        try:
+            overwrites, channel_cache = cache[self.id]
+        except KeyError:
+            pass
+        else:
+            if overwrites is self._overwrites:
+                return channel_cache
+        if self.guild._channels.get(self.id) is not self:
+            return None
+        channel_cache = {}
+        cache[self.id] = (self._overwrites, channel_cache)
+        return channel_cache
+
+    def _resolve_member_permissions(self, obj: Member, base: Permissions) -> Permissions:
         roles = obj._roles
         get_role = self.guild.get_role
 
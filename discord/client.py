@@ -27,8 +27,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import signal
 import sys
+import time
 import traceback
 from re import compile as re_compile
 from typing import Any, Callable, Coroutine, Dict, Generator, List, Literal, Optional, Sequence, TYPE_CHECKING, Tuple, TypeVar, Union, overload
@@ -50,7 +52,8 @@ from .flags import ApplicationFlags, Intents
 from .gateway import *
 from .activity import ActivityTypes, BaseActivity, create_activity
 from .voice_client import VoiceClient
-from .http import HTTPClient
+from .http import HTTPClient, RateLimitBackend
+from .session_store import SessionStore
 from .state import ConnectionState
 from . import utils
 from .utils import MISSING
@@ -128,6 +131,118 @@ def _cleanup_loop(loop: asyncio.AbstractEventLoop) -> None:
         _log.info('Closing the event loop.')
         loop.close()
 
+
+# (message ID, user ID, channel ID, custom ID) - the values that wait_for
+# listeners can be indexed by, pulled out of the arguments of an event
+_IndexKeys = Tuple[Optional[int], Optional[int], Optional[int], Optional[str]]
+
+
+def _interaction_index_keys(interaction: Interaction) -> _IndexKeys:
+    message = interaction.message
+    user = getattr(interaction, 'user', None)
+    return (
+        message.id if message is not None else None,
+        user.id if user is not None else None,
+        interaction.channel_id,
+        interaction.custom_id,
+    )
+
+
+def _message_index_keys(message: Message) -> _IndexKeys:
+    return message.id, message.author.id, message.channel.id, None
+
+
+def _reaction_index_keys(reaction: Reaction, user: Union[User, Member]) -> _IndexKeys:
+    return reaction.message.id, user.id, reaction.message.channel.id, None
+
+
+def _raw_reaction_index_keys(payload: RawReactionActionEvent) -> _IndexKeys:
+    return payload.message_id, payload.user_id, payload.channel_id, None
+
+
+_INDEX_KEY_GETTERS: Dict[str, Callable[..., _IndexKeys]] = {
+    'message': _message_index_keys,
+    'reaction_add': _reaction_index_keys,
+    'reaction_remove': _reaction_index_keys,
+    'raw_reaction_add': _raw_reaction_index_keys,
+    'raw_reaction_remove': _raw_reaction_index_keys,
+    'interaction': _interaction_index_keys,
+    'slash_command': _interaction_index_keys,
+    'component_interaction': _interaction_index_keys,
+    'autocomplete_interaction': _interaction_index_keys,
+    'modal_submit': _interaction_index_keys,
+}
+
+
+class _IndexedListeners:
+    """
+    The ``wait_for`` listeners for a single event that were given index keys.
+
+    Each listener is stored under just one of its keys (the most specific one
+    it was given) so that dispatching an event only has to look at the
+    listeners sharing a key with it, rather than every listener for the event.
+    Custom ID prefixes are looked up by slicing the event's custom ID to each
+    prefix length that's currently registered.
+    """
+
+    __slots__ = ('get_keys', 'listeners', 'prefix_lengths')
+
+    # the order that a listener's keys are preferred in when picking where to store it
+    _KEY_ORDER = (0, 3, 1, 2)
+
+    def __init__(self, get_keys: Callable[..., _IndexKeys]) -> None:
+        self.get_keys: Callable[..., _IndexKeys] = get_keys
+        self.listeners: Dict[Tuple[int, Any], List[Tuple[asyncio.Future, Callable[..., bool], _IndexKeys]]] = {}
+        self.prefix_lengths: Dict[int, int] = {}
+
+    def add(self, future: asyncio.Future, check: Callable[..., bool], hints: _IndexKeys) -> None:
+        kind = next(i for i in self._KEY_ORDER if hints[i] is not None)
+        key = (kind, hints[kind])
+        entry = (future, check, hints)
+        self.listeners.setdefault(key, []).append(entry)
+        if kind == 3:
+            length = len(hints[3])  # type: ignore
+            self.prefix_lengths[length] = self.prefix_lengths.get(length, 0) + 1
+
+        def remove(_: asyncio.Future) -> None:
+            entries = self.listeners.get(key)
+            if entries is None:
+                return
+            try:
+                entries.remove(entry)
+            except ValueError:
+                return
+            if not entries:
+                del self.listeners[key]
+            if kind == 3:
+                if self.prefix_lengths[length] == 1:
+                    del self.prefix_lengths[length]
+                else:
+                    self.prefix_lengths[length] -= 1
+
+        future.add_done_callback(remove)
+
+    def get_candidates(self, *args: Any) -> List[Tuple[asyncio.Future, Callable[..., bool], _IndexKeys]]:
+        keys = self.get_keys(*args)
+        candidates = []
+        for kind in range(3):
+            if keys[kind] is not None:
+                candidates.extend(self.listeners.get((kind, keys[kind]), ()))
+        custom_id = keys[3]
+        if custom_id and self.prefix_lengths:
+            for length in self.prefix_lengths:
+                if length <= len(custom_id):
+                    candidates.extend(self.listeners.get((3, custom_id[:length]), ()))
+
+        # every key a listener was given has to match, not just the one it was stored under
+        return [
+            entry
+            for entry in candidates
+            if all(hint is None or hint == keys[i] for i, hint in enumerate(entry[2][:3]))
+            and (entry[2][3] is None or (custom_id is not None and custom_id.startswith(entry[2][3])))
+        ]
+
+
 class Client:
     r"""Represents a client connection that connects to Discord.
     This class is used to interact with the Discord WebSocket and API.
@@ -139,6 +254,13 @@ class Client:
     max_messages: Optional[:class:`int`]
         The maximum number of messages to store in the internal message cache.
         This defaults to ``1000``. Passing in ``None`` disables the message cache.
+    max_channel_messages: Optional[:class:`int`]
+        The maximum number of messages from any one channel to store in the internal
+        message cache. Once a channel reaches this limit, its oldest cached message is
+        removed to make space. Defaults to ``None``, meaning no per-channel limit.
+    max_guild_messages: Optional[:class:`int`]
+        The maximum number of messages from any one guild to store in the internal
+        message cache. Defaults to ``None``, meaning no per-guild limit.
     loop: Optional[:class:`asyncio.AbstractEventLoop`]
         The :class:`asyncio.AbstractEventLoop` to use for asynchronous operations.
         Defaults to ``None``, in which case the default event loop is used via
@@ -179,6 +301,21 @@ class Client:
         WebSocket in the case of not receiving a HEARTBEAT_ACK. Useful if
         processing the initial packets take too long to the point of disconnecting
         you. The default timeout is 60 seconds.
+    heartbeat_mode: :class:`str`
+        How heartbeats are sent to the gateway and voice websockets. ``'thread'``, the
+        default, runs a thread per websocket. ``'asyncio'`` runs every websocket's
+        heartbeats from a single timer on the event loop, with a single watchdog thread
+        that logs the loop's stack if it's blocked. This uses far fewer threads when
+        running many shards or voice connections in one process.
+
+        .. versionadded:: 0.2.5
+    gateway_compression: Optional[:class:`str`]
+        How messages from the gateway are compressed. ``'zlib-stream'``, the default,
+        compresses the whole connection with zlib. ``'zstd-stream'`` uses zstandard,
+        which is faster to decompress and needs the ``zstandard`` library to be
+        installed. ``None`` disables compression.
+
+        .. versionadded:: 0.2.5
     guild_ready_timeout: :class:`float`
         The maximum number of seconds to wait for the GUILD_CREATE stream to end before
         preparing the member cache and firing READY. The default timeout is 2 seconds.
@@ -188,6 +325,30 @@ class Client:
         a rate limit bucket given by Discord. If this is ``False`` then your system clock is
         used to calculate how long to sleep for. If this is set to ``False`` it is recommended to
         sync your system clock to Google's NTP server.
+    ratelimiter: Optional[:class:`discord.http.RateLimitBackend`]
+        Where the HTTP client keeps its rate limit state. Defaults to a
+        :class:`discord.http.MemoryRateLimitBackend`, which keeps it in the
+        current process. Pass a shared backend when running several processes
+        on the same token so that they don't exceed the rate limits between them.
+    session_store: Optional[:class:`SessionStore`]
+        Where the gateway session of each shard is saved when the client is closed.
+        When given, shards RESUME their saved sessions when the client next starts
+        rather than IDENTIFYing again, falling back to identifying if Discord has
+        invalidated them. Since no READY is received for a resumed session, the
+        cache starts empty (only filling as events come in) and :func:`on_ready`
+        is dispatched once every resumed shard has RESUMED. Defaults to ``None``,
+        which doesn't save sessions.
+
+        .. versionadded:: 0.2.5
+    cache_snapshot: Optional[:class:`str`]
+        A file that the guild cache is saved to with :meth:`save_cache_snapshot`
+        when the client is closed, and loaded from with :meth:`load_cache_snapshot`
+        when it next logs in. Combined with ``session_store``, resumed shards start
+        with their guilds, channels, roles and members already cached. Otherwise,
+        the loaded guilds are kept until their GUILD_CREATE arrives, and their members
+        are kept until they're chunked. Defaults to ``None``, which doesn't save the cache.
+
+        .. versionadded:: 0.2.5
     enable_debug_events: :class:`bool`
         Whether to enable events that are useful only for debugging gateway related information.
 
@@ -212,6 +373,7 @@ class Client:
         self.ws: DiscordWebSocket = None  # type: ignore
         self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop() if loop is None else loop
         self._listeners: Dict[str, List[Tuple[asyncio.Future, Callable[..., bool]]]] = {}
+        self._indexed_listeners: Dict[str, _IndexedListeners] = {}
         self.shard_id: Optional[int] = options.get('shard_id')
         self.shard_count: Optional[int] = options.get('shard_count')
 
@@ -219,7 +381,17 @@ class Client:
         proxy: Optional[str] = options.pop('proxy', None)
         proxy_auth: Optional[aiohttp.BasicAuth] = options.pop('proxy_auth', None)
         unsync_clock: bool = options.pop('assume_unsync_clock', True)
-        self.http: HTTPClient = HTTPClient(connector, proxy=proxy, proxy_auth=proxy_auth, unsync_clock=unsync_clock, loop=self.loop)
+        ratelimiter: Optional[RateLimitBackend] = options.pop('ratelimiter', None)
+        self._session_store: Optional[SessionStore] = options.pop('session_store', None)
+        self._cache_snapshot: Optional[str] = options.pop('cache_snapshot', None)
+        self.http: HTTPClient = HTTPClient(
+            connector,
+            proxy=proxy,
+            proxy_auth=proxy_auth,
+            unsync_clock=unsync_clock,
+            loop=self.loop,
+            ratelimiter=ratelimiter,
+        )
 
         self._handlers: Dict[str, Callable] = {
             'ready': self._handle_ready
@@ -421,6 +593,26 @@ class Client:
                 for idx in reversed(removed):
                     del listeners[idx]
 
+        indexed = self._indexed_listeners.get(event)
+        if indexed and indexed.listeners:
+            # resolved entries are removed from the index by their future's done callback
+            for future, condition, _ in indexed.get_candidates(*args):
+                if future.done():
+                    continue
+
+                try:
+                    result = condition(*args)
+                except Exception as exc:
+                    future.set_exception(exc)
+                else:
+                    if result:
+                        if len(args) == 0:
+                            future.set_result(None)
+                        elif len(args) == 1:
+                            future.set_result(args[0])
+                        else:
+                            future.set_result(args)
+
         try:
             coro = getattr(self, method)
         except AttributeError:
@@ -468,6 +660,137 @@ class Client:
         if not initial:
             await asyncio.sleep(5.0)
 
+    # gateway session persistence
+
+    async def _load_gateway_session(self, shard_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        # Sessions are removed as they're loaded so that a session that can't be
+        # connected with isn't tried again when the shard retries its connection.
+        if self._session_store is None:
+            return None
+        try:
+            session = await self._session_store.load(shard_id)
+            if session is not None:
+                await self._session_store.delete(shard_id)
+        except Exception:
+            _log.exception('Failed to load the saved gateway session for shard ID %s.', shard_id)
+            session = None
+        if session is not None and session.get('shard_count') != self._connection.shard_count:
+            # the session covers a different set of guilds to the one this shard now should
+            session = None
+        self._connection._restoring_session(shard_id, session is not None)
+        if session is None:
+            return None
+        _log.info('Shard ID %s is resuming saved session %s.', shard_id, session['session_id'])
+        return {
+            'session': session['session_id'],
+            'sequence': session['sequence'],
+            'gateway': session['resume_url'],
+            'resume': True,
+        }
+
+    async def _save_gateway_session(self, ws: Optional[DiscordWebSocket]) -> bool:
+        # Returns whether the session was saved, and so whether the websocket
+        # should be closed without invalidating it.
+        if self._session_store is None or ws is None or ws.session_id is None:
+            return False
+        session = {
+            'session_id': ws.session_id,
+            'sequence': ws.sequence,
+            'resume_url': ws.resume_url or ws.gateway,
+            'shard_count': ws.shard_count,
+            'saved_at': time.time(),
+        }
+        try:
+            await self._session_store.save(ws.shard_id, session)  # type: ignore
+        except Exception:
+            _log.exception('Failed to save the gateway session for shard ID %s.', ws.shard_id)
+            return False
+        return True
+
+    async def _write_cache_snapshot(self) -> None:
+        if self._cache_snapshot is None:
+            return
+        try:
+            saved = await self.save_cache_snapshot(self._cache_snapshot)
+        except Exception:
+            _log.exception('Failed to save the cache snapshot to %s.', self._cache_snapshot)
+        else:
+            _log.info('Saved %s guilds to the cache snapshot.', saved)
+
+    @property
+    def _snapshot_shard_ids(self) -> Optional[List[int]]:
+        # The shards whose guilds should be loaded from the cache snapshot
+        return None if self.shard_id is None else [self.shard_id]
+
+    async def save_cache_snapshot(self, path: str, *, members: bool = True) -> int:
+        """|coro|
+
+        Saves every available guild in the cache, along with its channels, threads,
+        roles, emojis, stickers and (optionally) members, to a compressed file that can
+        be loaded with :meth:`load_cache_snapshot`. Presences, voice states and messages
+        are not saved.
+
+        .. versionadded:: 0.2.5
+
+        Parameters
+        -----------
+        path: :class:`str`
+            The file to save the snapshot to. It's replaced once the snapshot is
+            fully written.
+        members: :class:`bool`
+            Whether to save the cached members of each guild.
+
+        Returns
+        --------
+        :class:`int`
+            The number of guilds that were saved.
+        """
+
+        return await self._connection.save_snapshot(path, members=members)
+
+    async def load_cache_snapshot(
+        self,
+        path: str,
+        *,
+        guild_ids: Optional[Sequence[int]] = None,
+        shard_ids: Optional[Sequence[int]] = None,
+        members: bool = True,
+    ) -> int:
+        """|coro|
+
+        Loads guilds saved with :meth:`save_cache_snapshot` into the cache. Guilds
+        are rebuilt in batches, yielding to the event loop between each one.
+
+        .. versionadded:: 0.2.5
+
+        Parameters
+        -----------
+        path: :class:`str`
+            The file to load the snapshot from.
+        guild_ids: Optional[Sequence[:class:`int`]]
+            Only load these guilds.
+        shard_ids: Optional[Sequence[:class:`int`]]
+            Only load the guilds that belong to these shards.
+        members: :class:`bool`
+            Whether to load the saved members of each guild.
+
+        Raises
+        -------
+        OSError
+            The snapshot couldn't be read.
+        ValueError
+            The file isn't a snapshot that this version of the library can load.
+
+        Returns
+        --------
+        :class:`int`
+            The number of guilds that were loaded.
+        """
+
+        guild_ids = set(guild_ids) if guild_ids is not None else None
+        shard_ids = set(shard_ids) if shard_ids is not None else None
+        return await self._connection.load_snapshot(path, guild_ids=guild_ids, shard_ids=shard_ids, members=members)
+
     # login state management
 
     async def login(self, token: str) -> None:
@@ -497,6 +820,15 @@ class Client:
         data = await self.http.static_login(token.strip())
         self._connection.user = ClientUser(state=self._connection, data=data)
 
+        if self._cache_snapshot is not None and os.path.exists(self._cache_snapshot):
+            started = time.perf_counter()
+            try:
+                loaded = await self.load_cache_snapshot(self._cache_snapshot, shard_ids=self._snapshot_shard_ids)
+            except Exception:
+                _log.exception('Failed to load the cache snapshot from %s.', self._cache_snapshot)
+            else:
+                _log.info('Loaded %s guilds from the cache snapshot in %.2fs.', loaded, time.perf_counter() - started)
+
     async def connect(self, *, reconnect: bool = True) -> None:
         """|coro|
 
@@ -527,11 +859,13 @@ class Client:
             'initial': True,
             'shard_id': self.shard_id,
         }
+        ws_params.update(await self._load_gateway_session(self.shard_id) or {})
         while not self.is_closed():
             try:
                 coro = DiscordWebSocket.from_client(self, **ws_params)
                 self.ws = await asyncio.wait_for(coro, timeout=60.0)
                 ws_params['initial'] = False
+                ws_params.pop('gateway', None)
                 while True:
                     await self.ws.poll_event()
             except ReconnectWebSocket as e:
@@ -599,7 +933,11 @@ class Client:
                 pass
 
         if self.ws is not None and self.ws.open:
-            await self.ws.close(code=1000)
+            # closing with 1000 invalidates the session, so use a different code if it's been saved
+            saved = await self._save_gateway_session(self.ws)
+            await self.ws.close(code=4000 if saved else 1000)
+
+        await self._write_cache_snapshot()
 
         await self.http.close()
         self._ready.clear()
@@ -972,6 +1310,10 @@ class Client:
             *,
             check: Optional[Callable[[Message], bool]] = None,
             timeout: Optional[float] = None,
+            message_id: Optional[int] = None,
+            user_id: Optional[int] = None,
+            channel_id: Optional[int] = None,
+            custom_id_prefix: Optional[str] = None,
             ) -> Message:
         ...
 
@@ -982,6 +1324,10 @@ class Client:
             *,
             check: Optional[Callable[[Reaction, Union[User, Member]], bool]] = None,
             timeout: Optional[float] = None,
+            message_id: Optional[int] = None,
+            user_id: Optional[int] = None,
+            channel_id: Optional[int] = None,
+            custom_id_prefix: Optional[str] = None,
             ) -> Tuple[Reaction, Union[User, Member]]:
         ...
 
@@ -992,6 +1338,10 @@ class Client:
             *,
             check: Optional[Callable[[RawReactionActionEvent], bool]] = None,
             timeout: Optional[float] = None,
+            message_id: Optional[int] = None,
+            user_id: Optional[int] = None,
+            channel_id: Optional[int] = None,
+            custom_id_prefix: Optional[str] = None,
             ) -> RawReactionActionEvent:
         ...
 
@@ -1002,6 +1352,10 @@ class Client:
             *,
             check: Optional[Callable[[Reaction, Union[User, Member]], bool]] = None,
             timeout: Optional[float] = None,
+            message_id: Optional[int] = None,
+            user_id: Optional[int] = None,
+            channel_id: Optional[int] = None,
+            custom_id_prefix: Optional[str] = None,
             ) -> Tuple[Reaction, Union[User, Member]]:
         ...
 
@@ -1012,6 +1366,10 @@ class Client:
             *,
             check: Optional[Callable[[RawReactionActionEvent], bool]] = None,
             timeout: Optional[float] = None,
+            message_id: Optional[int] = None,
+            user_id: Optional[int] = None,
+            channel_id: Optional[int] = None,
+            custom_id_prefix: Optional[str] = None,
             ) -> RawReactionActionEvent:
         ...
 
@@ -1022,6 +1380,10 @@ class Client:
             *,
             check: Optional[Callable[[CommandInteraction], bool]] = None,
             timeout: Optional[float] = None,
+            message_id: Optional[int] = None,
+            user_id: Optional[int] = None,
+            channel_id: Optional[int] = None,
+            custom_id_prefix: Optional[str] = None,
             ) -> CommandInteraction:
         ...
 
@@ -1032,6 +1394,10 @@ class Client:
             *,
             check: Optional[Callable[[ComponentInteraction], bool]] = None,
             timeout: Optional[float] = None,
+            message_id: Optional[int] = None,
+            user_id: Optional[int] = None,
+            channel_id: Optional[int] = None,
+            custom_id_prefix: Optional[str] = None,
             ) -> ComponentInteraction:
         ...
 
@@ -1042,6 +1408,10 @@ class Client:
             *,
             check: Optional[Callable[[AutocompleteInteraction], bool]] = None,
             timeout: Optional[float] = None,
+            message_id: Optional[int] = None,
+            user_id: Optional[int] = None,
+            channel_id: Optional[int] = None,
+            custom_id_prefix: Optional[str] = None,
             ) -> AutocompleteInteraction:
         ...
 
@@ -1052,6 +1422,10 @@ class Client:
             *,
             check: Optional[Callable[[ModalInteraction], bool]] = None,
             timeout: Optional[float] = None,
+            message_id: Optional[int] = None,
+            user_id: Optional[int] = None,
+            channel_id: Optional[int] = None,
+            custom_id_prefix: Optional[str] = None,
             ) -> ModalInteraction:
         ...
 
@@ -1062,6 +1436,10 @@ class Client:
             *,
             check: Optional[Callable[[Interaction], bool]] = None,
             timeout: Optional[float] = None,
+            message_id: Optional[int] = None,
+            user_id: Optional[int] = None,
+            channel_id: Optional[int] = None,
+            custom_id_prefix: Optional[str] = None,
             ) -> Interaction:
         ...
 
@@ -1072,6 +1450,10 @@ class Client:
             *,
             check: Optional[Callable[..., bool]] = None,
             timeout: Optional[float] = None,
+            message_id: Optional[int] = None,
+            user_id: Optional[int] = None,
+            channel_id: Optional[int] = None,
+            custom_id_prefix: Optional[str] = None,
             ) -> Any:
         ...
 
@@ -1081,6 +1463,10 @@ class Client:
         *,
         check: Optional[Callable[..., bool]] = None,
         timeout: Optional[float] = None,
+        message_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        channel_id: Optional[int] = None,
+        custom_id_prefix: Optional[str] = None,
     ) -> Any:
         """|coro|
 
@@ -1149,11 +1535,35 @@ class Client:
         timeout: Optional[:class:`float`]
             The number of seconds to wait before timing out and raising
             :exc:`asyncio.TimeoutError`.
+        message_id: Optional[:class:`int`]
+            Only consider events for the message with this ID.
+
+            This, along with the other index keys, lets the client skip over
+            this listener without calling its ``check`` for unrelated events.
+            They're supported for the ``message``, ``reaction_add``,
+            ``reaction_remove``, ``raw_reaction_add``, ``raw_reaction_remove``
+            and interaction events.
+
+            .. versionadded:: 0.2.5
+        user_id: Optional[:class:`int`]
+            Only consider events caused by the user with this ID.
+
+            .. versionadded:: 0.2.5
+        channel_id: Optional[:class:`int`]
+            Only consider events in the channel with this ID.
+
+            .. versionadded:: 0.2.5
+        custom_id_prefix: Optional[:class:`str`]
+            Only consider interactions whose custom ID starts with this string.
+
+            .. versionadded:: 0.2.5
 
         Raises
         -------
         asyncio.TimeoutError
             If a timeout is provided and it was reached.
+        TypeError
+            Index keys were given for an event that doesn't support them.
 
         Returns
         --------
@@ -1170,6 +1580,19 @@ class Client:
             check = _check
 
         ev = event.lower()
+        hints = (message_id, user_id, channel_id, custom_id_prefix)
+        if hints != (None, None, None, None):
+            try:
+                indexed = self._indexed_listeners[ev]
+            except KeyError:
+                try:
+                    get_keys = _INDEX_KEY_GETTERS[ev]
+                except KeyError:
+                    raise TypeError(f'wait_for index keys are not supported for the {event!r} event') from None
+                indexed = self._indexed_listeners[ev] = _IndexedListeners(get_keys)
+            indexed.add(future, check, hints)
+            return asyncio.wait_for(future, timeout)
+
         try:
             listeners = self._listeners[ev]
         except KeyError:
@@ -17,5 +17,6 @@ from .help import *
 from .converter import *
 from .cooldowns import *
 from .cog import *
+from .component_router import *
 from .flags import *
 from .http_interactions import *
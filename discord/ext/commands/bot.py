@@ -42,6 +42,7 @@ from typing import (
     Dict,
     TYPE_CHECKING,
     Optional,
+    Tuple,
     TypeVar,
     Type,
     Union,
@@ -56,6 +57,8 @@ from .view import StringView
 from .context import Context, SlashContext
 from .help import HelpCommand, DefaultHelpCommand
 from .cog import Cog
+from .component_router import ComponentRouter, ROUTED_EVENTS
+from .cooldowns import CooldownBackend, MemoryCooldownBackend
 from ...application_commands import ApplicationCommand
 
 if TYPE_CHECKING:
@@ -149,6 +152,7 @@ class BotBase(GroupMixin):
         super().__init__(**options)
         self.command_prefix = command_prefix
         self.extra_events: Dict[str, List[CoroFunc]] = {}
+        self.component_router: ComponentRouter = ComponentRouter()
         self.__cogs: Dict[str, Cog] = {}
         self.__extensions: Dict[str, types.ModuleType] = {}
         self._checks: List[Check] = []
@@ -160,6 +164,7 @@ class BotBase(GroupMixin):
         self.owner_id = options.get('owner_id')
         self.owner_ids = options.get('owner_ids', set())
         self.strip_after_prefix = options.get('strip_after_prefix', False)
+        self.cooldown_backend: CooldownBackend = options.get('cooldown_backend') or MemoryCooldownBackend()
 
         if self.owner_id and self.owner_ids:
             raise TypeError('Both owner_id and owner_ids are set.')
@@ -192,6 +197,12 @@ class BotBase(GroupMixin):
         ev = 'on_' + event_name
         for event in self.extra_events.get(ev, []):
             self._schedule_event(event, ev, *args, **kwargs)  # type: ignore
+        custom_id = getattr(args[0], 'custom_id', None) if args else None
+        if event_name in ROUTED_EVENTS and custom_id is not None:
+            route = self.component_router.get_route(custom_id, event=event_name)
+            if route is not None:
+                handler, route_args = route
+                self._schedule_event(handler, ev, args[0], *route_args)  # type: ignore
 
     @discord.utils.copy_doc(discord.Client.close)
     async def close(self) -> None:
@@ -883,7 +894,7 @@ class BotBase(GroupMixin):
 
     # command processing
 
-    async def get_prefix(self, message: Message) -> Union[List[str], str]:
+    async def get_prefix(self, message: Message) -> Union[List[str], Tuple[str, ...], str]:
         """|coro|
 
         Retrieves the prefix the bot is listening to
@@ -896,15 +907,20 @@ class BotBase(GroupMixin):
 
         Returns
         --------
-        Union[List[:class:`str`], :class:`str`]
+        Union[List[:class:`str`], Tuple[:class:`str`, ...], :class:`str`]
             A list of prefixes or a single prefix that the bot is
-            listening for.
+            listening for. Tuples are returned as-is, so that prefixes
+            cached by the ``command_prefix`` callable aren't copied for
+            every message.
         """
         prefix = ret = self.command_prefix
         if callable(prefix):
             ret = await discord.utils.maybe_coroutine(prefix, self, message)
 
-        if not isinstance(ret, str):
+        if isinstance(ret, tuple):
+            if not ret:
+                raise ValueError("Iterable command_prefix must contain at least one prefix")
+        elif not isinstance(ret, str):
             try:
                 ret = list(ret)
             except TypeError:
@@ -975,7 +991,7 @@ class BotBase(GroupMixin):
                     return ctx
 
             except TypeError:
-                if not isinstance(prefix, list):
+                if not isinstance(prefix, (list, tuple)):
                     raise TypeError("get_prefix must return either a string or a list of string, "
                                     f"not {prefix.__class__.__name__}")
 
@@ -1298,6 +1314,16 @@ class Bot(BotBase, discord.Client):
         Whether to strip whitespace characters after encountering the command
         prefix. This allows for ``!   hello`` and ``!hello`` to both work if
         the ``command_prefix`` is set to ``!``. Defaults to ``False``.
+    component_router: :class:`.ComponentRouter`
+        The router that sends component and modal interactions to their
+        handler based on their custom ID.
+
+        .. versionadded:: 0.2.5
+    cooldown_backend: :class:`.CooldownBackend`
+        Where the state of command cooldowns is kept. Defaults to a
+        :class:`.MemoryCooldownBackend`, which keeps it in the current process.
+
+        .. versionadded:: 0.2.5
     """
     pass
 
@@ -30,6 +30,7 @@ import discord.utils
 from typing import Any, Callable, ClassVar, Dict, Generator, List, Optional, TYPE_CHECKING, Tuple, TypeVar, Type
 
 from ._types import _BaseCommand
+from .component_router import ROUTED_EVENTS, RouteKey
 
 if TYPE_CHECKING:
     from .bot import BotBase
@@ -107,6 +108,7 @@ class CogMeta(type):
     __cog_settings__: Dict[str, Any]
     __cog_commands__: List[Command]
     __cog_listeners__: List[Tuple[str, str]]
+    __cog_component_routes__: List[Tuple[RouteKey, str, str]]
 
     def __new__(cls: Type[CogMeta], *args: Any, **kwargs: Any) -> CogMeta:
         name, bases, attrs = args
@@ -120,6 +122,7 @@ class CogMeta(type):
 
         commands = {}
         listeners = {}
+        component_routes = {}
         no_bot_cog = 'Commands or listeners must not start with cog_ or bot_ (in method {0.__name__}.{1})'
 
         new_cls = super().__new__(cls, name, bases, attrs, **kwargs)
@@ -129,6 +132,8 @@ class CogMeta(type):
                     del commands[elem]
                 if elem in listeners:
                     del listeners[elem]
+                if elem in component_routes:
+                    del component_routes[elem]
 
                 is_static_method = isinstance(value, staticmethod)
                 if is_static_method:
@@ -140,14 +145,16 @@ class CogMeta(type):
                         raise TypeError(no_bot_cog.format(base, elem))
                     commands[elem] = value
                 elif inspect.iscoroutinefunction(value):
-                    try:
-                        getattr(value, '__cog_listener__')
-                    except AttributeError:
+                    is_listener = hasattr(value, '__cog_listener__')
+                    is_component_route = hasattr(value, '__cog_component_routes__')
+                    if not (is_listener or is_component_route):
                         continue
-                    else:
-                        if elem.startswith(('cog_', 'bot_')):
-                            raise TypeError(no_bot_cog.format(base, elem))
+                    if elem.startswith(('cog_', 'bot_')):
+                        raise TypeError(no_bot_cog.format(base, elem))
+                    if is_listener:
                         listeners[elem] = value
+                    if is_component_route:
+                        component_routes[elem] = value
 
         new_cls.__cog_commands__ = list(commands.values()) # this will be copied in Cog.__new__
 
@@ -159,6 +166,11 @@ class CogMeta(type):
                 listeners_as_list.append((listener_name, listener.__name__))
 
         new_cls.__cog_listeners__ = listeners_as_list
+        new_cls.__cog_component_routes__ = [
+            (prefix, event, func.__name__)
+            for func in component_routes.values()
+            for prefix, event in func.__cog_component_routes__
+        ]
         return new_cls
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -186,6 +198,7 @@ class Cog(metaclass=CogMeta):
     __cog_settings__: ClassVar[Dict[str, Any]]
     __cog_commands__: ClassVar[List[Command]]
     __cog_listeners__: ClassVar[List[Tuple[str, str]]]
+    __cog_component_routes__: ClassVar[List[Tuple[RouteKey, str, str]]]
 
     def __new__(cls: Type[CogT], *args: Any, **kwargs: Any) -> CogT:
         # For issue 426, we need to store a copy of the command objects
@@ -316,6 +329,57 @@ class Cog(metaclass=CogMeta):
             return func
         return decorator
 
+    @classmethod
+    def component_listener(cls, prefix: RouteKey, *, event: str = 'component_interaction') -> Callable[[FuncT], FuncT]:
+        """A decorator that marks a function as the handler for interactions
+        whose custom ID starts with the given prefix.
+
+        Unlike a listener for ``on_component_interaction``, the function is only
+        called for the interactions that it handles, and it's given any
+        remaining space separated parts of the custom ID as extra arguments.
+        See :class:`.ComponentRouter` for more information.
+
+        .. versionadded:: 0.2.5
+
+        Example
+        ---------
+
+        .. code-block:: python3
+
+            @commands.Cog.component_listener("DELETE")
+            async def delete_handler(self, interaction, message_id):
+                ...  # called for a custom ID of "DELETE 1234"
+
+        Parameters
+        ------------
+        prefix: Union[:class:`str`, :class:`re.Pattern`]
+            The custom ID prefix to handle, or a compiled pattern that the
+            whole custom ID should match.
+        event: :class:`str`
+            The event to handle - either ``component_interaction`` or ``modal_submit``.
+
+        Raises
+        --------
+        TypeError
+            The function is not a coroutine function or the event can't be routed.
+        """
+
+        if event not in ROUTED_EVENTS:
+            raise TypeError(f'Event {event!r} cannot be routed by custom ID.')
+
+        def decorator(func: FuncT) -> FuncT:
+            actual = func
+            if isinstance(actual, staticmethod):
+                actual = actual.__func__
+            if not inspect.iscoroutinefunction(actual):
+                raise TypeError('Component listener function must be a coroutine function.')
+            try:
+                actual.__cog_component_routes__.append((prefix, event))
+            except AttributeError:
+                actual.__cog_component_routes__ = [(prefix, event)]
+            return func
+        return decorator
+
     def has_error_handler(self) -> bool:
         """:class:`bool`: Checks whether the cog has an error handler.
         """
@@ -430,6 +494,20 @@ class Cog(metaclass=CogMeta):
                             bot.remove_command(to_undo.name)
                     raise e
 
+        # component routes raise on duplicate prefixes, so they're added before
+        # anything else that can't be undone and rolled back the same way
+        for index, (prefix, event, method_name) in enumerate(self.__cog_component_routes__):
+            try:
+                bot.component_router.add_route(prefix, getattr(self, method_name), event=event)
+            except Exception as e:
+                # undo our additions
+                for to_undo, undo_event, undo_method_name in self.__cog_component_routes__[:index]:
+                    bot.component_router.remove_route(to_undo, getattr(self, undo_method_name), event=undo_event)
+                for command in self.__cog_commands__:
+                    if command.parent is None:
+                        bot.remove_command(command.name)
+                raise e
+
         # check if we're overriding the default
         if cls.bot_check is not Cog.bot_check:
             bot.add_check(self.bot_check)
@@ -457,6 +535,9 @@ class Cog(metaclass=CogMeta):
             for _, method_name in self.__cog_listeners__:
                 bot.remove_listener(getattr(self, method_name))
 
+            for prefix, event, method_name in self.__cog_component_routes__:
+                bot.component_router.remove_route(prefix, getattr(self, method_name), event=event)
+
             if cls.bot_check is not Cog.bot_check:
                 bot.remove_check(self.bot_check)
 
@@ -0,0 +1,191 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-2021 Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Pattern, Tuple, Union
+
+import discord
+
+__all__ = (
+    'ComponentRouter',
+)
+
+RouteHandler = Callable[..., Coroutine[Any, Any, Any]]
+RouteKey = Union[str, Pattern[str]]
+
+ROUTED_EVENTS = ('component_interaction', 'modal_submit')
+
+
+class _RouteNode:
+    __slots__ = ('children', 'handler')
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _RouteNode] = {}
+        self.handler: Optional[RouteHandler] = None
+
+
+class ComponentRouter:
+    """Routes component and modal interactions to a single handler based on
+    their ``custom_id``, rather than dispatching them to every listener.
+
+    Custom IDs are treated as a space separated list of arguments. A handler
+    added for the prefix ``"foo bar"`` will be called for the custom IDs
+    ``"foo bar"`` and ``"foo bar baz qux"``, with the rest of the custom ID
+    (``"baz"`` and ``"qux"``) given as extra positional arguments. When more
+    than one prefix matches, the longest one wins.
+
+    Compiled regular expressions can be given instead of a prefix. These are
+    only checked when no prefix matches, in the order that they were added,
+    and their handlers are called with the match's groups as arguments.
+
+    Instances of this are available at :attr:`.Bot.component_router`, and
+    can be added to from cogs with :meth:`.Cog.component_listener`.
+
+    .. versionadded:: 0.2.5
+    """
+
+    def __init__(self) -> None:
+        self._roots: Dict[str, _RouteNode] = {}
+        self._patterns: Dict[str, List[Tuple[Pattern[str], RouteHandler]]] = {}
+
+    @staticmethod
+    def _check_event(event: str) -> None:
+        if event not in ROUTED_EVENTS:
+            raise TypeError(f'Event {event!r} cannot be routed by custom ID.')
+
+    def add_route(self, prefix: RouteKey, handler: RouteHandler, *, event: str = 'component_interaction') -> None:
+        """Adds a handler for the given custom ID prefix.
+
+        Parameters
+        -----------
+        prefix: Union[:class:`str`, :class:`re.Pattern`]
+            The custom ID prefix that the handler should be called for, or a
+            compiled pattern that the whole custom ID should match.
+        handler: :ref:`coroutine <coroutine>`
+            The function to be called. This is given the interaction followed
+            by any arguments parsed from the custom ID.
+        event: :class:`str`
+            The event to route - either ``component_interaction`` or ``modal_submit``.
+
+        Raises
+        -------
+        TypeError
+            The event given can't be routed.
+        discord.ClientException
+            A handler has already been added for the given prefix.
+        """
+
+        self._check_event(event)
+        if isinstance(prefix, re.Pattern):
+            self._patterns.setdefault(event, []).append((prefix, handler))
+            return
+        node = self._roots.setdefault(event, _RouteNode())
+        for part in prefix.split(' '):
+            node = node.children.setdefault(part, _RouteNode())
+        if node.handler is not None and node.handler != handler:
+            raise discord.ClientException(f'A handler for custom ID prefix {prefix!r} has already been added.')
+        node.handler = handler
+
+    def remove_route(self, prefix: RouteKey, handler: Optional[RouteHandler] = None, *, event: str = 'component_interaction') -> None:
+        """Removes a handler for the given custom ID prefix. This is a no-op
+        if the handler has not been added.
+
+        Parameters
+        -----------
+        prefix: Union[:class:`str`, :class:`re.Pattern`]
+            The prefix or pattern that was given when adding the handler.
+        handler: Optional[:ref:`coroutine <coroutine>`]
+            The handler to remove. If given, the route is only removed if it
+            still points to this function.
+        event: :class:`str`
+            The event that the handler was added for.
+        """
+
+        if isinstance(prefix, re.Pattern):
+            patterns = self._patterns.get(event, [])
+            self._patterns[event] = [
+                (pattern, func)
+                for pattern, func in patterns
+                if not (pattern == prefix and (handler is None or func == handler))
+            ]
+            return
+
+        # Walk down to the node, keeping the path so that we can prune empty branches
+        node = self._roots.get(event)
+        if node is None:
+            return
+        path: List[Tuple[_RouteNode, str]] = []
+        for part in prefix.split(' '):
+            child = node.children.get(part)
+            if child is None:
+                return
+            path.append((node, part))
+            node = child
+        if node.handler is None or (handler is not None and node.handler != handler):
+            return
+        node.handler = None
+        for parent, part in reversed(path):
+            child = parent.children[part]
+            if child.handler is not None or child.children:
+                break
+            del parent.children[part]
+
+    def get_route(self, custom_id: str, *, event: str = 'component_interaction') -> Optional[Tuple[RouteHandler, List[str]]]:
+        """Gets the handler that a custom ID would be routed to.
+
+        Parameters
+        -----------
+        custom_id: :class:`str`
+            The custom ID to look up.
+        event: :class:`str`
+            The event that the custom ID came from.
+
+        Returns
+        --------
+        Optional[Tuple[:ref:`coroutine <coroutine>`, List[:class:`str`]]]
+            The handler and the arguments that it should be given after the
+            interaction, or ``None`` if no handler matches.
+        """
+
+        node = self._roots.get(event)
+        if node is not None:
+            parts = custom_id.split(' ')
+            found: Optional[Tuple[RouteHandler, List[str]]] = None
+            for index, part in enumerate(parts):
+                node = node.children.get(part)
+                if node is None:
+                    break
+                if node.handler is not None:
+                    found = node.handler, parts[index + 1:]
+            if found is not None:
+                return found
+
+        for pattern, handler in self._patterns.get(event, ()):
+            match = pattern.fullmatch(custom_id)
+            if match is not None:
+                return handler, list(match.groups())
+        return None
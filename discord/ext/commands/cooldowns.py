@@ -25,10 +25,12 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 
-from typing import Any, Callable, Union, Deque, Dict, Optional, Type, TypeVar, TYPE_CHECKING
+from typing import Any, Callable, Union, Deque, Dict, List, Optional, Tuple, Type, TypeVar, TYPE_CHECKING
 from discord.enums import Enum
 import time
+import heapq
 import asyncio
+import itertools
 from collections import deque
 
 from ...abc import PrivateChannel
@@ -42,6 +44,8 @@ __all__ = (
     'CooldownMapping',
     'DynamicCooldownMapping',
     'MaxConcurrency',
+    'CooldownBackend',
+    'MemoryCooldownBackend',
 )
 
 C = TypeVar('C', bound='CooldownMapping')
@@ -220,6 +224,69 @@ class Cooldown:
     def __repr__(self) -> str:
         return f'<Cooldown rate: {self.rate} per: {self.per} window: {self._window} tokens: {self._tokens}>'
 
+class _CooldownCache(dict):
+    """A dict of cooldown buckets that also keeps a heap of when each bucket
+    is due to expire, so that dead buckets can be evicted without having to
+    look at every bucket in the cache.
+
+    Buckets are used after they're added to the cache, so the heap can be
+    out of date - entries are checked against their bucket when they're
+    popped, and pushed back with the new expiry if the bucket is still alive.
+    """
+
+    __slots__ = ('_expiries', '_deadlines', '_counter')
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._expiries: List[Tuple[float, int, Any]] = []
+        self._deadlines: Dict[Any, float] = {}
+        self._counter = itertools.count()
+        for key, bucket in self.items():
+            self._schedule(key, bucket._last + bucket.per)
+
+    def _schedule(self, key: Any, deadline: float) -> None:
+        # The counter stops keys from being compared when deadlines are equal
+        self._deadlines[key] = deadline
+        heapq.heappush(self._expiries, (deadline, next(self._counter), key))
+
+    def __setitem__(self, key: Any, bucket: Cooldown) -> None:
+        super().__setitem__(key, bucket)
+        self._schedule(key, bucket._last + bucket.per)
+
+    def __delitem__(self, key: Any) -> None:
+        super().__delitem__(key)
+        self._deadlines.pop(key, None)
+
+    def clear(self) -> None:
+        super().clear()
+        self._expiries.clear()
+        self._deadlines.clear()
+
+    def copy(self) -> _CooldownCache:
+        ret = self.__class__()
+        dict.update(ret, self)
+        ret._expiries = self._expiries.copy()
+        ret._deadlines = self._deadlines.copy()
+        ret._counter = itertools.count(next(self._counter))
+        return ret
+
+    def evict(self, current: float) -> None:
+        expiries = self._expiries
+        deadlines = self._deadlines
+        while expiries and expiries[0][0] < current:
+            deadline, _, key = heapq.heappop(expiries)
+            if deadlines.get(key) != deadline:
+                continue  # the key has been rescheduled or removed since
+            bucket = self.get(key)
+            if bucket is None:
+                del deadlines[key]
+                continue
+            expiry = bucket._last + bucket.per
+            if current > expiry:
+                del self[key]
+            else:
+                self._schedule(key, expiry)
+
 class CooldownMapping:
     def __init__(
         self,
@@ -229,7 +296,7 @@ class CooldownMapping:
         if not callable(type):
             raise TypeError('Cooldown type must be a BucketType or callable')
 
-        self._cache: Dict[Any, Cooldown] = {}
+        self._cache: Dict[Any, Cooldown] = _CooldownCache()
         self._cooldown: Optional[Cooldown] = original
         self._type: Callable[[Union[Message, Interaction]], Any] = type
 
@@ -253,14 +320,20 @@ class CooldownMapping:
     def _bucket_key(self, msg: Union[Message, Interaction]) -> Any:
         return self._type(msg)
 
+    def _storage_key(self, command_name: str, msg: Union[Message, Interaction]) -> str:
+        # the key that a CooldownBackend stores the bucket under
+        return f'{command_name}:{self._bucket_key(msg)}'
+
     def _verify_cache_integrity(self, current: Optional[float] = None) -> None:
         # we want to delete all cache objects that haven't been used
         # in a cooldown window. e.g. if we have a  command that has a
         # cooldown of 60s and it has not been used in 60s then that key should be deleted
         current = current or time.time()
-        dead_keys = [k for k, v in self._cache.items() if current > v._last + v.per]
-        for k in dead_keys:
-            del self._cache[k]
+        cache = self._cache
+        if not isinstance(cache, _CooldownCache):
+            # subclasses may have set their own dict
+            cache = self._cache = _CooldownCache(cache)
+        cache.evict(current)
 
     def create_bucket(self, message: Union[Message, Interaction]) -> Cooldown:
         return self._cooldown.copy()  # type: ignore
@@ -309,6 +382,61 @@ class DynamicCooldownMapping(CooldownMapping):
     def create_bucket(self, message: Union[Message, Interaction]) -> Cooldown:
         return self._factory(message)
 
+class CooldownBackend:
+    """The base class for where a bot keeps the state of its command cooldowns.
+
+    The default, :class:`MemoryCooldownBackend`, uses the buckets stored in each
+    command's cooldown mapping, so cooldowns only apply inside of the current
+    process. Subclasses can share cooldowns between processes (for example,
+    clusters of the same bot) by overriding these methods.
+
+    .. versionadded:: 0.2.5
+    """
+
+    async def update_rate_limit(self, key: str, bucket: Cooldown, current: float) -> Optional[float]:
+        """Takes a token from the given bucket.
+
+        Parameters
+        -----------
+        key: :class:`str`
+            A key unique to the command and bucket, which is the same across
+            processes.
+        bucket: :class:`Cooldown`
+            The local bucket, giving the rate and period of the cooldown.
+        current: :class:`float`
+            The time in seconds since Unix epoch that the command was invoked at.
+
+        Returns
+        --------
+        Optional[:class:`float`]
+            The retry-after time in seconds if rate limited.
+        """
+        raise NotImplementedError()
+
+    def reset(self, key: str, bucket: Cooldown) -> None:
+        """Resets the given bucket to its initial state.
+
+        Parameters
+        -----------
+        key: :class:`str`
+            The key that the bucket is stored under.
+        bucket: :class:`Cooldown`
+            The local bucket.
+        """
+        raise NotImplementedError()
+
+class MemoryCooldownBackend(CooldownBackend):
+    """A cooldown backend that keeps all cooldowns inside of the current process.
+
+    .. versionadded:: 0.2.5
+    """
+
+    async def update_rate_limit(self, key: str, bucket: Cooldown, current: float) -> Optional[float]:
+        return bucket.update_rate_limit(current)
+
+    def reset(self, key: str, bucket: Cooldown) -> None:
+        bucket.reset()
+
 class _Semaphore:
     """This class is a version of a semaphore.
 
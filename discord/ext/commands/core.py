@@ -919,13 +919,15 @@ class Command(_BaseCommand, Generic[CogT, P, T]):
         if hook is not None:
             await hook(ctx)
 
-    def _prepare_cooldowns(self, ctx: Context) -> None:
+    async def _prepare_cooldowns(self, ctx: Context) -> None:
         if self._buckets.valid:
             dt = (ctx.message.edited_at or ctx.message.created_at) if ctx.message else discord.utils.snowflake_time(ctx.interaction.id)
             current = dt.replace(tzinfo=datetime.timezone.utc).timestamp()
-            bucket = self._buckets.get_bucket(self._buckets.get_message(ctx), current)
+            message = self._buckets.get_message(ctx)
+            bucket = self._buckets.get_bucket(message, current)
             if bucket is not None:
-                retry_after = bucket.update_rate_limit(current)
+                key = self._buckets._storage_key(self.qualified_name, message)
+                retry_after = await ctx.bot.cooldown_backend.update_rate_limit(key, bucket, current)
                 if retry_after:
                     raise CommandOnCooldown(bucket, retry_after, self._buckets.type)  # type: ignore
 
@@ -942,9 +944,9 @@ class Command(_BaseCommand, Generic[CogT, P, T]):
         try:
             if self.cooldown_after_parsing:
                 await self._parse_arguments(ctx)
-                self._prepare_cooldowns(ctx)
+                await self._prepare_cooldowns(ctx)
             else:
-                self._prepare_cooldowns(ctx)
+                await self._prepare_cooldowns(ctx)
                 await self._parse_arguments(ctx)
 
             await self.call_before_hooks(ctx)
@@ -966,9 +968,9 @@ class Command(_BaseCommand, Generic[CogT, P, T]):
         try:
             if self.cooldown_after_parsing:
                 await self._parse_slash_arguments(ctx)
-                self._prepare_cooldowns(ctx)
+                await self._prepare_cooldowns(ctx)
             else:
-                self._prepare_cooldowns(ctx)
+                await self._prepare_cooldowns(ctx)
                 await self._parse_slash_arguments(ctx)
 
             await self.call_before_hooks(ctx)
@@ -1066,8 +1068,10 @@ class Command(_BaseCommand, Generic[CogT, P, T]):
             The invocation context to reset the cooldown under.
         """
         if self._buckets.valid:
-            bucket = self._buckets.get_bucket(self._buckets.get_message(ctx))
-            bucket.reset()
+            message = self._buckets.get_message(ctx)
+            bucket = self._buckets.get_bucket(message)
+            key = self._buckets._storage_key(self.qualified_name, message)
+            ctx.bot.cooldown_backend.reset(key, bucket)
 
     def get_cooldown_retry_after(self, ctx: Context) -> float:
         """Retrieves the amount of seconds before this command can be tried again.
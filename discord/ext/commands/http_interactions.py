@@ -25,14 +25,13 @@ DEALINGS IN THE SOFTWARE.
 
 import typing
 import logging
-import asyncio
-import time
 
 from aiohttp import web
 from nacl.signing import VerifyKey
 from nacl.exceptions import BadSignatureError
 
 from .bot import BotBase
+from discord import utils
 from discord.interactions import Interaction, HTTPInteractionResponse, InteractionType
 
 if typing.TYPE_CHECKING:
@@ -52,7 +51,9 @@ def get_invalid_response(*, status: int = 401, reason: str = "Invalid request si
     return web.StreamResponse(status=status, reason=reason)
 
 
-async def verify_headers(request: web.Request, application_public_key: str) -> typing.Optional[web.StreamResponse]:
+async def verify_headers(
+        request: web.Request,
+        application_public_key: typing.Union[str, VerifyKey]) -> typing.Optional[web.StreamResponse]:
     """
     Verify whether the headers of a given Discord response both
     *exist* and are valid.
@@ -60,7 +61,10 @@ async def verify_headers(request: web.Request, application_public_key: str) -> t
     Stolen neatly from the Discord API docs.
     """
 
-    verify_key = VerifyKey(bytes.fromhex(application_public_key))
+    if isinstance(application_public_key, VerifyKey):
+        verify_key = application_public_key
+    else:
+        verify_key = VerifyKey(bytes.fromhex(application_public_key))
 
     signature = request.headers.get("X-Signature-Ed25519")
     if not signature:
@@ -71,12 +75,11 @@ async def verify_headers(request: web.Request, application_public_key: str) -> t
         log.debug("Received interaction without a timestamp header")
         return get_invalid_response()
     body_bytes = await request.read()
-    body = body_bytes.decode()
 
     try:
-        verify_key.verify(f'{timestamp}{body}'.encode(), bytes.fromhex(signature))
+        verify_key.verify(timestamp.encode() + body_bytes, bytes.fromhex(signature))
         log.debug("Received interaction with valid signature")
-    except BadSignatureError:
+    except (BadSignatureError, ValueError):
         log.debug("Received interaction an invalid signature")
         return get_invalid_response()
     return None
@@ -100,6 +103,7 @@ def get_interaction_route_table(bot: BotBase, application_public_key: str, *, pa
     """
 
     routes = web.RouteTableDef()
+    verify_key = VerifyKey(bytes.fromhex(application_public_key))
 
     @routes.post(path)
     async def wrapper(request: web.Request) -> web.StreamResponse:
@@ -108,12 +112,12 @@ def get_interaction_route_table(bot: BotBase, application_public_key: str, *, pa
         """
 
         # Verify the request headers
-        if (response := await verify_headers(request, application_public_key)) is not None:
+        if (response := await verify_headers(request, verify_key)) is not None:
             return response
 
         # Grab the data
         try:
-            data: typing.Optional[InteractionPayload] = await request.json()
+            data: typing.Optional[InteractionPayload] = await request.json(loads=utils._from_json)
         except Exception:
             data = None
         if data is None:
@@ -140,11 +144,9 @@ def get_interaction_route_table(bot: BotBase, application_public_key: str, *, pa
         if not isinstance(interaction.response, HTTPInteractionResponse):
             raise AssertionError
 
-        # Sleep for a couple seconds, just so we don't try and return without
+        # Wait a couple seconds, just so we don't try and return without
         # sending a response from inside the bot
-        t0 = time.time()
-        while interaction.response._aiohttp_response._eof_sent is False and time.time() - t0 < SLEEP_TIME:
-            await asyncio.sleep(0.01)
+        await interaction.response.wait_until_written(SLEEP_TIME)
 
         # And give some return data
         return interaction.response._aiohttp_response
@@ -11,6 +11,7 @@ from .runner import (
     run_shell,
     run_modify_commands,
     run_interactions,
+    run_interactions_workers,
 )
 
 
@@ -98,6 +99,7 @@ def get_default_program_arguments() -> argparse.ArgumentParser:
     interactions_subparser.add_argument("--port", nargs="?", type=int, default="8080", help="The port to run the website with.")
     interactions_subparser.add_argument("--path", nargs="?", type=str, default="/interactions", help="The path to run the interactions endpoint on.")
     interactions_subparser.add_argument("--connect", action="store_true", default=False, help="Whether you want your bot to connect to the Discord gateway.")
+    interactions_subparser.add_argument("--workers", nargs="?", type=int, default=1, help="The number of processes to serve interactions from, all sharing the same port.")
     interactions_subparser.add_argument("--debug", action="store_true", default=False, help="Whether or not to run the website in debug mode.")
     interactions_subparser.add_argument("--loglevel", nargs="?", default="INFO", help="Global logging level - probably most useful is INFO and DEBUG.", choices=LOGLEVEL_CHOICES)
 
@@ -247,7 +249,10 @@ def main():
     elif args.subcommand == "run-bot":
         wrap_asyncio_run(run_bot, args)
     elif args.subcommand == "run-interactions":
-        wrap_asyncio_run(run_interactions, args)
+        if args.workers > 1:
+            run_interactions_workers(args)
+        else:
+            wrap_asyncio_run(run_interactions, args)
     elif args.subcommand == "run-website":
         wrap_asyncio_run(run_website, args)
     elif args.subcommand == "run-sharder":
@@ -8,17 +8,30 @@ from . import utils as vbu
 
 class Analytics(vbu.Cog):
 
-    FOUND_GATEWAY_OPCODES = {}
+    GATEWAY_OPCODES = {
+        value: name
+        for name, value in vars(discord.gateway.DiscordWebSocket).items()
+        if name.isupper() and type(value) is int
+    }
+    SEND_QUEUE_PRIORITIES = {
+        discord.gateway.GatewaySendQueue.CRITICAL: "critical",
+        discord.gateway.GatewaySendQueue.NORMAL: "normal",
+        discord.gateway.GatewaySendQueue.BULK: "bulk",
+    }
 
     def __init__(self, bot: vbu.Bot):
         super().__init__(bot)
+        self._send_queue_coalesced = {}
         self.post_statsd_guild_count.start()
+        self.post_statsd_gateway_counters.start()
         self.post_topgg_guild_count.start()
         self.post_discordbotlist_guild_count.start()
 
     def cog_unload(self):
         self.logger.info("Stopping Statsd guild count poster loop")
         self.post_statsd_guild_count.cancel()
+        self.logger.info("Stopping Statsd gateway counter poster loop")
+        self.post_statsd_gateway_counters.cancel()
         self.logger.info("Stopping Top.gg guild count poster loop")
         self.post_topgg_guild_count.cancel()
         self.logger.info("Stopping DiscordbotList.com guild count poster loop")
@@ -121,48 +134,38 @@ class Analytics(vbu.Cog):
     async def before_post_statsd_guild_count(self):
         await self.bot.wait_until_ready()
 
-    @vbu.Cog.listener()
-    async def on_socket_raw_send(self, payload: dict):
-        """
-        A raw socket response message send Discord.
-        """
-
-        # Get the event opcode
-        try:
-            event_id = json.loads(payload)['op']
-        except Exception:
-            return  # there isn't one somehow but okay
-
-        # Try and get a name from that opcode
-        event_name = self.FOUND_GATEWAY_OPCODES.get(event_id)
-        if event_name is None:
-            for i in dir(discord.gateway.DiscordWebSocket):
-                if i.isupper():
-                    o = getattr(discord.gateway.DiscordWebSocket, i, None)
-                    if type(o) is int:
-                        self.FOUND_GATEWAY_OPCODES[o] = i
-                        if event_id == o:
-                            event_name = i
-                            break
-
-        # Post that to statsd
-        async with self.bot.stats() as stats:
-            try:
-                stats.increment("discord.gateway.send", tags={"event_name": event_name})
-            except KeyError:
-                pass
-
-    @vbu.Cog.listener()
-    async def on_socket_response(self, payload: dict):
+    @tasks.loop(seconds=15)
+    async def post_statsd_gateway_counters(self):
         """
-        A raw socket response message from Discord.
+        Post the gateway events received and payloads sent since the last run to Statsd.
         """
 
+        received, sent = self.bot._connection.consume_gateway_counters()
+        send_queues = self.bot._connection.gateway_send_queues
         async with self.bot.stats() as stats:
-            try:
-                stats.increment("discord.gateway.receive", tags={"event_name": payload['t']})
-            except KeyError:
-                pass
+            for event_name, count in received.items():
+                stats.increment("discord.gateway.receive", value=count, tags={"event_name": event_name})
+            for op, count in sent.items():
+                stats.increment("discord.gateway.send", value=count, tags={"event_name": self.GATEWAY_OPCODES.get(op, op)})
+
+            # Post how backed up each shard's send queue is
+            last_coalesced, self._send_queue_coalesced = self._send_queue_coalesced, {}
+            for shard_id, queue in send_queues.items():
+                for priority, depth in queue.depths().items():
+                    stats.gauge(
+                        "discord.gateway.send_queue.depth",
+                        value=depth,
+                        tags={"shard_id": str(shard_id), "priority": self.SEND_QUEUE_PRIORITIES.get(priority, priority)},
+                    )
+                coalesced = queue.coalesced - last_coalesced.get(id(queue), 0)
+                self._send_queue_coalesced[id(queue)] = queue.coalesced
+                if coalesced:
+                    stats.increment("discord.gateway.send_queue.coalesced", value=coalesced, tags={"shard_id": str(shard_id)})
+
+    @post_statsd_gateway_counters.after_loop
+    async def after_post_statsd_gateway_counters(self):
+        if self.post_statsd_gateway_counters.is_being_cancelled():
+            await self.post_statsd_gateway_counters()
 
     @vbu.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild):
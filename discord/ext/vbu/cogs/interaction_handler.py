@@ -10,11 +10,9 @@ from . import utils as vbu
 
 class InteractionHandler(vbu.Cog, command_attrs={'hidden': True, 'add_slash_command': False}):
 
-    @vbu.Cog.listener()
-    async def on_component_interaction(self, interaction: discord.Interaction):
-        if not interaction.custom_id.startswith("RUNCOMMAND"):
-            return
-        command_name = interaction.custom_id[len("RUNCOMMAND "):]
+    @vbu.Cog.component_listener("RUNCOMMAND")
+    async def run_command_component(self, interaction: discord.Interaction, *args: str):
+        command_name = " ".join(args)
         command = self.bot.get_command(command_name)
         ctx = await self.bot.get_slash_context(interaction=interaction)
         ctx.invoked_with = command_name
@@ -1,6 +1,7 @@
 import asyncio
 import contextlib
 import copy
+import csv
 import io
 import os
 import json
@@ -523,6 +524,41 @@ class OwnerOnly(vbu.Cog[vbu.Bot], command_attrs={'hidden': True, 'add_slash_comm
         file = discord.File(io.StringIO(string_output), filename="runsql.txt")
         await ctx.send(file=file)
 
+    @commands.command(aliases=['dbstats'])
+    @commands.is_owner()
+    @commands.bot_has_permissions(send_messages=True, attach_files=True)
+    async def querystats(self, ctx: vbu.Context, limit: int = 20):
+        """
+        Shows the queries that the database has spent the most time running.
+        """
+
+        # Sort our queries by the total time taken
+        query_stats = self.bot.database.query_stats
+        queries = sorted(query_stats.queries.items(), key=lambda i: i[1].total, reverse=True)[:limit]
+        if not queries:
+            return await ctx.send("No queries have been run.")
+
+        # Work out our lines
+        lines = [
+            f"{'Total':>10} {'Count':>8} {'Mean':>9} {'p95':>9} {'Max':>9} {'Rows':>8} {'Errors':>6}  Query",
+        ]
+        for sql, timing in queries:
+            lines.append(
+                f"{timing.total * 1_000:>8.0f}ms {timing.count:>8} {timing.mean * 1_000:>7.1f}ms "
+                f"{timing.percentile(0.95) * 1_000:>7.1f}ms {timing.max * 1_000:>7.1f}ms "
+                f"{timing.rows / timing.count:>8.1f} {timing.errors:>6}  {sql}"
+            )
+        pool_wait = query_stats.pool_wait
+        lines.append("")
+        lines.append(
+            f"Pool wait: {pool_wait.count} acquires, {pool_wait.mean * 1_000:.1f}ms mean, "
+            f"{pool_wait.percentile(0.95) * 1_000:.1f}ms p95, {pool_wait.max * 1_000:.1f}ms max"
+        )
+
+        # Send it out
+        file = discord.File(io.StringIO('\n'.join(lines)), filename="querystats.txt")
+        await ctx.send(file=file)
+
     @commands.group()
     @commands.is_owner()
     @commands.bot_has_permissions(send_messages=True)
@@ -799,25 +835,20 @@ class OwnerOnly(vbu.Cog[vbu.Bot], command_attrs={'hidden': True, 'add_slash_comm
         """
         filename = f"./{table_name}_export.csv"
 
-        # Make our initial file
-        with open(filename, 'w') as f:
-            f.write("")
-
-        # Get the data we want to save
-        async with self.bot.database() as db:
-            await db.conn.copy_from_query('SELECT * FROM {table_name}'.format(table_name=table_name), output=filename, format='csv')
-            column_descs = await db('DESCRIBE TABLE {table_name}'.format(table_name=table_name))
-
-        # See what was written to the file
-        with open(filename, 'r') as f:
-            file_content = f.read()
-
-        # Add our headers
-        headers = ','.join([i['column_name'] for i in column_descs])
-
-        # Write the new content to the file
-        with open(filename, 'w') as f:
-            f.write(headers + "\n" + file_content)
+        # Write the rows to the file as we get them, with our headers taken from the first row
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            async with self.bot.database() as db:
+                headers_written = False
+                rows = db.stream('SELECT * FROM {table_name}'.format(table_name=table_name))
+                try:
+                    async for row in rows:
+                        if not headers_written:
+                            writer.writerow(row.keys())
+                            headers_written = True
+                        writer.writerow(row.values())
+                finally:
+                    await rows.aclose()
 
         # Send it to discord
         await ctx.send(file=discord.File(filename))
@@ -46,6 +46,7 @@ class BotSettings(vbu.Cog):
 
         # Store setting
         self.bot.guild_settings[ctx.guild.id][prefix_column] = new_prefix
+        self.bot.settings_bus.set("guild", ctx.guild.id, (prefix_column,), new_prefix)
         async with self.bot.database() as db:
             await db(
                 """INSERT INTO guild_settings (guild_id, {prefix_column}) VALUES ($1, $2)
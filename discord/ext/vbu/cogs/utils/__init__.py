@@ -6,7 +6,7 @@ from .custom_bot import MinimalBot, Bot
 from .custom_cog import Cog
 from .custom_context import Context, AbstractMentionable, PrintContext, SlashContext
 from .database import DatabaseWrapper, DatabaseTransaction
-from .redis import RedisConnection, RedisChannelHandler, redis_channel_handler
+from .redis import RedisConnection, RedisChannelHandler, RedisRateLimitBackend, RedisCooldownBackend, RedisSessionStore, redis_channel_handler
 from .statsd import StatsdConnection
 from .time_value import TimeValue
 from .paginator import Paginator
@@ -37,6 +37,9 @@ __all__ = (
     'DatabaseTransaction',
     'RedisConnection',
     'RedisChannelHandler',
+    'RedisRateLimitBackend',
+    'RedisCooldownBackend',
+    'RedisSessionStore',
     'redis_channel_handler',
     'StatsdConnection',
     'TimeValue',
@@ -1,139 +1,161 @@
 import typing
-import re
-import logging
 import json
 
 import aiohttp
 
+from discord.http import RequestInfo
+from discord.webhook.async_ import async_context as async_webhook_context
 
-class AnalyticsLogHandler(logging.NullHandler):
+
+class AnalyticsLogHandler(object):
     """
-    This class is explicitly for handling logger data from Discord.py.
+    This class is explicitly for sending HTTP request data from Novus into
+    statsd. It's added as a request hook to the bot's HTTP client and to the
+    webhook adapter, so it gets the route template for each request directly
+    rather than having to parse it back out of the debug logs.
     """
 
     HTTP_EVENT_NAMES = {
         "GET": {
-            re.compile(r'/users/([0-9]{15,23})$', re.IGNORECASE): 'get_user',
-            re.compile(r'/users/@me/guilds$', re.IGNORECASE): 'get_guilds',
-            re.compile(r'/guilds/([0-9]{15,23})$', re.IGNORECASE): 'get_guild',
-            re.compile(r'/channels/([0-9]{15,23})$', re.IGNORECASE): 'get_channel',
-            re.compile(r'/channels/([0-9]{15,23})/messages/([0-9]{15,23})/reactions/(.+)$', re.IGNORECASE): 'get_reaction_users',
-            re.compile(r'/channels/([0-9]{15,23})/messages/([0-9]{15,23})$', re.IGNORECASE): 'get_message',
-            re.compile(r'/guilds/([0-9]{15,23})/bans$', re.IGNORECASE): 'get_bans',
-            re.compile(r'/guilds/([0-9]{15,23})/bans/([0-9]{15,23})$', re.IGNORECASE): 'get_ban',
-            re.compile(r'/guilds/([0-9]{15,23})/channels$', re.IGNORECASE): 'get_channels',
-            re.compile(r'/guilds/([0-9]{15,23})/members$', re.IGNORECASE): 'get_members',
-            re.compile(r'/guilds/([0-9]{15,23})/members/([0-9]{15,23})$', re.IGNORECASE): 'get_member',
-            re.compile(r'/guilds/([0-9]{15,23})/emojis$', re.IGNORECASE): 'get_custom_emojis',
-            re.compile(r'/guilds/([0-9]{15,23})/emojis/([0-9]{15,23})$', re.IGNORECASE): 'get_custom_emoji',
-            re.compile(r'/guilds/([0-9]{15,23})/audit-logs$', re.IGNORECASE): 'get_audit_logs',
-            re.compile(r'/guilds/([0-9]{15,23})/roles$', re.IGNORECASE): 'get_roles',
+            '/users/{user_id}': 'get_user',
+            '/users/@me/guilds': 'get_guilds',
+            '/guilds/{guild_id}': 'get_guild',
+            '/channels/{channel_id}': 'get_channel',
+            '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}': 'get_reaction_users',
+            '/channels/{channel_id}/messages/{message_id}': 'get_message',
+            '/guilds/{guild_id}/bans': 'get_bans',
+            '/guilds/{guild_id}/bans/{user_id}': 'get_ban',
+            '/guilds/{guild_id}/channels': 'get_channels',
+            '/guilds/{guild_id}/members': 'get_members',
+            '/guilds/{guild_id}/members/{member_id}': 'get_member',
+            '/guilds/{guild_id}/emojis': 'get_custom_emojis',
+            '/guilds/{guild_id}/emojis/{emoji_id}': 'get_custom_emoji',
+            '/guilds/{guild_id}/audit-logs': 'get_audit_logs',
+            '/guilds/{guild_id}/roles': 'get_roles',
         },
         "POST": {
-            re.compile(r'/channels/([0-9]{15,23})/messages$', re.IGNORECASE): 'send_message',
-            re.compile(r'/channels/([0-9]{15,23})/messages/bulk_delete$', re.IGNORECASE): 'bulk_delete',
-            re.compile(r'/guilds/([0-9]{15,23})/channels$', re.IGNORECASE): 'create_channel',
-            re.compile(r'/guilds/([0-9]{15,23})/emojis$', re.IGNORECASE): 'create_custom_emoji',
-            re.compile(r'/interactions/([0-9]{15,23})/([a-zA-Z0-9\-_]+?)/callback$', re.IGNORECASE): 'create_interaction_response',
+            '/channels/{channel_id}/messages': 'send_message',
+            '/channels/{channel_id}/messages/bulk-delete': 'bulk_delete',
+            '/guilds/{guild_id}/channels': 'create_channel',
+            '/guilds/{guild_id}/emojis': 'create_custom_emoji',
+            '/interactions/{webhook_id}/{webhook_token}/callback': 'create_interaction_response',
         },
         "PUT": {
-            re.compile(r'/channels/([0-9]{15,23})/messages/([0-9]{15,23})/reactions/(.+?)/@me$', re.IGNORECASE): 'add_reaction',
-            re.compile(r'/guilds/([0-9]{15,23})/bans/([0-9]{15,23})$', re.IGNORECASE): 'ban',
-            re.compile(r'/guilds/([0-9]{15,23})/members/([0-9]{15,23})/roles/([0-9]{15,23})$', re.IGNORECASE): 'add_member_role',
-            re.compile(r'/channels/([0-9]{15,23})/permissions/([0-9]{15,23})$', re.IGNORECASE): 'edit_channel_permissions',
+            '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me': 'add_reaction',
+            '/guilds/{guild_id}/bans/{user_id}': 'ban',
+            '/guilds/{guild_id}/members/{user_id}/roles/{role_id}': 'add_member_role',
+            '/channels/{channel_id}/permissions/{target}': 'edit_channel_permissions',
         },
         "DELETE": {
-            re.compile(r'/channels/([0-9]{15,23})/messages/([0-9]{15,23})$', re.IGNORECASE): 'delete_message',
-            re.compile(r'/guilds/([0-9]{15,23})/members/([0-9]{15,23})$', re.IGNORECASE): 'kick',
-            re.compile(r'/guilds/([0-9]{15,23})/bans/([0-9]{15,23})$', re.IGNORECASE): 'unban',
-            re.compile(r'/channels/([0-9]{15,23})/messages/([0-9]{15,23})/reactions/(.+)/([0-9]{15,23})$', re.IGNORECASE): 'remove_reaction',
-            re.compile(r'/channels/([0-9]{15,23})/messages/([0-9]{15,23})/reactions/(.+)/@me$', re.IGNORECASE): 'remove_reaction',
-            re.compile(r'/channels/([0-9]{15,23})/messages/([0-9]{15,23})/reactions$', re.IGNORECASE): 'clear_reactions',
-            re.compile(r'/channels/([0-9]{15,23})/messages/([0-9]{15,23})/reactions/(.+)$', re.IGNORECASE): 'clear_single_reaction',
-            re.compile(r'/channels/([0-9]{15,23})$', re.IGNORECASE): 'delete_channel',
-            re.compile(r'/guilds/([0-9]{15,23})/emojis/([0-9]{15,23})$', re.IGNORECASE): 'delete_custom_emoji',
-            re.compile(r'/guilds/([0-9]{15,23})/roles/([0-9]{15,23})$', re.IGNORECASE): 'delete_role',
-            re.compile(r'/guilds/([0-9]{15,23})/members/([0-9]{15,23})/roles/([0-9]{15,23})$', re.IGNORECASE): 'remove_member_role',
-            re.compile(r'/channels/([0-9]{15,23})/permissions/([0-9]{15,23})$', re.IGNORECASE): 'remove_channel_permissions',
+            '/channels/{channel_id}/messages/{message_id}': 'delete_message',
+            '/guilds/{guild_id}/members/{user_id}': 'kick',
+            '/guilds/{guild_id}/bans/{user_id}': 'unban',
+            '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/{member_id}': 'remove_reaction',
+            '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me': 'remove_reaction',
+            '/channels/{channel_id}/messages/{message_id}/reactions': 'clear_reactions',
+            '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}': 'clear_single_reaction',
+            '/channels/{channel_id}': 'delete_channel',
+            '/guilds/{guild_id}/emojis/{emoji_id}': 'delete_custom_emoji',
+            '/guilds/{guild_id}/roles/{role_id}': 'delete_role',
+            '/guilds/{guild_id}/members/{user_id}/roles/{role_id}': 'remove_member_role',
+            '/channels/{channel_id}/permissions/{target}': 'remove_channel_permissions',
         },
         "PATCH": {
-            re.compile(r'/guilds/([0-9]{15,23})/members/@me/nick$', re.IGNORECASE): 'change_nickname',
-            re.compile(r'/guilds/([0-9]{15,23})/members/([0-9]{15,23})$', re.IGNORECASE): 'edit_member',
-            re.compile(r'/channels/([0-9]{15,23})/messages/([0-9]{15,23})$', re.IGNORECASE): 'edit_message',
-            re.compile(r'/channels/([0-9]{15,23})$', re.IGNORECASE): 'edit_channel',
-            re.compile(r'/guilds/([0-9]{15,23})$', re.IGNORECASE): 'edit_guild',
-            re.compile(r'/guilds/([0-9]{15,23})/roles/([0-9]{15,23})$', re.IGNORECASE): 'edit_role',
-            re.compile(r'/guilds/([0-9]{15,23})/roles$', re.IGNORECASE): 'move_role_position',
+            '/guilds/{guild_id}/members/@me/nick': 'change_nickname',
+            '/guilds/{guild_id}/members/{user_id}': 'edit_member',
+            '/channels/{channel_id}/messages/{message_id}': 'edit_message',
+            '/channels/{channel_id}': 'edit_channel',
+            '/guilds/{guild_id}': 'edit_guild',
+            '/guilds/{guild_id}/roles/{role_id}': 'edit_role',
+            '/guilds/{guild_id}/roles': 'move_role_position',
         },
     }
     WEBHOOK_EVENT_NAMES = {
         "POST": {
-            re.compile(r'/webhooks/([0-9]{16,23})/([a-zA-Z0-9\-_]+?)$', re.IGNORECASE): 'send_webhook_message',
-            re.compile(r'/webhooks/([0-9]{16,23})/([a-zA-Z0-9\-_]+?)/messages/([0-9]{16,23})$', re.IGNORECASE): 'edit_webhook_message',
+            '/webhooks/{webhook_id}/{webhook_token}': 'send_webhook_message',
+        },
+        "PATCH": {
+            '/webhooks/{webhook_id}/{webhook_token}/messages/{message_id}': 'edit_webhook_message',
+            '/webhooks/{webhook_id}/{webhook_token}/messages/@original': 'edit_webhook_message',
         },
         "DELETE": {
-            re.compile(r'/webhooks/([0-9]{16,23})/([a-zA-Z0-9\-_]+?)/messages/([0-9]{16,23})$', re.IGNORECASE): 'delete_message',
+            '/webhooks/{webhook_id}/{webhook_token}/messages/{message_id}': 'delete_message',
         },
     }
-    MESSAGE_DECONSTRUCTOR = re.compile(r"^(?P<method>.+) https://discord(:?app)?.(?:com|gg)/api/v\d(?P<endpoint>.+) with (?P<payload>.+) has returned (?P<status>\d+)$")
-    WEBHOOK_MESSAGE_DECONSTRUCTOR = re.compile(r"^Webhook ID (?P<webhookid>.+) with (?P<method>.+) https://discord(:?app)?.(?:com|gg)/api/v\d(?P<endpoint>.+) has returned status code (?P<status>\d+)$")
 
-    def __init__(self, bot, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    # The webhook adapter is shared by the whole process, so only one handler
+    # is ever added to it
+    _webhook_handler: typing.ClassVar[typing.Optional["AnalyticsLogHandler"]] = None
+
+    def __init__(self, bot):
         self.bot = bot
 
+    def add_hooks(self) -> None:
+        """
+        Add the request hooks to the bot's HTTP client, and to the webhook
+        adapter if no other bot in this process has done so already.
+        """
+
+        self.bot.http.add_request_hook(self.http_hook)
+        if AnalyticsLogHandler._webhook_handler is None:
+            AnalyticsLogHandler._webhook_handler = self
+            async_webhook_context.get().add_request_hook(self.webhook_hook)
+
     @classmethod
-    def get_http_event_name(cls, increment: str, method: str, url: str) -> typing.Optional[str]:
+    def get_http_event_name(cls, increment: str, method: str, path: str) -> typing.Optional[str]:
         """
         Get the name of the event that we want to increment.
         """
 
-        if increment.startswith("discord.http"):
+        if increment == "discord.http":
             possible_endpoints = cls.HTTP_EVENT_NAMES.get(method.upper(), {})
-        elif increment.startswith("discord.webhook"):
+        elif increment == "discord.webhook":
             possible_endpoints = cls.WEBHOOK_EVENT_NAMES.get(method.upper(), {})
         else:
             return None
-        for endpoint_regex, event_name in possible_endpoints.items():
-            if endpoint_regex.search(str(url)):
-                return event_name
-        return None
+        return possible_endpoints.get(path)
 
-    def handle(self, record: logging.LogRecord):
+    def http_hook(self, info: RequestInfo) -> None:
         """
-        Override handle so we can also statsd incremement.
+        The request hook for the bot's HTTP client.
         """
 
-        message = record.getMessage()
-        self.bot.loop.create_task(self.log_response(message))
-        return super().handle(record)
+        self.handle("discord.http", info)
 
-    async def log_response(self, message):
+    def webhook_hook(self, info: RequestInfo) -> None:
         """
-        Log our response.
+        The request hook for the webhook adapter.
         """
 
-        match = self.MESSAGE_DECONSTRUCTOR.search(message)
-        if match is not None:
-            return await self.log_message_increment("discord.http", match)
-        match = self.WEBHOOK_MESSAGE_DECONSTRUCTOR.search(message)
-        if match is not None:
-            return await self.log_message_increment("discord.webhook", match)
+        self.handle("discord.webhook", info)
 
-    async def log_message_increment(self, increment, match):
+    def handle(self, increment: str, info: RequestInfo) -> None:
         """
-        Send that actual statsd increment.
+        Work out if we care about a given request, and if so schedule it to be
+        sent to statsd.
         """
 
-        event_name = self.get_http_event_name(increment, match.group("method"), match.group("endpoint"))
+        if info.status is None:
+            return
+        event_name = self.get_http_event_name(increment, info.method, info.path)
         if event_name is None:
             return
+        self.bot.loop.create_task(self.log_message_increment(increment, event_name, info))
+
+    async def log_message_increment(self, increment: str, event_name: str, info: RequestInfo):
+        """
+        Send that actual statsd increment.
+        """
+
+        status = str(info.status)
+        tags = {
+            "endpoint": event_name,
+            "status_code": info.status,
+            "status_code_class": status[0] + "x" * (len(status) - 1),
+        }
         async with self.bot.stats() as stats:
-            stats.increment(increment, tags={
-                "endpoint": event_name,
-                "status_code": int(match.group("status")),
-                "status_code_class": match.group("status")[0] + "x" * (len(match.group("status")) - 1)
-            })
+            stats.increment(increment, tags=tags)
+            stats.timing(f"{increment}.latency", value=info.latency * 1_000, tags=tags)
 
 
 class AnalyticsClientSession(aiohttp.ClientSession):
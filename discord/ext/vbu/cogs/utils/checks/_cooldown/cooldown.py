@@ -110,6 +110,9 @@ class GroupedCooldownMapping(CooldownMapping):
     def _cache(self, value):
         grouped_cooldown_mapping_cache[self.group_cache_key] = value
 
+    def _storage_key(self, command_name: str, message: discord.Message) -> str:
+        return f"{self.group_cache_key}:{self._bucket_key(message)}"
+
 
 class Cooldown(commands.Cooldown):
     """
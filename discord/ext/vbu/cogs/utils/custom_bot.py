@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import asyncio
 import collections
+import contextlib
 import glob
 import logging
 from typing import (
     TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
     Union,
     List,
     Optional,
@@ -18,6 +22,7 @@ import string
 import platform
 import random
 import json
+import hashlib
 import sys
 
 import aiohttp
@@ -29,7 +34,9 @@ import upgradechat
 
 from .custom_context import Context, SlashContext
 from .database import DatabaseWrapper
-from .redis import RedisConnection
+from .redis import RedisConnection, RedisRateLimitBackend, RedisCooldownBackend, RedisSessionStore
+from .settings_bus import SettingsBus
+from .settings_cache import SettingsCache
 from .statsd import StatsdConnection
 from .analytics_log_handler import AnalyticsLogHandler, AnalyticsClientSession
 from .shard_manager import ShardManagerClient
@@ -44,7 +51,7 @@ if TYPE_CHECKING:
 sys.path.append(".")
 
 
-def get_prefix(bot, message: discord.Message):
+async def get_prefix(bot, message: discord.Message):
     """
     Get the guild prefix for the bot given the message that should be invoking a command.
     """
@@ -60,6 +67,8 @@ def get_prefix(bot, message: discord.Message):
 
     # Custom prefix or default prefix
     else:
+        if getattr(bot, 'lazy_settings', False):
+            await bot.guild_settings.fetch(message.guild.id)
         guild_prefix = (
             bot.guild_settings
             [message.guild.id]
@@ -67,6 +76,30 @@ def get_prefix(bot, message: discord.Message):
         )
         prefix = guild_prefix or config_prefix
 
+    # See if we've already built the prefixes for this guild
+    guild_id = message.guild.id if message.guild else None
+    prefix_key = tuple(prefix) if isinstance(prefix, list) else prefix
+    try:
+        cached_key, cached_prefixes = bot._prefix_cache[guild_id]
+    except KeyError:
+        pass
+    else:
+        if cached_key == prefix_key:
+            return cached_prefixes
+
+    # And we're FINALLY done
+    prefixes = build_prefixes(bot, message.guild, prefix)
+    bot._prefix_cache[guild_id] = (prefix_key, prefixes)
+    return prefixes
+
+
+def build_prefixes(bot, guild: Optional[discord.Guild], prefix) -> Tuple[str, ...]:
+    """
+    Build every variation of the given prefix that the bot should respond to
+    in a guild, including mentions. Longer prefixes come first so that they're
+    matched in preference to any shorter prefix that they start with.
+    """
+
     # Fuck iOS devices
     if type(prefix) is not list and prefix in ["'", "‘"]:
         prefix = ["'", "‘"]
@@ -91,11 +124,11 @@ def get_prefix(bot, message: discord.Message):
     prefix.extend([f"{i.strip()} " for i in possible_word_prefixes])
 
     # Add the bot's managed role
-    if message.guild:
+    if guild:
         try:
             managed_role = [
                 i
-                for i in message.guild.roles
+                for i in guild.roles
                 if i.tags
                 and i.tags.bot_id == bot.user.id
             ]
@@ -104,8 +137,9 @@ def get_prefix(bot, message: discord.Message):
         if managed_role:
             prefix.extend([f"<@&{managed_role[0].id}> "])
 
-    # And we're FINALLY done
-    return commands.when_mentioned_or(*prefix)(bot, message)
+    # Add mentions
+    prefix.extend(commands.when_mentioned(bot, None))  # type: ignore
+    return tuple(sorted(set(prefix), key=lambda i: (-len(i), i)))
 
 
 class MinimalBot(commands.AutoShardedBot):
@@ -227,7 +261,11 @@ class Bot(MinimalBot):
             if not.
         startup_method (asyncio.Task): The task that's run when the bot is starting up.
         guild_settings (dict): A dictionary from the `guild_settings` Postgres table.
+            This is a :class:`SettingsCache` if ``lazy_settings`` is enabled in your database config.
         user_settings (dict): A dictionary from the `user_settings` Postgres table.
+            This is a :class:`SettingsCache` if ``lazy_settings`` is enabled in your database config.
+        settings_bus (SettingsBus): Shares changes to :attr:`guild_settings` and :attr:`user_settings`
+            with the other clusters if ``shared_settings`` is enabled in your Redis config.
         user_agent (str): The user agent that the bot should use for web requests as set in the
             :attr:`config file<BotConfig.user_agent>`. This isn't used automatically anywhere,
             so it just here as a provided convenience.
@@ -279,6 +317,19 @@ class Bot(MinimalBot):
 
         # Get our max messages
         cached_messages = self.config.get('cached_messages', 1_000)
+        cached_messages_per_channel = self.config.get('cached_messages_per_channel') or None
+        cached_messages_per_guild = self.config.get('cached_messages_per_guild') or None
+        kwargs.setdefault('cache_snapshot', self.config.get('cache_snapshot') or None)
+
+        # Share our rate limits with the other clusters if we're told to
+        redis_config = self.config.get('redis', {})
+        if redis_config.get('enabled', False) and redis_config.get('shared_ratelimits', False):
+            kwargs.setdefault('ratelimiter', RedisRateLimitBackend(loop=kwargs.get('loop')))
+        if redis_config.get('enabled', False) and redis_config.get('shared_cooldowns', False):
+            kwargs.setdefault('cooldown_backend', RedisCooldownBackend())
+        if redis_config.get('enabled', False) and redis_config.get('persist_sessions', False):
+            token_hash = hashlib.sha256(self.config['token'].encode()).hexdigest()[:16]
+            kwargs.setdefault('session_store', RedisSessionStore(prefix=f"vbu:gateway_session:{token_hash}"))
 
         # Run original
         super().__init__(
@@ -289,6 +340,8 @@ class Bot(MinimalBot):
             intents=intents,
             allowed_mentions=allowed_mentions,
             max_messages=cached_messages,
+            max_channel_messages=cached_messages_per_channel,
+            max_guild_messages=cached_messages_per_guild,
             *args,
             **kwargs,
         )
@@ -335,20 +388,76 @@ class Bot(MinimalBot):
         # Store whether or not we're an interactions only bot
         self.is_interactions_only = False  # Set elsewhere
 
-        # Regardless of whether we start statsd or not, I want to add the log handler
-        handler = AnalyticsLogHandler(self)
-        handler.setLevel(logging.DEBUG)
-        logging.getLogger('discord.http').addHandler(handler)
-        logging.getLogger('discord.webhook.async_').addHandler(handler)
-        logging.getLogger('discord.webhook.sync').addHandler(handler)
+        # Regardless of whether we start statsd or not, I want to add the request hooks
+        AnalyticsLogHandler(self).add_hooks()
+
+        # Built prefixes for each guild, keyed by guild ID - the bot's managed
+        # role is included so they're thrown away when the guild's roles change
+        self._prefix_cache: Dict[Optional[int], Tuple[Any, Tuple[str, ...]]] = {}
+        for event in ['on_guild_role_create', 'on_guild_role_update', 'on_guild_role_delete']:
+            self.add_listener(self._clear_role_prefix_cache, event)
+        self.add_listener(self._clear_guild_prefix_cache, 'on_guild_remove')
 
         # Here's the storage for cached stuff
-        self.guild_settings = collections.defaultdict(
-            lambda: copy.deepcopy(self.DEFAULT_GUILD_SETTINGS)
-        )
-        self.user_settings = collections.defaultdict(
-            lambda: copy.deepcopy(self.DEFAULT_USER_SETTINGS)
-        )
+        database_config = self.config.get('database', {})
+        self.lazy_settings: bool = database_config.get('lazy_settings', False)
+        if self.lazy_settings:
+            cache_kwargs = {
+                "max_size": database_config.get('settings_cache_size', 10_000),
+                "ttl": database_config.get('settings_cache_ttl', 0),
+            }
+            self.guild_settings = SettingsCache(
+                self.database, "guild_settings", "guild_id",
+                self.DEFAULT_GUILD_SETTINGS, **cache_kwargs,
+            )
+            self.user_settings = SettingsCache(
+                self.database, "user_settings", "user_id",
+                self.DEFAULT_USER_SETTINGS, **cache_kwargs,
+            )
+        else:
+            self.guild_settings = collections.defaultdict(
+                lambda: copy.deepcopy(self.DEFAULT_GUILD_SETTINGS)
+            )
+            self.user_settings = collections.defaultdict(
+                lambda: copy.deepcopy(self.DEFAULT_USER_SETTINGS)
+            )
+        self.settings_bus = SettingsBus(self)
+
+    async def _clear_role_prefix_cache(self, *roles: discord.Role):
+        self._prefix_cache.pop(roles[0].guild.id, None)
+
+    async def _clear_guild_prefix_cache(self, guild: discord.Guild):
+        self._prefix_cache.pop(guild.id, None)
+
+    async def get_context(self, message, *, cls=None) -> Context:
+        """:meta private:"""
+
+        ctx = await super().get_context(message, cls=cls)
+        if ctx.command is not None:
+            await self._load_settings(ctx.guild, ctx.author)
+        return ctx
+
+    async def get_slash_context(self, interaction, *, cls=None) -> SlashContext:
+        """:meta private:"""
+
+        ctx = await super().get_slash_context(interaction, cls=cls)
+        await self._load_settings(ctx.guild, ctx.author)
+        return ctx
+
+    async def _load_settings(self, guild: Optional[discord.abc.Snowflake], user: Optional[discord.abc.Snowflake]) -> None:
+        """
+        Make sure that the settings for the given guild and user are loaded
+        if they're being loaded lazily.
+        """
+
+        if not self.lazy_settings:
+            return
+        waiting = []
+        if guild is not None:
+            waiting.append(self.guild_settings.fetch(guild.id))
+        if user is not None:
+            waiting.append(self.user_settings.fetch(user.id))
+        await asyncio.gather(*waiting)
 
     async def startup(self):
         """
@@ -373,6 +482,7 @@ class Bot(MinimalBot):
         self.logger.debug("Clearing caches")
         self.guild_settings.clear()
         self.user_settings.clear()
+        self._prefix_cache.clear()
 
         # Get database connection
         db = await self.database.get_connection()
@@ -392,10 +502,10 @@ class Bot(MinimalBot):
             self.DEFAULT_GUILD_SETTINGS.setdefault(i, o)
 
         # Get guild settings
-        data = await self._get_all_table_data(db, "guild_settings")
-        for row in data:
-            for key, value in row.items():
-                self.guild_settings[row['guild_id']][key] = value
+        if not self.lazy_settings:
+            async for row in self._stream_all_table_data(db, "guild_settings"):
+                for key, value in row.items():
+                    self.guild_settings[row['guild_id']][key] = value
 
         # Get default user settings
         default_user_settings = await db.call(
@@ -412,16 +522,22 @@ class Bot(MinimalBot):
             self.DEFAULT_USER_SETTINGS.setdefault(i, o)
 
         # Get user settings
-        data = await self._get_all_table_data(db, "user_settings")
-        for row in data:
-            for key, value in row.items():
-                self.user_settings[row['user_id']][key] = value
+        if not self.lazy_settings:
+            async for row in self._stream_all_table_data(db, "user_settings"):
+                for key, value in row.items():
+                    self.user_settings[row['user_id']][key] = value
 
         # Run the user-added startup methods
+        # The data that they add to lazily loaded settings can't be loaded again,
+        # so the rows that they use are pinned in the cache
         async def fake_cache_setup_method(db):
             pass
-        for _, cog in self.cogs.items():
-            await getattr(cog, "cache_setup", fake_cache_setup_method)(db)
+        with contextlib.ExitStack() as stack:
+            if self.lazy_settings:
+                stack.enter_context(self.guild_settings.pin_rows())
+                stack.enter_context(self.user_settings.pin_rows())
+            for _, cog in self.cogs.items():
+                await getattr(cog, "cache_setup", fake_cache_setup_method)(db)
 
         # Close database connection
         await db.disconnect()
@@ -452,6 +568,19 @@ class Bot(MinimalBot):
         )
         return v
 
+    async def _stream_all_table_data(self, db: DatabaseWrapper, table_name: str) -> AsyncIterator[Any]:
+        """
+        Select all from a table given its name, yielding the rows as they're
+        fetched, and exit if we get an error.
+        """
+
+        try:
+            async for row in db.stream("SELECT * FROM {0}".format(table_name)):
+                yield row
+        except Exception as e:
+            self.logger.critical(f"Error selecting from table - {e}")
+            exit(1)
+
     async def _get_list_table_data(
             self,
             db: DatabaseWrapper,
@@ -716,7 +845,7 @@ class Bot(MinimalBot):
                 return True
             return False
         try:
-            await self.wait_for("reaction_add", check=check, timeout=timeout)
+            await self.wait_for("reaction_add", check=check, timeout=timeout, message_id=message.id)
         except asyncio.TimeoutError:
             try:
                 return await message.remove_reaction("\N{WASTEBASKET}", self.user)
@@ -1010,6 +1139,12 @@ class Bot(MinimalBot):
                 self.logger.critical(f"Cloudflare rate limit reached - {json.dumps(headers)}")
             raise
 
+        # Share our settings changes with the other clusters if we're told to
+        redis_config = self.config.get('redis', {})
+        if self.redis.enabled and redis_config.get('shared_settings', False) and not self.settings_bus.enabled:
+            self.logger.info("Starting settings bus")
+            self.settings_bus.start()
+
     async def start(
             self,
             token: Optional[str] = None,
@@ -1038,10 +1173,13 @@ class Bot(MinimalBot):
     async def close(self, *args, **kwargs):
         """:meta private:"""
 
+        self.settings_bus.stop()
         self.logger.debug("Closing aiohttp ClientSession")
         await asyncio.wait_for(self.session.close(), timeout=None)
         self.logger.debug("Running original D.py logout method")
         await super().close(*args, **kwargs)
+        self.logger.debug("Flushing statsd client")
+        await self.stats.close_client()
 
     async def on_ready(self):
         self.logger.info(f"Bot connected - {self.user} // {self.user.id}")
@@ -85,6 +85,10 @@ class Cog(_commands.Cog, typing.Generic[BotT]):
         :attr:`voxelbotutils.Bot.guild_settings` or :attr:`voxelbotutils.Bot.user_settings`
         tables. This setup should *clear* your caches before setting them, as the :func:`voxelbotutils.Bot.startup`
         method may be called multiple times.
+
+        With ``lazy_settings`` enabled, any settings rows used here are pinned in the cache
+        so that the data added to them isn't lost. To add data to rows as they're loaded instead,
+        use ``bot.guild_settings.add_loader`` (or ``bot.user_settings.add_loader``).
         """
 
         pass
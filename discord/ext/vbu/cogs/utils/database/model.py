@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Literal, Optional, Type, ClassVar, List, Any, Iterable, TypeVar, overload
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Literal, Optional, Type, ClassVar, List, Any, Iterable, TypeVar, overload
 
 if TYPE_CHECKING:
     from .types import (
@@ -9,6 +10,8 @@ if TYPE_CHECKING:
         DriverPool, DriverConnection,
     )
 
+from .stats import QueryStats
+
 
 RT = TypeVar("RT")
 
@@ -67,6 +70,13 @@ class DatabaseTransaction(object):
 
         return await self.parent.call(*args, **kwargs)
 
+    def stream(self, *args, **kwargs):
+        """
+        Run some SQL, yielding its rows as they're fetched. See :func:`DatabaseWrapper.stream`.
+        """
+
+        return self.parent.stream(*args, **kwargs)
+
     async def execute_many(self, *args, **kwargs):
         """
         Run some SQL, returning it's data. See :func:`DatabaseWrapper.execute_many`.
@@ -94,6 +104,15 @@ class DatabaseTransaction(object):
 class DatabaseWrapper(object):
     """
     A wrapper around your preferred database driver.
+
+    Attributes
+    -----------
+    query_stats: :class:`QueryStats`
+        The timings of every query run through the wrapper, grouped by their SQL.
+        Queries that take longer than ``slow_query_threshold`` seconds (from your
+        database config) are logged.
+
+        .. versionadded:: 0.2.5
     """
 
     __slots__ = ("conn", "is_active", "cursor",)
@@ -103,6 +122,7 @@ class DatabaseWrapper(object):
     logger: logging.Logger = logging.getLogger("vbu.database")
     enabled: ClassVar[bool] = False
     driver: ClassVar[Type[DriverWrapper]] = None  # type: ignore
+    query_stats: ClassVar[QueryStats] = QueryStats()
 
     def __init__(
             self,
@@ -140,6 +160,7 @@ class DatabaseWrapper(object):
             if i in config_args
         }  # type: ignore
         cls.config = stripped_config
+        cls.query_stats.slow_query_threshold = config.get("slow_query_threshold", 1.0)
 
         # See if we want to even enable the database
         if not config.get("enabled", True):
@@ -185,7 +206,10 @@ class DatabaseWrapper(object):
         """
 
         assert cls.driver, "No driver has been established"
-        return await cls.driver.get_connection(cls)
+        start = time.perf_counter()
+        connection = await cls.driver.get_connection(cls)
+        await cls.query_stats.record_pool_wait(time.perf_counter() - start)
+        return connection
 
     async def disconnect(self) -> None:
         """
@@ -304,8 +328,96 @@ class DatabaseWrapper(object):
         """
 
         assert self.conn, "No connection has been established"
-        self.logger.debug(f"Running SQL: {sql} {args!s}")
-        return await self.driver.fetch(self, sql, *args)
+        self.logger.debug("Running SQL: %s %s", sql, args)
+        start = time.perf_counter()
+        try:
+            rows = await self.driver.fetch(self, sql, *args)
+        except Exception:
+            await self.query_stats.record_query(sql, time.perf_counter() - start, error=True)
+            raise
+        await self.query_stats.record_query(sql, time.perf_counter() - start, rows=len(rows))
+        return rows
+
+    async def stream(
+            self,
+            sql: str,
+            *args,
+            batch: int = 1_000,
+            type: Type[RT] = dict) -> AsyncIterator[RT]:
+        """
+        Run a line of SQL against your database driver, yielding the returned rows
+        as they're fetched rather than loading them all into memory at once.
+
+        The connection shouldn't be used for anything else until you're done
+        iterating. For PostgreSQL, the rows are read inside of a transaction,
+        which is started for you if you aren't already in one.
+
+        If you might stop iterating early (by breaking out of the loop or by
+        raising), close the iterator yourself so that the cursor is closed before
+        the connection is released - either with :func:`contextlib.aclosing` on
+        Python 3.10+, or by calling ``aclose()`` in a ``finally`` block.
+
+        .. versionadded:: 0.2.5
+
+        Parameters
+        ----------
+        sql: :class:`str`
+            The SQL that you want to run. See :func:`call` for the parameter formats.
+        *args: Any
+            The arguments that are passed to your database call.
+        batch: :class:`int`
+            How many rows should be fetched from the database at a time.
+        type
+            The return type of the database call dictionary. This is just used
+            for your type checking.
+
+        Examples
+        ---------
+        >>> async for row in db.stream("SELECT * FROM example", batch=500):
+        >>>     print(row['a'])
+
+        >>> async with contextlib.aclosing(db.stream("SELECT * FROM example")) as rows:
+        >>>     async for row in rows:
+        >>>         if row['a'] == 1:
+        >>>             break
+
+        Yields
+        -------
+        :class:`dict`
+            The rows returned from the database.
+        """
+
+        assert self.conn, "No connection has been established"
+        self.logger.debug("Streaming SQL: %s %s", sql, args)
+
+        # Only the time spent waiting on the database is counted, not the time
+        # spent by the caller handling each row
+        rows = self.driver.stream(self, sql, *args, batch=batch).__aiter__()
+        elapsed, count, error = 0.0, 0, False
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    row = await rows.__anext__()
+                except StopAsyncIteration:
+                    break
+                except Exception:
+                    error = True
+                    raise
+                finally:
+                    elapsed += time.perf_counter() - start
+                count += 1
+                yield row
+        finally:
+
+            # Close the driver's cursor now rather than whenever it's garbage
+            # collected, which could be after the connection has been released
+            start = time.perf_counter()
+            try:
+                await rows.aclose()
+            finally:
+                elapsed += time.perf_counter() - start
+                await self.query_stats.record_query(sql, elapsed, rows=count, error=error)
 
     async def executemany(self, sql: str, *args_list: Iterable[Any]) -> None:
         """
@@ -330,8 +442,14 @@ class DatabaseWrapper(object):
         """
 
         assert self.conn, "No connection has been established"
-        self.logger.debug(f"Running SQL: {sql} {args_list!s}")
-        return await self.driver.executemany(self, sql, *args_list)
+        self.logger.debug("Running SQL: %s %s", sql, args_list)
+        start = time.perf_counter()
+        try:
+            await self.driver.executemany(self, sql, *args_list)
+        except Exception:
+            await self.query_stats.record_query(sql, time.perf_counter() - start, error=True)
+            raise
+        await self.query_stats.record_query(sql, time.perf_counter() - start)
 
     async def execute_many(self, sql: str, *args) -> None:
         """:meta private:"""
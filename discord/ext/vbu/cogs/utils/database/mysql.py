@@ -76,6 +76,20 @@ class MysqlWrapper(DriverWrapper):
         assert dbw.conn
         await dbw.caller.executemany(sql, args_list)
 
+    @staticmethod
+    async def stream(dbw: MysqlDatabaseWrapper, sql: str, *args, batch: int) -> typing.AsyncIterator[typing.Any]:
+        assert dbw.conn
+
+        # An unbuffered cursor, so rows are only read from the server as we fetch them
+        cursor = await dbw.conn.cursor(aiomysql.SSDictCursor)
+        try:
+            await cursor.execute(sql, args)
+            while (rows := await cursor.fetchmany(batch)):
+                for row in rows:
+                    yield row
+        finally:
+            await cursor.close()
+
     def prepare(self) -> typing.Generator[str, None, None]:
         while True:
             yield "%s"
@@ -80,6 +80,19 @@ class PostgresWrapper(DriverWrapper):
         assert dbw.conn
         await dbw.caller.executemany(sql, args_list)
 
+    @staticmethod
+    async def stream(dbw: PostgresDatabaseWrapper, sql: str, *args, batch: int) -> typing.AsyncIterator[typing.Any]:
+        assert dbw.conn
+
+        # Cursors can only be used inside of a transaction
+        if dbw.conn.is_in_transaction():
+            async for row in dbw.conn.cursor(sql, *args, prefetch=batch):
+                yield row
+            return
+        async with dbw.conn.transaction():
+            async for row in dbw.conn.cursor(sql, *args, prefetch=batch):
+                yield row
+
     def prepare(self) -> typing.Generator[str, None, None]:
         start = 1
         while True:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import typing
 
 import aiosqlite
@@ -12,7 +13,7 @@ if typing.TYPE_CHECKING:
 
     class SQLiteDatabaseWrapper(DatabaseWrapper):
         config: UserDatabaseConfig
-        pool: None
+        pool: SQLitePool
         conn: typing.Optional[aiosqlite.Connection]
         cursor: typing.Optional[aiosqlite.Cursor]
         caller: aiosqlite.Connection
@@ -35,16 +36,71 @@ class RowWrapper(aiosqlite.Row):
             yield (i, self[i])
 
 
+class SQLitePool(object):
+    """
+    A fixed size pool of long-lived SQLite connections.
+
+    The connections are opened in autocommit mode, so statements outside of a
+    transaction are committed by SQLite as they're run, and transactions are
+    started explicitly with ``BEGIN``.
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA busy_timeout = 5000",
+        "PRAGMA temp_store = MEMORY",
+    )
+
+    def __init__(self, database: str, *, size: int = 5, cached_statements: int = 256):
+        self.database = database
+        self.cached_statements = cached_statements
+
+        # In-memory databases aren't shared between connections
+        if database == ":memory:" or not database:
+            size = 1
+        self.size = size
+        self._connections: typing.List[aiosqlite.Connection] = []
+        self._idle: asyncio.LifoQueue[aiosqlite.Connection] = asyncio.LifoQueue()
+
+    async def open(self) -> SQLitePool:
+        for _ in range(self.size):
+            connection = await aiosqlite.connect(
+                self.database,
+                isolation_level=None,
+                cached_statements=self.cached_statements,
+            )
+            connection.row_factory = RowWrapper
+            for pragma in self.PRAGMAS:
+                await connection.execute(pragma)
+            self._connections.append(connection)
+            self._idle.put_nowait(connection)
+        return self
+
+    async def acquire(self) -> aiosqlite.Connection:
+        return await self._idle.get()
+
+    async def release(self, connection: aiosqlite.Connection) -> None:
+        # Don't let an unfinished transaction leak to the next user
+        if connection.in_transaction:
+            await connection.rollback()
+        self._idle.put_nowait(connection)
+
+    async def close(self) -> None:
+        for connection in self._connections:
+            await connection.close()
+        self._connections.clear()
+
+
 class SQLiteWrapper(DriverWrapper):
 
     @staticmethod
-    async def create_pool(config: DatabaseConfig) -> None:
-        return None
+    async def create_pool(config: DatabaseConfig) -> SQLitePool:
+        return await SQLitePool(config.get("database")).open()
 
     @staticmethod
     async def get_connection(dbw: typing.Type[SQLiteDatabaseWrapper]) -> SQLiteDatabaseWrapper:
-        connection = await aiosqlite.connect(dbw.config.get("database"))
-        connection.row_factory = RowWrapper
+        connection = await dbw.pool.acquire()
         v = dbw(
             conn=connection,
         )
@@ -54,33 +110,54 @@ class SQLiteWrapper(DriverWrapper):
     @staticmethod
     async def release_connection(dbw: SQLiteDatabaseWrapper) -> None:
         assert dbw.conn
-        await dbw.conn.close()
-        if dbw.cursor:
-            try:
-                await dbw.cursor.close()
-            except ValueError:
-                pass
-            dbw.cursor = None
+        await dbw.pool.release(dbw.conn)
         dbw.conn = None
         dbw.is_active = False
 
+    @classmethod
+    async def start_transaction(cls, tra: SQLiteDatabaseTransaction):
+        assert tra.parent.conn
+        await tra.parent.conn.execute("BEGIN IMMEDIATE")
+
+    @staticmethod
+    async def commit_transaction(tra: SQLiteDatabaseTransaction) -> None:
+        assert tra.parent.conn
+        await tra.parent.conn.commit()
+
+    @staticmethod
+    async def rollback_transaction(tra: SQLiteDatabaseTransaction) -> None:
+        assert tra.parent.conn
+        await tra.parent.conn.rollback()
+
     @staticmethod
     async def fetch(dbw: SQLiteDatabaseWrapper, sql: str, *args) -> typing.List[typing.Any]:
-        if dbw.cursor:
-            try:
-                await dbw.cursor.close()
-            except ValueError:
-                pass
-            dbw.cursor = None
-        cursor: aiosqlite.Cursor = await dbw.caller.execute(sql, args)
-        await dbw.conn.commit()
-        dbw.cursor = cursor
-        return await cursor.fetchall() or list()
+        assert dbw.conn
+        async with dbw.conn.execute(sql, args) as cursor:
+            return await cursor.fetchall() or list()
+
+    @staticmethod
+    async def stream(dbw: SQLiteDatabaseWrapper, sql: str, *args, batch: int) -> typing.AsyncIterator[typing.Any]:
+        assert dbw.conn
+        async with dbw.conn.execute(sql, args) as cursor:
+            while (rows := await cursor.fetchmany(batch)):
+                for row in rows:
+                    yield row
 
     @staticmethod
     async def executemany(dbw: SQLiteDatabaseWrapper, sql: str, *args_list) -> None:
         assert dbw.conn
-        await dbw.caller.executemany(sql, args_list)
+        if dbw.conn.in_transaction:
+            await dbw.conn.executemany(sql, args_list)
+            return
+
+        # Run all of the statements in one transaction rather than committing each
+        await dbw.conn.execute("BEGIN IMMEDIATE")
+        try:
+            await dbw.conn.executemany(sql, args_list)
+        except BaseException:
+            await dbw.conn.rollback()
+            raise
+        await dbw.conn.commit()
 
     def prepare(self) -> typing.Generator[str, None, None]:
         while True:
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import bisect
+import functools
+import hashlib
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+from ..statsd import StatsdConnection
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"\$\d+|%s|\?|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_LIST = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1_024)
+def fingerprint(sql: str) -> str:
+    """
+    Normalise a line of SQL so that queries that only differ by their parameters,
+    literals, the length of their ``IN`` lists or their whitespace are grouped together.
+
+    Args:
+        sql (str): The SQL to normalise.
+
+    Returns:
+        str: The normalised SQL.
+    """
+
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    sql = _REPEATED_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip().rstrip(";")
+
+
+class QueryTiming(object):
+    """
+    The timings for one fingerprint of SQL, stored as a histogram.
+
+    Attributes:
+        count (int): The number of times that the query was run.
+        errors (int): The number of times that the query raised an error.
+        total (float): The total time spent running the query, in seconds.
+        max (float): The longest time that the query took, in seconds.
+        rows (int): The total number of rows that the query returned.
+        buckets (typing.List[int]): The number of runs that took at most each of
+            :attr:`QueryStats.buckets` seconds, with one more for anything longer.
+    """
+
+    __slots__ = ('count', 'errors', 'total', 'max', 'rows', 'buckets',)
+
+    def __init__(self, bucket_count: int):
+        self.count: int = 0
+        self.errors: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        self.rows: int = 0
+        self.buckets: List[int] = [0] * (bucket_count + 1)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Get the upper bound of the histogram bucket that the given percentile falls into.
+
+        Args:
+            percentile (float): The percentile to get, between ``0`` and ``1``.
+
+        Returns:
+            float: The upper bound, in seconds. The longest run is given if the
+                percentile falls past the last bucket.
+        """
+
+        target = percentile * self.count
+        seen = 0
+        for bound, count in zip(QueryStats.buckets, self.buckets):
+            seen += count
+            if seen >= target and seen:
+                return min(bound, self.max)
+        return self.max
+
+
+class QueryStats(object):
+    """
+    Collects the timings of the queries run through :class:`voxelbotutils.DatabaseWrapper`,
+    grouped by the :func:`fingerprint` of their SQL, along with the time spent waiting for a
+    connection from the pool. Each query is also sent to the bot's stats client as a timing
+    tagged with a short hash of its fingerprint, and queries that take longer than
+    :attr:`slow_query_threshold` are logged (without their arguments) to ``vbu.database.slow``.
+
+    .. versionadded:: 0.2.5
+
+    Attributes:
+        queries (typing.Dict[str, QueryTiming]): The timings for each fingerprint.
+        pool_wait (QueryTiming): The time spent waiting to acquire a connection.
+        slow_query_threshold (float): How long a query can take before it's logged, in
+            seconds. ``0`` disables the slow query log.
+        max_fingerprints (int): How many fingerprints are stored before new ones are
+            grouped under ``"<other>"``.
+    """
+
+    buckets: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,)
+    logger: logging.Logger = logging.getLogger("vbu.database.stats")
+    slow_logger: logging.Logger = logging.getLogger("vbu.database.slow")
+
+    def __init__(self, *, slow_query_threshold: float = 1.0, max_fingerprints: int = 500):
+        self.slow_query_threshold = slow_query_threshold
+        self.max_fingerprints = max_fingerprints
+        self.queries: Dict[str, QueryTiming] = {}
+        self.pool_wait = QueryTiming(len(self.buckets))
+
+    def reset(self) -> None:
+        """
+        Clear all of the stored timings.
+        """
+
+        self.queries.clear()
+        self.pool_wait = QueryTiming(len(self.buckets))
+
+    def _add(self, timing: QueryTiming, elapsed: float) -> None:
+        timing.count += 1
+        timing.total += elapsed
+        if elapsed > timing.max:
+            timing.max = elapsed
+        timing.buckets[bisect.bisect_left(self.buckets, elapsed)] += 1
+
+    async def record_pool_wait(self, elapsed: float) -> None:
+        """
+        Store the time spent waiting for a connection from the pool.
+
+        Args:
+            elapsed (float): The time waited, in seconds.
+        """
+
+        self._add(self.pool_wait, elapsed)
+        if StatsdConnection.config is None:
+            return
+        try:
+            async with StatsdConnection() as stats:
+                stats.timing("discord.bot.database.pool_wait", value=elapsed * 1_000)
+        except Exception:
+            self.logger.debug("Failed to send pool wait to statsd", exc_info=True)
+
+    async def record_query(
+            self,
+            sql: str,
+            elapsed: float,
+            *,
+            rows: Optional[int] = None,
+            error: bool = False) -> None:
+        """
+        Store the time taken to run a query.
+
+        Args:
+            sql (str): The SQL that was run.
+            elapsed (float): The time that the query took, in seconds.
+            rows (typing.Optional[int]): The number of rows that were returned, if any.
+            error (bool): Whether or not the query raised an error.
+        """
+
+        # Store our timing
+        key = fingerprint(sql)
+        timing = self.queries.get(key)
+        if timing is None:
+            if len(self.queries) >= self.max_fingerprints:
+                key = "<other>"
+                timing = self.queries.get(key)
+            if timing is None:
+                timing = self.queries[key] = QueryTiming(len(self.buckets))
+        self._add(timing, elapsed)
+        timing.rows += rows or 0
+        if error:
+            timing.errors += 1
+
+        # Log slow queries
+        slow = bool(self.slow_query_threshold) and elapsed >= self.slow_query_threshold
+        if slow:
+            self.slow_logger.warning("Slow query took %.3fs (%s rows): %s", elapsed, rows, sql)
+
+        # And send them to the stats client
+        if StatsdConnection.config is None:
+            return
+        tags = {
+            "query": hashlib.sha1(key.encode()).hexdigest()[:8],
+            "operation": key.split(" ", 1)[0].lower(),
+        }
+        # Stats are best-effort, so they can't make the query itself fail
+        try:
+            async with StatsdConnection() as stats:
+                stats.timing("discord.bot.database.query", value=elapsed * 1_000, tags=tags)
+                if rows is not None:
+                    stats.histogram("discord.bot.database.rows", value=rows, tags=tags)
+                if error:
+                    stats.increment("discord.bot.database.errors", tags=tags)
+                if slow:
+                    stats.increment("discord.bot.database.slow_queries", tags=tags)
+        except Exception:
+            self.logger.debug("Failed to send query timing to statsd", exc_info=True)
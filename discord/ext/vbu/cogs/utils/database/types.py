@@ -94,3 +94,8 @@ class DriverWrapper(typing.Protocol):
     async def executemany(dbw: DatabaseWrapper, sql: str, *args_list: typing.Iterable[typing.Any]) -> None:
         """Run some SQL in your database."""
         raise NotImplementedError()
+
+    @staticmethod
+    def stream(dbw: DatabaseWrapper, sql: str, *args: typing.Any, batch: int) -> typing.AsyncIterator[typing.Any]:
+        """Run some SQL in your database, yielding the rows as they're fetched in batches."""
+        raise NotImplementedError()
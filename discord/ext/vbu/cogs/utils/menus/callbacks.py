@@ -51,6 +51,13 @@ class MenuCallbacks(object):
             )
         )
 
+    @staticmethod
+    def _publish_change(ctx, data_location: DataLocation, method: str, *args) -> None:
+        if data_location == DataLocation.GUILD:
+            getattr(ctx.bot.settings_bus, method)("guild", ctx.guild.id, *args)
+        elif data_location == DataLocation.USER:
+            getattr(ctx.bot.settings_bus, method)("user", ctx.author.id, *args)
+
     @classmethod
     def set_table_column(
             cls,
@@ -131,6 +138,7 @@ class MenuCallbacks(object):
             for i in settings_path[:-1]:
                 d = d.setdefault(i, dict())
             d[settings_path[-1]] = value
+            cls._publish_change(ctx, data_location, "set", settings_path, value)
 
         return wrapper
 
@@ -168,6 +176,7 @@ class MenuCallbacks(object):
             for i in settings_path:
                 d = d.setdefault(i, dict())
             d[key] = value
+            cls._publish_change(ctx, data_location, "set", (*settings_path, key), value)
 
         return wrapper
 
@@ -209,6 +218,7 @@ class MenuCallbacks(object):
                 return
             else:
                 settings_list.append(value)
+            cls._publish_change(ctx, data_location, "append", settings_path, value)
 
         return wrapper
 
@@ -246,6 +256,7 @@ class MenuCallbacks(object):
                 for i in settings_path:
                     d = d.setdefault(i, dict())
                 d.pop(key, None)
+                cls._publish_change(ctx, data_location, "delete", (*settings_path, key))
             return wrapper
         return inner
 
@@ -287,5 +298,6 @@ class MenuCallbacks(object):
                     return
                 else:
                     settings_list.remove(value)
+                cls._publish_change(ctx, data_location, "remove", settings_path, value)
             return wrapper
         return inner
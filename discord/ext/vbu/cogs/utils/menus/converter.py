@@ -187,6 +187,7 @@ class Converter(object):
                 content=self.prompt,
                 components=self.components,
             )
+        prompt_message = sent_message or ctx.interaction.message
 
         # Set up checks
         def button_check(payload: discord.Interaction):
@@ -206,6 +207,7 @@ class Converter(object):
                 "component_interaction",
                 check=button_check,
                 timeout=60.0,
+                message_id=prompt_message.id if prompt_message else None,
             )
             ctx.interaction = payload
             await payload.response.defer_update()
@@ -258,6 +260,7 @@ class Converter(object):
                         i.user.id == ctx.interaction.user.id and
                         i.custom_id in [button.custom_id, cancel.custom_id]
                     ),
+                    user_id=ctx.interaction.user.id,
                 ),
             ]
 
@@ -352,6 +355,7 @@ class Converter(object):
             "modal_submit",
             check=lambda i: i.user.id == ctx.interaction.user.id and i.custom_id == modal.custom_id,
             timeout=60.0 * 30,
+            custom_id_prefix=modal.custom_id,
         )
         ctx.interaction = modal_submission
         await ctx.interaction.response.defer_update()  # Defer so we can run our checks
@@ -248,12 +248,17 @@ class Menu(MenuDisplayable):
         component_custom_ids: List[str] = []
 
         # Send the initial message
+        sent_message: Optional[discord.Message] = None
         if not isinstance(ctx, commands.SlashContext):
-            await ctx.send(**sendable_data)  # No interaction? Somehow?
+            sent_message = await ctx.send(**sendable_data)  # No interaction? Somehow?
         elif ctx.interaction.response.is_done:
-            await ctx.interaction.edit_original_message(**sendable_data)
+            sent_message = await ctx.interaction.edit_original_message(**sendable_data)
         else:
             await ctx.interaction.response.edit_message(**sendable_data)
+            sent_message = ctx.interaction.message
+
+        # Only clicks on the message the menu is currently drawn on are waited for
+        message_id: Optional[int] = sent_message.id if sent_message else None
 
         # Set up a function so as to get
         def get_button_check(valid_ids: List[str]):
@@ -284,6 +289,7 @@ class Menu(MenuDisplayable):
                     "component_interaction",
                     check=get_button_check(component_custom_ids),
                     timeout=60.0,
+                    message_id=message_id,
                 )
                 await payload.response.defer_update()
                 ctx.interaction = payload
@@ -318,6 +324,11 @@ class Menu(MenuDisplayable):
             else:
                 await ctx.interaction.response.edit_message(**sendable_data)
 
+            # The option may have left us with an interaction from a followup
+            # message, in which case that's where the menu has been redrawn
+            if ctx.interaction.message is not None:
+                message_id = ctx.interaction.message.id
+
         # Disable the buttons before we leave
         try:
             if delete_message:
@@ -155,7 +155,12 @@ class Paginator:
             interaction = None
             try:
                 check = lambda p: p.user.id == ctx.author.id and p.message.id == self._message.id
-                interaction = await ctx.bot.wait_for("component_interaction", check=check, timeout=timeout)
+                interaction = await ctx.bot.wait_for(
+                    "component_interaction",
+                    check=check,
+                    timeout=timeout,
+                    message_id=self._message.id,
+                )
                 await interaction.response.defer_update()
             except asyncio.TimeoutError:
                 break
@@ -3,9 +3,15 @@ from __future__ import annotations
 import logging
 import typing
 import asyncio
+import hashlib
 import json
+import time
 
 import aioredis
+import aiohttp
+from discord.http import MemoryRateLimitBackend, RateLimit, Route
+from discord.ext.commands import Cooldown, CooldownBackend
+from discord.session_store import GatewaySession, SessionStore
 
 
 class RedisConnection(object):
@@ -52,6 +58,10 @@ class RedisConnection(object):
         cls.config = config.copy()
         modified_config = config.copy()
         modified_config.pop('shard_manager_enabled', False)  # No longer present, here from old configs
+        modified_config.pop('shared_ratelimits', False)
+        modified_config.pop('shared_cooldowns', False)
+        modified_config.pop('shared_settings', False)
+        modified_config.pop('persist_sessions', False)
         if modified_config.pop('enabled', True) is False:
             raise NotImplementedError("The Redis connection has been disabled.")
         address = modified_config.pop('host'), modified_config.pop('port')
@@ -237,3 +247,450 @@ def redis_channel_handler(channel_name):
     def wrapper(func):
         return RedisChannelHandler(channel_name, func)
     return wrapper
+
+
+# Takes a request from both the shared global limit and the shared bucket, or
+# neither of them. Returns 0 if the request can be made, -1 if the global
+# limit for the current second has been used up, or the number of milliseconds
+# to wait before trying again.
+_ACQUIRE_SCRIPT = """
+local global_over = redis.call('PTTL', KEYS[1])
+if global_over > 0 then
+    return global_over
+end
+local used = tonumber(redis.call('GET', KEYS[2]) or '0')
+if used >= tonumber(ARGV[1]) then
+    return -1
+end
+
+local remaining = tonumber(redis.call('GET', KEYS[3]))
+if remaining ~= nil and redis.call('PTTL', KEYS[3]) < 0 then
+    -- A bucket without an expiry can never refill, so treat it as run out
+    redis.call('DEL', KEYS[3])
+    remaining = nil
+end
+if remaining == nil then
+    -- The last window has run out, so open a new one if we know how big it is
+    local limit = tonumber(redis.call('GET', KEYS[4]))
+    if limit ~= nil then
+        local window = tonumber(redis.call('GET', KEYS[5]) or '1000')
+        redis.call('SET', KEYS[3], limit - 1, 'PX', window)
+    end
+elseif remaining > 0 then
+    redis.call('DECR', KEYS[3])
+else
+    return math.max(redis.call('PTTL', KEYS[3]), 1)
+end
+
+if redis.call('INCR', KEYS[2]) == 1 then
+    redis.call('PEXPIRE', KEYS[2], 2000)
+end
+return 0
+"""
+_ACQUIRE_SCRIPT_SHA = hashlib.sha1(_ACQUIRE_SCRIPT.encode()).hexdigest()
+
+
+class RedisRateLimitBackend(MemoryRateLimitBackend):
+    """
+    A rate limit backend for :class:`discord.http.HTTPClient` that shares the
+    global and per-bucket rate limits between every process connected to the
+    same Redis database, so that clusters running on one token don't exceed
+    Discord's limits between them.
+
+    Requests are still queued locally by the in-memory backend, and then take
+    from the shared budget in Redis before being sent. If Redis can't be
+    reached then the rate limits are only handled locally.
+
+    Taking from the shared budget is done atomically in a single Lua script,
+    so a process dying partway through can't leave a bucket stuck. This means
+    that the connection has to be to a real Redis server (or anything else that
+    runs Lua scripts through ``EVAL``/``EVALSHA``). Bucket names are hashed
+    before being used in keys, since they can include webhook tokens.
+
+    Args:
+        redis (aioredis.Redis): The connection to use. Defaults to
+            :attr:`RedisConnection.pool`, looked up whenever it's needed.
+        prefix (str): The prefix to use for all of the keys stored in Redis.
+        global_limit (int): The number of requests that can be made per second
+            across all processes.
+        loop (asyncio.AbstractEventLoop): The event loop to use.
+    """
+
+    logger: logging.Logger = logging.getLogger("vbu.redis.ratelimit")
+
+    def __init__(
+            self,
+            redis: typing.Optional[aioredis.Redis] = None,
+            *,
+            prefix: str = "novus:ratelimit",
+            global_limit: int = 50,
+            loop: typing.Optional[asyncio.AbstractEventLoop] = None):
+        super().__init__(loop=loop)
+        self._redis = redis
+        self.prefix = prefix
+        self.global_limit = global_limit
+        self._bucket_hash_misses: typing.Dict[str, float] = {}
+
+    @property
+    def redis(self) -> typing.Optional[aioredis.Redis]:
+        if self._redis is not None:
+            return self._redis
+        return RedisConnection.pool
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+
+    def _bucket_key(self, kind: str, bucket: str) -> str:
+        # Buckets include webhook and interaction tokens, which shouldn't end up
+        # in plaintext in the key names
+        return self._key(kind, hashlib.sha1(bucket.encode()).hexdigest())
+
+    async def get_bucket_hash(self, route: Route) -> typing.Optional[str]:
+        bucket_hash = await super().get_bucket_hash(route)
+        if bucket_hash is not None or self.redis is None:
+            return bucket_hash
+
+        # Don't go back to Redis for routes that we've checked recently
+        now = self.loop.time()
+        if self._bucket_hash_misses.get(route.key, 0) > now:
+            return None
+        try:
+            value = await self.redis.hget(self._key("hashes"), route.key)
+        except (aioredis.RedisError, OSError):
+            self.logger.warning("Failed to get bucket hash from Redis", exc_info=True)
+            return None
+        if value is None:
+            self._bucket_hash_misses[route.key] = now + 60
+            return None
+        if isinstance(value, bytes):
+            value = value.decode()
+        self._bucket_hashes[route.key] = value
+        return value
+
+    async def set_bucket_hash(self, route: Route, bucket_hash: str) -> None:
+        if self._bucket_hashes.get(route.key) == bucket_hash:
+            return
+        await super().set_bucket_hash(route, bucket_hash)
+        self._bucket_hash_misses.pop(route.key, None)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.hset(self._key("hashes"), route.key, bucket_hash)
+        except (aioredis.RedisError, OSError):
+            self.logger.warning("Failed to set bucket hash in Redis", exc_info=True)
+
+    async def acquire(self, route: Route) -> typing.Tuple[str, RateLimit]:
+        bucket, ratelimit = await super().acquire(route)
+        try:
+            await self._acquire_shared(bucket)
+        except (aioredis.RedisError, OSError):
+            self.logger.warning("Failed to acquire shared rate limit from Redis", exc_info=True)
+        except BaseException:
+            ratelimit.release()
+            raise
+        return bucket, ratelimit
+
+    async def _acquire_shared(self, bucket: str) -> None:
+        """
+        Wait until there's space in both the shared global limit and the
+        shared bucket, and take from each of them.
+        """
+
+        redis = self.redis
+        if redis is None:
+            return
+        while True:
+            now = time.time()
+            keys = [
+                self._key("global_over"),
+                self._key("global", str(int(now))),
+                self._bucket_key("bucket", bucket),
+                self._bucket_key("limit", bucket),
+                self._bucket_key("window", bucket),
+            ]
+            args = [self.global_limit]
+            try:
+                delay = await redis.evalsha(_ACQUIRE_SCRIPT_SHA, keys=keys, args=args)
+            except aioredis.ReplyError as e:
+                if not str(e).startswith("NOSCRIPT"):
+                    raise
+                delay = await redis.eval(_ACQUIRE_SCRIPT, keys=keys, args=args)
+            if delay == 0:
+                return
+            if delay < 0:
+                # The global limit for this second has been used up
+                await asyncio.sleep(1 - (now % 1))
+            else:
+                await asyncio.sleep(delay / 1_000)
+
+    async def update(
+            self,
+            route: Route,
+            bucket: str,
+            ratelimit: RateLimit,
+            response: aiohttp.ClientResponse,
+            *,
+            use_clock: bool = False) -> typing.Tuple[str, bool]:
+        bucket, updated = await super().update(route, bucket, ratelimit, response, use_clock=use_clock)
+        if updated and self.redis is not None:
+            reset_after = max(int((ratelimit.reset_at - self.loop.time()) * 1_000), 1)
+            try:
+                await self.redis.set(self._bucket_key("bucket", bucket), ratelimit.remaining, pexpire=reset_after)
+                await self.redis.set(self._bucket_key("limit", bucket), ratelimit.limit, expire=86_400)
+                if ratelimit.remaining >= ratelimit.limit - 1:
+                    # This was the first request in the window, so we know how long it is
+                    await self.redis.set(self._bucket_key("window", bucket), reset_after, expire=86_400)
+            except (aioredis.RedisError, OSError):
+                self.logger.warning("Failed to update shared rate limit in Redis", exc_info=True)
+        return bucket, updated
+
+    async def delay(self, bucket: str, ratelimit: RateLimit, retry_after: float) -> None:
+        await super().delay(bucket, ratelimit, retry_after)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(self._bucket_key("bucket", bucket), 0, pexpire=max(int(retry_after * 1_000), 1))
+        except (aioredis.RedisError, OSError):
+            self.logger.warning("Failed to update shared rate limit in Redis", exc_info=True)
+
+    async def wait_global(self) -> None:
+        await super().wait_global()
+        if self.redis is None:
+            return
+        try:
+            delay = await self.redis.pttl(self._key("global_over"))
+        except (aioredis.RedisError, OSError):
+            self.logger.warning("Failed to get global rate limit from Redis", exc_info=True)
+            return
+        if delay > 0:
+            await asyncio.sleep(delay / 1_000)
+
+    async def set_global(self, retry_after: float) -> None:
+        await super().set_global(retry_after)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(self._key("global_over"), 1, pexpire=max(int(retry_after * 1_000), 1))
+        except (aioredis.RedisError, OSError):
+            self.logger.warning("Failed to set global rate limit in Redis", exc_info=True)
+
+
+class RedisCooldownBackend(CooldownBackend):
+    """
+    A cooldown backend for :class:`discord.ext.commands.Bot` that keeps command
+    cooldowns in Redis, so that they apply across every process connected to the
+    same Redis database rather than per cluster.
+
+    Each bucket is a counter that's created with an expiry of the cooldown's period
+    on its first use and incremented on every use, all inside of one transaction.
+    Uses from the same process are batched together into a single transaction every
+    ``batch_delay`` seconds, and buckets that Redis has reported as being on cooldown
+    are rejected locally until their cooldown is over. If Redis can't be reached then
+    the cooldowns are only handled locally.
+
+    Only ``MULTI``/``EXEC`` (via ``multi_exec``), ``SET`` (with ``pexpire`` and ``exist``),
+    ``INCR``, ``PTTL`` and ``DELETE`` are used, so any object providing those in the style
+    of :class:`aioredis.Redis` can be given as the connection.
+
+    .. versionadded:: 0.2.5
+
+    Args:
+        redis (aioredis.Redis): The connection to use. Defaults to
+            :attr:`RedisConnection.pool`, looked up whenever it's needed.
+        prefix (str): The prefix to use for all of the keys stored in Redis.
+        batch_delay (float): How long to wait to collect cooldown updates before
+            sending them to Redis.
+        max_batch_size (int): The number of updates after which a batch is sent
+            without waiting.
+    """
+
+    logger: logging.Logger = logging.getLogger("vbu.redis.cooldowns")
+
+    def __init__(
+            self,
+            redis: typing.Optional[aioredis.Redis] = None,
+            *,
+            prefix: str = "novus:cooldown",
+            batch_delay: float = 0.005,
+            max_batch_size: int = 500):
+        self._redis = redis
+        self.prefix = prefix
+        self.batch_delay = batch_delay
+        self.max_batch_size = max_batch_size
+        self._blocked: typing.Dict[str, float] = {}
+        self._pending: typing.List[typing.Tuple[str, Cooldown, float, asyncio.Future]] = []
+        self._pending_resets: typing.Set[str] = set()
+        self._flush_handle: typing.Optional[asyncio.Handle] = None
+
+    @property
+    def redis(self) -> typing.Optional[aioredis.Redis]:
+        if self._redis is not None:
+            return self._redis
+        return RedisConnection.pool
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def update_rate_limit(self, key: str, bucket: Cooldown, current: float) -> typing.Optional[float]:
+
+        # See if we already know that the bucket is on cooldown
+        blocked_until = self._blocked.get(key)
+        if blocked_until is not None:
+            if current < blocked_until:
+                bucket._last = current
+                return blocked_until - current
+            del self._blocked[key]
+        if self.redis is None:
+            return bucket.update_rate_limit(current)
+
+        # Add to the batch
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending.append((key, bucket, current, future,))
+        self._schedule_flush(loop)
+        return await future
+
+    @staticmethod
+    def _sync_bucket(bucket: Cooldown, current: float, used: int, ttl: int) -> None:
+        # Copy what Redis knows about the bucket into the local cooldown, so that
+        # anything reading it directly (such as Command.is_on_cooldown) agrees
+        window_left = ttl / 1_000 if ttl > 0 else bucket.per
+        bucket._last = current
+        bucket._tokens = max(bucket.rate - used, 0)
+        bucket._window = current + window_left - bucket.per
+
+    def reset(self, key: str, bucket: Cooldown) -> None:
+        bucket.reset()
+        self._blocked.pop(key, None)
+        if self.redis is None:
+            return
+        self._pending_resets.add(key)
+        self._schedule_flush(asyncio.get_event_loop())
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        if len(self._pending) >= self.max_batch_size:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush_handle = None
+            loop.create_task(self.flush())
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_delay, lambda: loop.create_task(self.flush()))
+
+    async def flush(self) -> None:
+        """
+        Send all of the pending cooldown updates to Redis.
+        """
+
+        self._flush_handle = None
+        pending, self._pending = self._pending, []
+        resets, self._pending_resets = self._pending_resets, set()
+        if not pending and not resets:
+            return
+
+        # Queue everything up inside of one transaction
+        redis = self.redis
+        try:
+            if redis is None:
+                raise OSError("No Redis connection")
+            transaction = redis.multi_exec()
+            for key in resets:
+                transaction.delete(self._key(key))
+            for key, bucket, _, _ in pending:
+                redis_key = self._key(key)
+                transaction.set(
+                    redis_key, 0,
+                    pexpire=max(int(bucket.per * 1_000), 1),
+                    exist=aioredis.Redis.SET_IF_NOT_EXIST,
+                )
+                transaction.incr(redis_key)
+                transaction.pttl(redis_key)
+            results = await transaction.execute()
+        except (aioredis.RedisError, OSError):
+            self.logger.warning("Failed to update shared cooldowns in Redis", exc_info=True)
+            for key, bucket, current, future in pending:
+                if not future.done():
+                    future.set_result(bucket.update_rate_limit(current))
+            return
+        except BaseException as e:
+            for *_, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+
+        # And work out which of the buckets are on cooldown
+        results = results[len(resets):]
+        for index, (key, bucket, current, future) in enumerate(pending):
+            _, used, ttl = results[index * 3:index * 3 + 3]
+            self._sync_bucket(bucket, current, used, ttl)
+            retry_after = None
+            if used > bucket.rate:
+                retry_after = ttl / 1_000 if ttl > 0 else bucket.per
+                self._blocked[key] = current + retry_after
+            if not future.done():
+                future.set_result(retry_after)
+
+        # Clear out anything that's no longer on cooldown
+        if len(self._blocked) > 10_000:
+            now = time.time()
+            self._blocked = {k: v for k, v in self._blocked.items() if v > now}
+
+
+class RedisSessionStore(SessionStore):
+    """
+    A session store for :class:`discord.Client` that keeps each shard's gateway
+    session in Redis, so that a cluster can resume its shards after a restart
+    regardless of which machine it comes back up on. Each session is stored as
+    its own key, which expires after ``max_age`` seconds.
+
+    .. versionadded:: 0.2.5
+
+    Args:
+        redis (aioredis.Redis): The connection to use. Defaults to
+            :attr:`RedisConnection.pool`, looked up whenever it's needed.
+        prefix (str): The prefix to use for all of the keys stored in Redis. This
+            should be different for each token that uses the same Redis database.
+        max_age (float): How long a saved session can be used for, in seconds.
+    """
+
+    def __init__(
+            self,
+            redis: typing.Optional[aioredis.Redis] = None,
+            *,
+            prefix: str = "novus:gateway_session",
+            max_age: float = 120.0):
+        super().__init__(max_age=max_age)
+        self._redis = redis
+        self.prefix = prefix
+
+    @property
+    def redis(self) -> typing.Optional[aioredis.Redis]:
+        if self._redis is not None:
+            return self._redis
+        return RedisConnection.pool
+
+    def _key(self, shard_id: typing.Optional[int]) -> str:
+        return f"{self.prefix}:{shard_id}"
+
+    async def load(self, shard_id: typing.Optional[int]) -> typing.Optional[GatewaySession]:
+        redis = self.redis
+        if redis is None:
+            return None
+        data = await redis.get(self._key(shard_id))
+        if data is None:
+            return None
+        session = json.loads(data)
+        if not self.is_fresh(session):
+            return None
+        return session
+
+    async def save(self, shard_id: typing.Optional[int], session: GatewaySession) -> None:
+        redis = self.redis
+        if redis is None:
+            raise OSError("No Redis connection")
+        await redis.set(self._key(shard_id), json.dumps(session), expire=max(int(self.max_age), 1))
+
+    async def delete(self, shard_id: typing.Optional[int]) -> None:
+        redis = self.redis
+        if redis is None:
+            return
+        await redis.delete(self._key(shard_id))
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
+
+from .redis import RedisConnection, RedisChannelHandler
+from .settings_cache import SettingsCache
+
+if TYPE_CHECKING:
+    from .custom_bot import Bot
+
+
+# The tables that events can refer to, as (attribute on the bot, table name, key column)
+_LOCATIONS = {
+    "g": ("guild_settings", "guild_settings", "guild_id"),
+    "u": ("user_settings", "user_settings", "user_id"),
+}
+
+# Event operations
+_SET = "s"
+_DELETE = "d"
+_APPEND = "a"
+_REMOVE = "r"
+_INVALIDATE = "i"
+
+
+class SettingsBus(object):
+    """
+    Shares changes to :attr:`voxelbotutils.Bot.guild_settings` and :attr:`voxelbotutils.Bot.user_settings`
+    between every cluster connected to the same Redis database, so that a setting changed
+    on one cluster doesn't leave the others serving stale values until they restart.
+
+    Anything that changes a cached setting should call one of the publish methods after
+    changing the local cache - the change isn't applied to the local cache by the bus.
+    Every change made within one loop iteration is sent as a single message, with changes
+    that are overwritten by later ones dropped. This is used by the built-in menu callbacks,
+    and is enabled with ``shared_settings`` in the Redis config.
+
+    .. versionadded:: 0.2.5
+
+    Args:
+        bot (voxelbotutils.Bot): The bot whose caches should be kept up to date.
+    """
+
+    channel_name: str = "VBUSettingsUpdate"
+    logger: logging.Logger = logging.getLogger("vbu.settings_bus")
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self.enabled: bool = False
+        self.origin: str = uuid.uuid4().hex
+        self.handler = RedisChannelHandler(self.channel_name, type(self)._receive)
+        self.handler.cog = self
+        self._pending: List[list] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+
+    def start(self) -> None:
+        """
+        Start publishing changes and listening for changes from other clusters.
+        """
+
+        self.enabled = True
+        self.handler.start()
+
+    def stop(self) -> None:
+        """
+        Stop publishing and listening for changes.
+        """
+
+        self.enabled = False
+        if self.handler.task is not None:
+            self.handler.cancel()
+
+    def set(self, location: str, key: int, path: Sequence[Any], value: Any) -> None:
+        """
+        Publish that a setting was set to a new value.
+
+        Args:
+            location (str): Either ``"guild"`` or ``"user"``.
+            key (int): The ID of the guild or user whose settings changed.
+            path (typing.Sequence[typing.Any]): The keys leading from the settings row to
+                the value that was changed.
+            value (typing.Any): The new value.
+        """
+
+        self._queue(location, key, _SET, path, value)
+
+    def delete(self, location: str, key: int, path: Sequence[Any]) -> None:
+        """
+        Publish that a key was removed from a dictionary setting.
+
+        Args:
+            location (str): Either ``"guild"`` or ``"user"``.
+            key (int): The ID of the guild or user whose settings changed.
+            path (typing.Sequence[typing.Any]): The keys leading from the settings row to
+                the key that was removed.
+        """
+
+        self._queue(location, key, _DELETE, path)
+
+    def append(self, location: str, key: int, path: Sequence[Any], value: Any) -> None:
+        """
+        Publish that a value was added to a list setting, if it wasn't there already.
+
+        Args:
+            location (str): Either ``"guild"`` or ``"user"``.
+            key (int): The ID of the guild or user whose settings changed.
+            path (typing.Sequence[typing.Any]): The keys leading from the settings row to the list.
+            value (typing.Any): The value that was added.
+        """
+
+        self._queue(location, key, _APPEND, path, value)
+
+    def remove(self, location: str, key: int, path: Sequence[Any], value: Any) -> None:
+        """
+        Publish that a value was removed from a list setting.
+
+        Args:
+            location (str): Either ``"guild"`` or ``"user"``.
+            key (int): The ID of the guild or user whose settings changed.
+            path (typing.Sequence[typing.Any]): The keys leading from the settings row to the list.
+            value (typing.Any): The value that was removed.
+        """
+
+        self._queue(location, key, _REMOVE, path, value)
+
+    def invalidate(self, location: str, key: int) -> None:
+        """
+        Publish that a settings row was changed in a way that can't be described by
+        the other methods, so that other clusters load it from the database again.
+
+        Args:
+            location (str): Either ``"guild"`` or ``"user"``.
+            key (int): The ID of the guild or user whose settings changed.
+        """
+
+        self._queue(location, key, _INVALIDATE)
+
+    def _queue(self, location: str, key: int, op: str, path: Sequence[Any] = (), *value: Any) -> None:
+        if not self.enabled:
+            return
+        loc = location[0]
+        path = list(path)
+
+        # Values that can't be sent as JSON, or that wouldn't come out of it the same
+        # (such as dicts keyed by role or channel ID), make the other clusters reload
+        # the whole row
+        if value:
+            try:
+                same = json.loads(json.dumps(value[0])) == value[0]
+            except (TypeError, ValueError):
+                same = False
+            if not same:
+                op, path, value = _INVALIDATE, [], ()
+
+        # Drop anything that this event overwrites
+        if op == _INVALIDATE:
+            self._pending = [i for i in self._pending if i[:2] != [loc, key]]
+        elif op in (_SET, _DELETE):
+            self._pending = [
+                i for i in self._pending
+                if i[:2] != [loc, key] or i[3][:len(path)] != path
+            ]
+        self._pending.append([loc, key, op, path, *value])
+
+        if self._flush_handle is None:
+            loop = asyncio.get_event_loop()
+            self._flush_handle = loop.call_soon(lambda: loop.create_task(self._flush()))
+
+    async def _flush(self) -> None:
+        self._flush_handle = None
+        events, self._pending = self._pending, []
+        if not events:
+            return
+        try:
+            async with RedisConnection() as re:
+                await re.publish(self.channel_name, {"origin": self.origin, "events": events})
+        except Exception:
+            self.logger.error("Failed to publish settings changes", exc_info=True)
+
+    def _receive(self, payload: Dict[str, Any]) -> None:
+        if payload.get("origin") == self.origin:
+            return
+        for event in payload.get("events", []):
+            try:
+                self._apply(*event)
+            except Exception:
+                self.logger.error(f"Failed to apply settings change {event!r}", exc_info=True)
+
+    def _apply(self, loc: str, key: int, op: str, path: List[Any], *value: Any) -> None:
+        cache = getattr(self.bot, _LOCATIONS[loc][0])
+
+        # Rows that aren't cached are loaded fresh when they're needed
+        if isinstance(cache, SettingsCache):
+            if key not in cache:
+                return
+            if op == _INVALIDATE:
+                del cache[key]
+                return
+        elif op == _INVALIDATE:
+            asyncio.create_task(self._reload(loc, key))
+            return
+
+        # Get the object that's being changed
+        d = cache[key]
+        for i in path[:-1]:
+            d = d.setdefault(i, dict())
+
+        # And change it
+        if op == _SET:
+            d[path[-1]] = value[0]
+        elif op == _DELETE:
+            d.pop(path[-1], None)
+        elif op == _APPEND:
+            settings_list = d.setdefault(path[-1], list())
+            if value[0] not in settings_list:
+                settings_list.append(value[0])
+        elif op == _REMOVE:
+            settings_list = d.get(path[-1], [])
+            if value[0] in settings_list:
+                settings_list.remove(value[0])
+
+    async def _reload(self, loc: str, key: int) -> None:
+        attr, table_name, key_column = _LOCATIONS[loc]
+        try:
+            async with self.bot.database() as db:
+                prep = self.bot.database.driver().prepare()
+                rows = await db.call(
+                    "SELECT * FROM {0} WHERE {1}={2}".format(table_name, key_column, next(prep)),
+                    key,
+                )
+        except Exception:
+            self.logger.error(f"Failed to reload row {key} from {table_name}", exc_info=True)
+            return
+        cache = getattr(self.bot, attr)
+        if not rows:
+            cache.pop(key, None)
+            return
+        row = cache[key]
+        for i, o in rows[0].items():
+            row[i] = o
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import copy
+import logging
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+if TYPE_CHECKING:
+    from .database import DatabaseWrapper
+
+
+SettingsLoader = Callable[["DatabaseWrapper", Dict[int, "SettingsRow"]], Awaitable[None]]
+
+
+class SettingsRow(collections.ChainMap):
+    """
+    A row of settings that falls back to the shared defaults for any key that
+    hasn't been set, rather than holding its own copy of them. Mutable defaults
+    (lists, dicts and sets) are copied into the row the first time that they're
+    accessed, so they can be changed in place without touching the defaults.
+
+    .. versionadded:: 0.2.5
+    """
+
+    def __init__(self, *maps):
+        super().__init__(*maps)
+        self._written: Set[Any] = set()
+
+    def __getitem__(self, key):
+        try:
+            return self.maps[0][key]
+        except KeyError:
+            pass
+        for mapping in self.maps[1:]:
+            if key in mapping:
+                value = mapping[key]
+                break
+        else:
+            raise KeyError(key)
+        if isinstance(value, (list, dict, set)):
+            value = copy.deepcopy(value)
+            self.maps[0][key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._written.add(key)
+        self.maps[0][key] = value
+
+    def _update_from_database(self, row) -> None:
+        # Values set locally since the row was made are newer than what we've loaded
+        for key, value in row.items():
+            if key not in self._written:
+                self.maps[0][key] = value
+
+
+class SettingsCache(MutableMapping[int, SettingsRow]):
+    """
+    A cache of rows from a settings table that are loaded from the database when
+    they're first accessed, rather than all at startup. This is used for
+    :attr:`voxelbotutils.Bot.guild_settings` and :attr:`voxelbotutils.Bot.user_settings`
+    when ``lazy_settings`` is enabled in the database config.
+
+    Accessing a row that isn't cached returns a row of the defaults immediately and
+    loads it in the background, filling it in place. Use :func:`fetch` to wait for
+    rows to be loaded. All of the rows missed within one loop iteration are loaded
+    with a single query.
+
+    Rows that are used inside of :func:`pin_rows` (as the cogs' ``cache_setup``
+    methods are) are never evicted, since the data that's added to them there
+    isn't in the table and couldn't be loaded again.
+
+    .. versionadded:: 0.2.5
+
+    Args:
+        database (typing.Type[voxelbotutils.DatabaseWrapper]): The database to load rows from.
+        table_name (str): The table that the rows are stored in.
+        key_column (str): The column that the rows are keyed by.
+        defaults (dict): The default settings, which are shared by every row.
+        max_size (int): The number of rows to keep cached. ``0`` means no limit.
+        ttl (float): How long a row is cached before being loaded again, in seconds.
+            ``0`` means that rows don't expire.
+    """
+
+    logger: logging.Logger = logging.getLogger("vbu.settings_cache")
+    max_query_size: int = 500
+
+    def __init__(
+            self,
+            database: Type[DatabaseWrapper],
+            table_name: str,
+            key_column: str,
+            defaults: Dict[str, Any],
+            *,
+            max_size: int = 10_000,
+            ttl: float = 0):
+        self.database = database
+        self.table_name = table_name
+        self.key_column = key_column
+        self.defaults = defaults
+        self.max_size = max_size
+        self.ttl = ttl
+        self.loaders: List[SettingsLoader] = []
+        self._rows: collections.OrderedDict[int, Tuple[float, SettingsRow]] = collections.OrderedDict()
+        self._loading: Dict[int, asyncio.Future] = {}
+        self._queued: Set[int] = set()
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._pinned: Set[int] = set()
+        self._pinning: bool = False
+
+    def add_loader(self, func: SettingsLoader) -> None:
+        """
+        Add a function that's run whenever rows are loaded from the database, so that
+        cogs can add their own data to the rows that they use. It's given the database
+        connection and a dictionary of the rows that were just loaded.
+
+        Args:
+            func (typing.Callable): The coroutine function to run.
+        """
+
+        self.loaders.append(func)
+
+    @contextlib.contextmanager
+    def pin_rows(self) -> Generator[None, None, None]:
+        """
+        A context manager inside of which every row that's used is pinned, so that
+        it's never evicted from the cache.
+        """
+
+        self._pinning = True
+        try:
+            yield
+        finally:
+            self._pinning = False
+
+    def __getitem__(self, key: int) -> SettingsRow:
+        try:
+            loaded_at, row = self._rows[key]
+        except KeyError:
+            row = SettingsRow({}, self.defaults)
+            self._store(key, row)
+            self._queue(key)
+            return row
+        self._rows.move_to_end(key)
+        if self._pinning:
+            self._pinned.add(key)
+        if self.ttl and loaded_at + self.ttl < time.monotonic():
+            self._queue(key)
+        return row
+
+    def __setitem__(self, key: int, value: Dict[str, Any]) -> None:
+        if not isinstance(value, SettingsRow):
+            value = SettingsRow(dict(value), self.defaults)
+        self._store(key, value)
+
+    def __delitem__(self, key: int) -> None:
+        del self._rows[key]
+        self._pinned.discard(key)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._rows))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key) -> bool:
+        return key in self._rows
+
+    def clear(self) -> None:
+        self._rows.clear()
+        self._pinned.clear()
+
+    def _store(self, key: int, row: SettingsRow) -> None:
+        self._rows[key] = (time.monotonic(), row,)
+        self._rows.move_to_end(key)
+        if self._pinning:
+            self._pinned.add(key)
+        if self.max_size:
+            while len(self._rows) - len(self._pinned) > self.max_size:
+                evicted, value = self._rows.popitem(last=False)
+                if evicted in self._pinned:
+                    self._rows[evicted] = value
+
+    def _queue(self, key: int) -> asyncio.Future:
+        future = self._loading.get(key)
+        if future is not None:
+            return future
+        loop = asyncio.get_event_loop()
+        future = self._loading[key] = loop.create_future()
+        self._queued.add(key)
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_soon(lambda: loop.create_task(self._load_queued()))
+        return future
+
+    async def fetch(self, *keys: int) -> List[SettingsRow]:
+        """
+        Get the given rows, waiting for any of them that aren't cached to be loaded
+        from the database.
+
+        Args:
+            *keys (int): The IDs of the rows to get.
+
+        Returns:
+            typing.List[SettingsRow]: The rows, in the order that their keys were given.
+        """
+
+        rows = [self[key] for key in keys]
+        waiting = [self._loading[key] for key in keys if key in self._loading]
+        if waiting:
+            await asyncio.gather(*waiting)
+        return [self._rows[key][1] if key in self._rows else row for key, row in zip(keys, rows)]
+
+    async def _load_queued(self) -> None:
+        self._flush_handle = None
+        keys, self._queued = list(self._queued), set()
+        for index in range(0, len(keys), self.max_query_size):
+            await self._load(keys[index:index + self.max_query_size])
+
+    async def _load(self, keys: List[int]) -> None:
+        try:
+            async with self.database() as db:
+                prep = self.database.driver().prepare()
+                sql = "SELECT * FROM {0} WHERE {1} IN ({2})".format(
+                    self.table_name,
+                    self.key_column,
+                    ", ".join(next(prep) for _ in keys),
+                )
+                loaded = {row[self.key_column]: row for row in await db.call(sql, *keys)}
+
+                # Fill in the rows that are still cached
+                rows: Dict[int, SettingsRow] = {}
+                now = time.monotonic()
+                for key in keys:
+                    try:
+                        _, row = self._rows[key]
+                    except KeyError:
+                        continue
+                    if key in loaded:
+                        row._update_from_database(loaded[key])
+                    self._rows[key] = (now, row,)
+                    rows[key] = row
+                for loader in self.loaders:
+                    await loader(db, rows)
+        except Exception:
+            self.logger.error(f"Failed to load rows from {self.table_name}", exc_info=True)
+            for key in keys:
+                if key not in self._pinned:
+                    self._rows.pop(key, None)
+        finally:
+            for key in keys:
+                future = self._loading.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_result(None)
@@ -157,7 +157,12 @@ class SettingsMenuOption(object):
                         payload.message.id == bot_message.id,
                         payload.user.id == self.context.author.id,
                     ])
-                payload = await self.context.bot.wait_for("component_interaction", timeout=120, check=check)
+                payload = await self.context.bot.wait_for(
+                    "component_interaction",
+                    timeout=120,
+                    check=check,
+                    message_id=bot_message.id,
+                )
                 await payload.response.defer_update()
                 content = str(payload.component.custom_id)
             else:
@@ -166,7 +171,13 @@ class SettingsMenuOption(object):
                         message.channel.id == self.context.channel.id,
                         message.author.id == self.context.author.id,
                     ])
-                user_message = await self.context.bot.wait_for("message", timeout=120, check=check)
+                user_message = await self.context.bot.wait_for(
+                    "message",
+                    timeout=120,
+                    check=check,
+                    user_id=self.context.author.id,
+                    channel_id=self.context.channel.id,
+                )
                 content = user_message.content
         except asyncio.TimeoutError:
             await self.context.send(f"Timed out asking for {asking_for}.")
@@ -422,6 +433,7 @@ class SettingsMenuOption(object):
 
             # Cache
             self.context.bot.guild_settings[self.context.guild.id][column_name] = original_data
+            self.context.bot.settings_bus.set("guild", self.context.guild.id, (column_name,), original_data)
 
         # Return the callback
         return callback
@@ -469,8 +481,10 @@ class SettingsMenuOption(object):
                 # Remove the converted value from cache
                 try:
                     ctx.bot.guild_settings[ctx.guild.id][cache_key].remove(delete_key)
+                    ctx.bot.settings_bus.remove("guild", ctx.guild.id, (cache_key,), delete_key)
                 except AttributeError:
                     ctx.bot.guild_settings[ctx.guild.id][cache_key].pop(delete_key)
+                    ctx.bot.settings_bus.delete("guild", ctx.guild.id, (cache_key, delete_key,))
 
             return callback
 
@@ -541,9 +555,11 @@ class SettingsMenuOption(object):
                 # Cache the converted value
                 if value:
                     ctx.bot.guild_settings[ctx.guild.id][cache_key][role.id] = serialize_function(original_value)
+                    ctx.bot.settings_bus.set("guild", ctx.guild.id, (cache_key, role.id,), serialize_function(original_value))
                 else:
                     if role.id not in ctx.bot.guild_settings[ctx.guild.id][cache_key]:
                         ctx.bot.guild_settings[ctx.guild.id][cache_key].append(role.id)
+                        ctx.bot.settings_bus.append("guild", ctx.guild.id, (cache_key,), role.id)
 
             return callback
 
@@ -667,7 +683,12 @@ class SettingsMenu:
                         payload.message.id == message.id,
                         payload.user.id == ctx.author.id,
                     ])
-                payload = await ctx.bot.wait_for("component_interaction", check=check, timeout=timeout)
+                payload = await ctx.bot.wait_for(
+                    "component_interaction",
+                    check=check,
+                    timeout=timeout,
+                    message_id=message.id,
+                )
                 await payload.response.defer_update()
             except asyncio.TimeoutError:
                 break
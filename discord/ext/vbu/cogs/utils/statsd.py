@@ -1,6 +1,13 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import inspect
 import logging
+import random
+from typing import Dict, List, Optional, Tuple, Iterator
 
-import aiodogstatsd
+from aiodogstatsd import protocol, typedefs
 
 
 def _fake_stats_collection_function(*args, **kwargs):
@@ -32,6 +39,8 @@ class _FakeContextManager(object):
 class _FakeStatsdConnection(object):
 
     def __init__(self):
+        self.loop = None
+        self.closed = False
         self.connect = _fake_async_stats_collection_function
         self.close = _fake_async_stats_collection_function
 
@@ -45,48 +54,332 @@ class _FakeStatsdConnection(object):
         self.timeit = _FakeContextManager
 
 
+class BatchingStatsdClient(object):
+    """
+    A long-lived statsd client that aggregates metrics in memory and sends
+    them in batched UDP packets.
+
+    Counters are summed and gauges keep their latest value between flushes,
+    so a busy counter only costs one line per flush interval no matter how
+    often it's incremented. Timings, histograms and distributions keep every
+    sample. Pending data is flushed every ``flush_interval`` seconds, or
+    sooner once ``flush_size`` lines are waiting. If ``max_queue_size`` lines
+    are already waiting then any new series is dropped until the next flush.
+
+    Like the rest of the statsd utils, sending fails silently.
+
+    Attributes:
+        packets_sent (int): The number of UDP packets sent by this client.
+        metrics_sent (int): The number of metric lines sent by this client.
+        metrics_dropped (int): The number of metrics dropped because the
+            queue was full.
+    """
+
+    logger: logging.Logger = logging.getLogger("vbu.statsd")
+
+    def __init__(
+            self,
+            *,
+            host: str = "localhost",
+            port: int = 8125,
+            namespace: Optional[str] = None,
+            constant_tags: Optional[typedefs.MTags] = None,
+            sample_rate: typedefs.MSampleRate = 1,
+            flush_interval: float = 1.0,
+            flush_size: int = 1_000,
+            max_queue_size: int = 10_000,
+            max_packet_size: int = 1_432):
+        """
+        Args:
+            host (str, optional): The host of the statsd server.
+            port (int, optional): The port of the statsd server.
+            namespace (Optional[str], optional): A prefix added to every metric name.
+            constant_tags (Optional[dict], optional): Tags added to every metric.
+            sample_rate (float, optional): The default sample rate for metrics.
+            flush_interval (float, optional): How often, in seconds, pending metrics are sent.
+            flush_size (int, optional): How many pending lines cause an early flush.
+            max_queue_size (int, optional): How many pending lines can be held before new ones are dropped.
+            max_packet_size (int, optional): The largest UDP payload that will be sent, in bytes.
+        """
+
+        self.host = host
+        self.port = port
+        self.namespace = namespace
+        self.constant_tags = dict(constant_tags or {})
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.max_queue_size = max_queue_size
+        self.max_packet_size = max_packet_size
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._closed = False
+
+        # Series are keyed by (name, type, sample rate, tags)
+        self._counters: Dict[Tuple, typedefs.MValue] = {}
+        self._gauges: Dict[Tuple, typedefs.MValue] = {}
+        self._samples: Dict[Tuple, List[typedefs.MValue]] = {}
+        self._pending = 0
+
+        self.packets_sent = 0
+        self.metrics_sent = 0
+        self.metrics_dropped = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def connect(self) -> None:
+        """
+        Open the UDP socket and start the flush timer.
+        """
+
+        self.loop = asyncio.get_running_loop()
+        try:
+            self._transport, _ = await self.loop.create_datagram_endpoint(
+                asyncio.DatagramProtocol,
+                remote_addr=(self.host, self.port),
+            )
+        except OSError as e:
+            self.logger.warning(f"Failed to open statsd socket to {self.host}:{self.port} - {e}")
+        self._flush_handle = self.loop.call_later(self.flush_interval, self._flush_on_interval)
+
+    async def close(self) -> None:
+        """
+        Send anything that's still pending and close the socket.
+        """
+
+        if self._closed:
+            return
+        self._closed = True
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self.flush()
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    def _flush_on_interval(self) -> None:
+        self.flush()
+        if not self._closed and self.loop is not None:
+            self._flush_handle = self.loop.call_later(self.flush_interval, self._flush_on_interval)
+
+    def _get_key(self, name, type_, sample_rate, tags) -> Tuple:
+        if tags:
+            return (name, type_, sample_rate, tuple(sorted(tags.items())))
+        return (name, type_, sample_rate, ())
+
+    def _report(
+            self,
+            name: typedefs.MName,
+            type_: typedefs.MType,
+            value: typedefs.MValue,
+            tags: Optional[typedefs.MTags] = None,
+            sample_rate: Optional[typedefs.MSampleRate] = None) -> None:
+        """
+        Add a metric to the pending data.
+        """
+
+        if self._closed:
+            return
+        sample_rate = sample_rate or self.sample_rate
+        if sample_rate != 1 and random.random() > sample_rate:
+            return
+
+        # Counters are scaled up front so that they can be summed together
+        # and sent at full rate
+        if type_ is typedefs.MType.COUNTER:
+            key = self._get_key(name, type_, 1, tags)
+            series = self._counters
+            value = value / sample_rate if sample_rate != 1 else value
+        elif type_ is typedefs.MType.GAUGE:
+            key = self._get_key(name, type_, 1, tags)
+            series = self._gauges
+        else:
+            key = self._get_key(name, type_, sample_rate, tags)
+            series = self._samples
+
+        # See if the metric adds a new line
+        new_line = type_ not in (typedefs.MType.COUNTER, typedefs.MType.GAUGE) or key not in series
+        if new_line and self._pending >= self.max_queue_size:
+            self.metrics_dropped += 1
+            return
+
+        # Store it
+        if series is self._counters:
+            self._counters[key] = self._counters.get(key, 0) + value
+        elif series is self._gauges:
+            self._gauges[key] = value
+        else:
+            self._samples.setdefault(key, []).append(value)
+        if new_line:
+            self._pending += 1
+            if self._pending == self.flush_size and self.loop is not None:
+                self.loop.call_soon(self.flush)
+
+    def _build_lines(self, counters, gauges, samples) -> Iterator[bytes]:
+        for series in (counters, gauges):
+            for (name, type_, sample_rate, tags), value in series.items():
+                yield self._build(name, type_, value, sample_rate, tags)
+        for (name, type_, sample_rate, tags), values in samples.items():
+            for value in values:
+                yield self._build(name, type_, value, sample_rate, tags)
+
+    def _build(self, name, type_, value, sample_rate, tags) -> bytes:
+        all_tags = dict(self.constant_tags, **dict(tags)) if tags else self.constant_tags
+        return protocol.build(
+            name=name,
+            namespace=self.namespace,
+            value=value,
+            type_=type_,
+            tags=all_tags,
+            sample_rate=sample_rate,
+        )
+
+    def flush(self) -> None:
+        """
+        Send all pending metrics, packing as many lines into each packet as
+        will fit.
+        """
+
+        if not self._pending:
+            return
+        lines = self._build_lines(self._counters, self._gauges, self._samples)
+        self._counters, self._gauges, self._samples = {}, {}, {}
+        self._pending = 0
+
+        packet: List[bytes] = []
+        packet_size = 0
+        for line in lines:
+            if packet and packet_size + len(line) + 1 > self.max_packet_size:
+                self._send(packet)
+                packet, packet_size = [], 0
+            packet.append(line)
+            packet_size += len(line) + (1 if packet_size else 0)
+        if packet:
+            self._send(packet)
+
+    def _send(self, lines: List[bytes]) -> None:
+        self.metrics_sent += len(lines)
+        if self._transport is None:
+            return
+        try:
+            self._transport.sendto(b"\n".join(lines))
+            self.packets_sent += 1
+        except Exception:
+            pass
+
+    def increment(self, name, *, value=1, tags=None, sample_rate=None):
+        self._report(name, typedefs.MType.COUNTER, value, tags, sample_rate)
+
+    def decrement(self, name, *, value=1, tags=None, sample_rate=None):
+        self._report(name, typedefs.MType.COUNTER, -value, tags, sample_rate)
+
+    def gauge(self, name, *, value, tags=None, sample_rate=None):
+        self._report(name, typedefs.MType.GAUGE, value, tags, sample_rate)
+
+    def histogram(self, name, *, value, tags=None, sample_rate=None):
+        self._report(name, typedefs.MType.HISTOGRAM, value, tags, sample_rate)
+
+    def distribution(self, name, *, value, tags=None, sample_rate=None):
+        self._report(name, typedefs.MType.DISTRIBUTION, value, tags, sample_rate)
+
+    def timing(self, name, *, value, tags=None, sample_rate=None):
+        self._report(name, typedefs.MType.TIMING, value, tags, sample_rate)
+
+    @contextlib.contextmanager
+    def timeit(self, name, *, tags=None, sample_rate=None):
+        loop = asyncio.get_event_loop()
+        started_at = loop.time()
+        try:
+            yield
+        finally:
+            value = (loop.time() - started_at) * 1000
+            self.timing(name, value=int(value), tags=tags, sample_rate=sample_rate)
+
+
 class StatsdConnection(object):
     """
-    A helper class to wrap around an :class:`aiodogstatsd.Client` object so
+    A helper class to wrap around a :class:`BatchingStatsdClient` object so
     as to make it a little easier to use.
     Statsd is unique in my wrapper utils in that it'll fail
     silently if there's no connection to be made.
+
+    Every connection shares one client per process, so entering and leaving
+    ``async with bot.stats()`` is cheap - metrics are buffered and sent in
+    the background rather than when the context manager exits.
     """
 
     config: dict = None
     logger: logging.Logger = logging.getLogger("vbu.statsd")
+    client: Optional[BatchingStatsdClient] = None
     __slots__ = ('conn',)
 
-    def __init__(self, connection: aiodogstatsd.Client = None):
+    def __init__(self, connection: BatchingStatsdClient = None):
         """:meta private:"""
 
         self.conn = connection
 
     @classmethod
-    async def get_connection(cls) -> 'StatsdConnection':
+    async def get_client(cls) -> BatchingStatsdClient:
         """
-        Acquires a connection to the database from the pool.
+        Get the process-wide statsd client, creating it if it doesn't
+        exist yet.
 
         Returns:
-            StatsdConnection: The connection that was aquired from the pool.
+            BatchingStatsdClient: The shared client.
         """
 
+        client = cls.client
+        if client is not None and not client.closed and client.loop in (None, asyncio.get_running_loop()):
+            return client
         config = cls.config.copy()
         if not config.get("constant_tags", {}).get("service"):
             # cls.logger.debug("Creating fake Statsd connection")
-            conn = _FakeStatsdConnection()
+            client = _FakeStatsdConnection()
         else:
             # cls.logger.debug("Creating real Statsd connection")
-            conn = aiodogstatsd.Client(**config)
-        await conn.connect()
-        return cls(conn)
+            # Older configs can have options for other clients in them, so only
+            # pass through the ones that this one takes
+            parameters = inspect.signature(BatchingStatsdClient).parameters
+            ignored = [i for i in config if i not in parameters]
+            if ignored:
+                cls.logger.warning(f"Ignoring unsupported statsd config keys {', '.join(ignored)}")
+            client = BatchingStatsdClient(**{i: o for i, o in config.items() if i in parameters})
+            client.logger = cls.logger
+        cls.client = client
+        await client.connect()
+        return client
+
+    @classmethod
+    async def close_client(cls) -> None:
+        """
+        Flush and close the process-wide statsd client.
+        """
+
+        client, cls.client = cls.client, None
+        if client is not None:
+            await client.close()
+
+    @classmethod
+    async def get_connection(cls) -> 'StatsdConnection':
+        """
+        Acquires a connection to the shared statsd client.
+
+        Returns:
+            StatsdConnection: The connection that was aquired.
+        """
+
+        return cls(await cls.get_client())
 
     async def disconnect(self) -> None:
         """
-        Releases a connection from the pool back to the mix.
+        Releases the connection. The shared client is left open.
         """
 
-        await self.conn.close()
         self.conn = None
         del self
 
@@ -92,6 +92,10 @@ class _Database(TypedDict):
     database: str
     host: str
     port: int
+    lazy_settings: bool
+    settings_cache_size: int
+    settings_cache_ttl: int
+    slow_query_threshold: float
 
 
 class _Redis(TypedDict):
@@ -99,6 +103,10 @@ class _Redis(TypedDict):
     host: str
     port: int
     db: int
+    shared_ratelimits: bool
+    shared_cooldowns: bool
+    shared_settings: bool
+    persist_sessions: bool
 
 
 class _ShardManager(TypedDict):
@@ -149,6 +157,8 @@ class _Statsd(TypedDict):
     host: str
     port: int
     constant_tags: Dict[str, str]
+    flush_interval: float
+    max_queue_size: int
 
 
 class _BotConfigOptional(TypedDict, total=False):
@@ -168,6 +178,9 @@ class BotConfig(_BotConfigOptional):
 
     # default_prefix: str
     cached_messages: int
+    cached_messages_per_channel: int
+    cached_messages_per_guild: int
+    cache_snapshot: str
 
     support_guild_id: int
     bot_support_role_id: int
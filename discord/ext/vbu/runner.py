@@ -7,6 +7,9 @@ import os
 import importlib
 import io
 import traceback
+import signal
+import socket
+import multiprocessing
 
 import discord
 from discord.ext import commands
@@ -146,7 +149,9 @@ class LogFilter(logging.Filter):
 def _set_default_log_level(logger_name, log_filter, formatter, loglevel):
     logger = logging.getLogger(logger_name) if isinstance(logger_name, str) else logger_name
 
-    set_log_level(logger, 'DEBUG')
+    # The handlers below filter by level anyway, so there's no reason to have
+    # the logger build (and then throw away) records below the level we output
+    set_log_level(logger, loglevel)
 
     stdout_logger = logging.StreamHandler(sys.stdout)
     stdout_logger.addFilter(log_filter)
@@ -460,6 +465,10 @@ async def run_interactions(args: argparse.Namespace) -> None:
     os.chdir(args.bot_directory)
     set_event_loop()
 
+    # See if we're one of many workers
+    worker_id: int = getattr(args, "worker_id", 0)
+    worker_count: int = getattr(args, "workers", 1)
+
     # And run file
     bot = Bot(config_file=args.config_file, intents=discord.Intents.none())
     bot.is_interactions_only = True
@@ -481,10 +490,10 @@ async def run_interactions(args: argparse.Namespace) -> None:
     logger.info('Loading extensions... ')
     bot.load_all_extensions()
 
-    # Run the bot
+    # Run the bot - only one worker gets to connect to the gateway
     logger.info("Logging in bot")
     await bot.login()
-    if args.connect:
+    if args.connect and worker_id == 0:
         logger.info("Connecting bot to gateway")
         await bot.connect()
 
@@ -506,20 +515,34 @@ async def run_interactions(args: argparse.Namespace) -> None:
     logger.info("Creating webserver...")
     application = AppRunner(app)
     await application.setup()
-    webserver = TCPSite(application, host=args.host, port=args.port)
+    webserver = TCPSite(application, host=args.host, port=args.port, reuse_port=worker_count > 1)
 
     # Start the webserver
     await webserver.start()
     host = args.host if args.host != '0.0.0.0' else 'localhost'
-    logger.info(f"Server started - http://{host}:{args.port}/")
+    if worker_count > 1:
+        logger.info(f"Server started on worker {worker_id} - http://{host}:{args.port}/")
+    else:
+        logger.info(f"Server started - http://{host}:{args.port}/")
+
+    # Stop when we're told to
+    stop_event = asyncio.Event()
+    loop = asyncio.get_event_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows doesn't support signal handlers on the loop
 
     # This is the forever loop
     try:
         logger.info("Running webserver")
-        while True:
-            await asyncio.sleep(0.1)
+        await stop_event.wait()
     except (KeyboardInterrupt, asyncio.CancelledError):
-        logger.info("Stopping webserver")
+        pass
+    logger.info("Stopping webserver")
+    await application.cleanup()
+    await bot.close()
 
     # We're now done running the webserver, time to clean up and close
     if bot.config.get('database', {}).get('enabled', False):
@@ -534,6 +557,65 @@ async def run_interactions(args: argparse.Namespace) -> None:
         RedisConnection.pool.close()
 
 
+def _run_interactions_worker(args: argparse.Namespace, worker_id: int) -> None:
+    """
+    Run a single worker of the interactions server in this process.
+    """
+
+    args.worker_id = worker_id
+    try:
+        asyncio.run(run_interactions(args))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_interactions_workers(args: argparse.Namespace) -> None:
+    """
+    Starts a number of interactions server processes (as set by ``args.workers``),
+    all sharing the same port, and waits for them to finish. Each process runs its
+    own bot and HTTP client. A SIGTERM sent to this process is passed on to each
+    of the workers so that they shut down cleanly.
+
+    Parameters
+    -----------
+    args: :class:`argparse.Namespace`
+        The arguments namespace that wants to be run.
+    """
+
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("Running multiple interactions workers requires SO_REUSEPORT, which isn't supported on this platform")
+
+    # Start our workers
+    workers: typing.List[multiprocessing.Process] = []
+    for worker_id in range(args.workers):
+        process = multiprocessing.Process(
+            target=_run_interactions_worker,
+            args=(args, worker_id,),
+            name=f"vbu-interactions-{worker_id}",
+        )
+        process.start()
+        workers.append(process)
+
+    # Pass a SIGTERM on to our workers
+    def terminate_workers(*_):
+        for process in workers:
+            if process.is_alive():
+                process.terminate()
+    signal.signal(signal.SIGTERM, terminate_workers)
+
+    # And wait for them all to stop - Ctrl+C will have been sent to the workers
+    # already as they're in our process group
+    for process in workers:
+        while True:
+            try:
+                process.join()
+                break
+            except KeyboardInterrupt:
+                continue
+        if process.exitcode:
+            logger.error(f"Interactions worker {process.name} exited with code {process.exitcode}")
+
+
 async def run_website(args: argparse.Namespace) -> None:
     """
     Starts the website, connects the database, logs in the specified bots,
@@ -27,17 +27,28 @@ from __future__ import annotations
 import asyncio
 from collections import namedtuple, deque
 import concurrent.futures
+import heapq
 import logging
 import struct
 import sys
 import time
 import threading
 import traceback
-from typing import TYPE_CHECKING, Any, Awaitable, Callable, List, Dict, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, List, Dict, Optional, Set, Tuple
+import urllib.parse
+import weakref
 import zlib
 
 import aiohttp
 
+has_zstd: bool
+
+try:
+    import zstandard  # type: ignore
+    has_zstd = True
+except ImportError:
+    has_zstd = False
+
 from . import utils
 from .activity import BaseActivity
 from .enums import SpeakingState
@@ -56,8 +67,12 @@ _log = logging.getLogger(__name__)
 
 __all__ = (
     'DiscordWebSocket',
+    'GatewaySendQueue',
     'KeepAliveHandler',
     'VoiceKeepAliveHandler',
+    'HeartbeatScheduler',
+    'AsyncKeepAliveHandler',
+    'VoiceAsyncKeepAliveHandler',
     'DiscordVoiceWebSocket',
     'ReconnectWebSocket',
 )
@@ -128,6 +143,134 @@ class GatewayRatelimiter:
                 await asyncio.sleep(delta)
 
 
+class _QueuedPayload:
+    __slots__ = ('priority', 'sequence', 'key', 'data', 'payload', 'future')
+
+    def __init__(self, priority, sequence, key, data, payload, future):
+        self.priority: int = priority
+        self.sequence: int = sequence
+        self.key: Optional[Any] = key
+        self.data: str = data
+        self.payload: Optional[Dict[str, Any]] = payload
+        self.future: asyncio.Future[None] = future
+
+    def __lt__(self, other: _QueuedPayload) -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class GatewaySendQueue:
+    """Sends payloads to the gateway within its rate limit, in order of priority
+    rather than in the order that they were sent.
+
+    Payloads are sent straight away while there's room in the rate limit. Once the
+    limit is hit, they're queued and sent highest priority first: :attr:`CRITICAL`
+    (identify, resume and voice state updates), then :attr:`NORMAL` (presence
+    updates and member queries), then :attr:`BULK` (whole guild chunk requests).
+    A payload sent with the same ``key`` as one that's still queued replaces it
+    rather than being queued as well, keeping its place in the queue.
+
+    .. versionadded:: 0.2.5
+
+    Attributes
+    -----------
+    coalesced: :class:`int`
+        The number of payloads that replaced one that was already queued.
+    """
+
+    CRITICAL = 0
+    NORMAL = 1
+    BULK = 2
+
+    def __init__(
+            self,
+            sender: Callable[[str], Awaitable[None]],
+            ratelimiter: GatewayRatelimiter,
+            *,
+            on_sent: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self._sender = sender
+        self._ratelimiter = ratelimiter
+        self._on_sent = on_sent
+        self._heap: List[_QueuedPayload] = []
+        self._keyed: Dict[Any, _QueuedPayload] = {}
+        self._sequence: int = 0
+        self._task: Optional[asyncio.Task] = None
+        self.coalesced: int = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def depths(self) -> Dict[int, int]:
+        """Dict[:class:`int`, :class:`int`]: How many payloads are queued at each priority."""
+        depths = {self.CRITICAL: 0, self.NORMAL: 0, self.BULK: 0}
+        for entry in self._heap:
+            depths[entry.priority] = depths.get(entry.priority, 0) + 1
+        return depths
+
+    async def put(
+            self,
+            data: str,
+            *,
+            priority: int = NORMAL,
+            key: Optional[Any] = None,
+            payload: Optional[Dict[str, Any]] = None) -> None:
+        """Sends a payload, waiting until it's been sent."""
+
+        # See if we're replacing something that's queued
+        if key is not None:
+            entry = self._keyed.get(key)
+            if entry is not None:
+                entry.data, entry.payload = data, payload
+                if priority < entry.priority:
+                    entry.priority = priority
+                    heapq.heapify(self._heap)
+                self.coalesced += 1
+                return await asyncio.shield(entry.future)
+
+        # Send it now if there's nothing ahead of it
+        if not self._heap and self._ratelimiter.get_delay() == 0:
+            await self._sender(data)
+            if payload is not None and self._on_sent is not None:
+                self._on_sent(payload)
+            return
+
+        # Queue it
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._sequence += 1
+        entry = _QueuedPayload(priority, self._sequence, key, data, payload, future)
+        heapq.heappush(self._heap, entry)
+        if key is not None:
+            self._keyed[key] = entry
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain())
+        await asyncio.shield(future)
+
+    async def _drain(self) -> None:
+        try:
+            while self._heap:
+                delay = self._ratelimiter.get_delay()
+                if delay:
+                    _log.warning(
+                        'WebSocket in shard ID %s is ratelimited, waiting %.2f seconds with %s payloads queued',
+                        self._ratelimiter.shard_id, delay, len(self._heap),
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                entry = heapq.heappop(self._heap)
+                if entry.key is not None:
+                    self._keyed.pop(entry.key, None)
+                try:
+                    await self._sender(entry.data)
+                except Exception as e:
+                    entry.future.set_exception(e)
+                else:
+                    if entry.payload is not None and self._on_sent is not None:
+                        self._on_sent(entry.payload)
+                    entry.future.set_result(None)
+        finally:
+            self._task = None
+
+
 class KeepAliveHandler(threading.Thread):
 
     def __init__(self, *args, **kwargs):
@@ -234,6 +377,301 @@ class VoiceKeepAliveHandler(KeepAliveHandler):
         self.recent_ack_latencies.append(self.latency)
 
 
+class HeartbeatScheduler:
+    """Drives the heartbeats of every websocket on an event loop from a single timer,
+    rather than from a thread per websocket.
+
+    Heartbeats are kept in a heap ordered by when they're next due, and the loop
+    is woken up only when the earliest one is. A single watchdog thread is used
+    to log the loop's stack if it's blocked for long enough to delay heartbeats.
+
+    This is used when the client's ``heartbeat_mode`` is ``'asyncio'``.
+
+    .. versionadded:: 0.2.5
+    """
+
+    _schedulers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HeartbeatScheduler] = weakref.WeakKeyDictionary()
+
+    # How often the loop reports that it's alive to the watchdog, and how long it
+    # can go without doing so before the watchdog logs its stack
+    watchdog_interval: float = 1.0
+    block_timeout: float = 10.0
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop: asyncio.AbstractEventLoop = loop
+        self._thread_id: int = threading.get_ident()
+        self._heap: List[Tuple[float, int, AsyncKeepAliveHandler]] = []
+        self._handlers: Set[AsyncKeepAliveHandler] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._sequence: int = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_when: float = 0.0
+        self._loop_seen: float = time.perf_counter()
+        self._watchdog: Optional[threading.Thread] = None
+        self._watchdog_stop: threading.Event = threading.Event()
+
+    @classmethod
+    def get(cls, loop: asyncio.AbstractEventLoop) -> HeartbeatScheduler:
+        """Gets the scheduler for the given loop, creating it if needed."""
+        try:
+            return cls._schedulers[loop]
+        except KeyError:
+            scheduler = cls._schedulers[loop] = cls(loop)
+            return scheduler
+
+    def add(self, handler: AsyncKeepAliveHandler) -> None:
+        self._handlers.add(handler)
+        self._push(self.loop.time() + handler.interval, handler)
+        if self._watchdog is None:
+            self._loop_seen = time.perf_counter()
+            self._watchdog_stop = threading.Event()
+            self._watchdog = threading.Thread(
+                target=self._watch, args=(self._watchdog_stop,),
+                name='heartbeat-watchdog', daemon=True,
+            )
+            self._watchdog.start()
+
+    def remove(self, handler: AsyncKeepAliveHandler) -> None:
+        # Its heap entry is skipped when it comes up
+        self._handlers.discard(handler)
+        if not self._handlers:
+            self._heap.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._watchdog is not None:
+                self._watchdog_stop.set()
+                self._watchdog = None
+
+    def spawn(self, coro: Awaitable[Any]) -> None:
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _push(self, when: float, handler: AsyncKeepAliveHandler) -> None:
+        self._sequence += 1
+        heapq.heappush(self._heap, (when, self._sequence, handler))
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if not self._heap:
+            return
+        when = min(self._heap[0][0], self.loop.time() + self.watchdog_interval)
+        if self._timer is not None:
+            if self._timer_when <= when:
+                return
+            self._timer.cancel()
+        self._timer_when = when
+        self._timer = self.loop.call_at(when, self._run)
+
+    def _run(self) -> None:
+        self._timer = None
+        self._loop_seen = time.perf_counter()
+        now = self.loop.time()
+        while self._heap and self._heap[0][0] <= now:
+            when, _, handler = heapq.heappop(self._heap)
+            if handler not in self._handlers:
+                continue
+            handler.beat()
+            if handler in self._handlers:
+                # Stay on schedule unless we've fallen a whole interval behind
+                self._sequence += 1
+                heapq.heappush(self._heap, (max(when + handler.interval, now), self._sequence, handler))
+        self._schedule()
+
+    def _watch(self, stop: threading.Event) -> None:
+        while not stop.wait(self.block_timeout):
+            blocked = time.perf_counter() - self._loop_seen
+            if blocked < self.block_timeout:
+                continue
+            msg = 'Event loop blocked for more than %.0f seconds, delaying heartbeats for %s websockets.'
+            try:
+                frame = sys._current_frames()[self._thread_id]
+            except KeyError:
+                pass
+            else:
+                stack = ''.join(traceback.format_stack(frame))
+                msg = f'{msg}\nLoop thread traceback (most recent call last):\n{stack}'
+            _log.warning(msg, blocked, len(self._handlers))
+
+
+class AsyncKeepAliveHandler:
+    """A keep alive handler that's run by a :class:`HeartbeatScheduler` on the
+    websocket's loop rather than in its own thread.
+
+    .. versionadded:: 0.2.5
+    """
+
+    def __init__(self, *, ws, interval: float, shard_id: Optional[int] = None) -> None:
+        self.ws = ws
+        self.interval = interval
+        self.shard_id = shard_id
+        self.msg = 'Keeping shard ID %s websocket alive with sequence %s.'
+        self.behind_msg = 'Can\'t keep up, shard ID %s websocket is %.1fs behind.'
+        self._scheduler = HeartbeatScheduler.get(ws.loop)
+        self._sending = False
+        self._last_ack = time.perf_counter()
+        self._last_send = time.perf_counter()
+        self._last_recv = time.perf_counter()
+        self.latency = float('inf')
+        self.heartbeat_timeout = ws._max_heartbeat_timeout
+
+    def start(self) -> None:
+        self._scheduler.add(self)
+
+    def stop(self) -> None:
+        self._scheduler.remove(self)
+
+    def beat(self) -> None:
+        if self._last_recv + self.heartbeat_timeout < time.perf_counter():
+            _log.warning("Shard ID %s has stopped responding to the gateway. Closing and restarting.", self.shard_id)
+            self.stop()
+            self._scheduler.spawn(self._close())
+            return
+
+        # Don't queue up heartbeats behind one that's still being sent
+        if self._sending:
+            return
+        data = self.get_payload()
+        _log.debug(self.msg, self.shard_id, data['d'])
+        self._sending = True
+        self._scheduler.spawn(self._send(data))
+
+    async def _close(self) -> None:
+        try:
+            await self.ws.close(4000)
+        except Exception:
+            _log.exception('An error occurred while stopping the gateway. Ignoring.')
+
+    async def _send(self, data) -> None:
+        try:
+            await self.ws.send_heartbeat(data)
+        except Exception:
+            self.stop()
+        else:
+            self._last_send = time.perf_counter()
+        finally:
+            self._sending = False
+
+    def get_payload(self):
+        return {
+            'op': self.ws.HEARTBEAT,
+            'd': self.ws.sequence
+        }
+
+    def tick(self) -> None:
+        self._last_recv = time.perf_counter()
+
+    def ack(self) -> None:
+        ack_time = time.perf_counter()
+        self._last_ack = ack_time
+        self.latency = ack_time - self._last_send
+        if self.latency > 10:
+            _log.warning(self.behind_msg, self.shard_id, self.latency)
+
+
+class VoiceAsyncKeepAliveHandler(AsyncKeepAliveHandler):
+    """The voice websocket version of :class:`AsyncKeepAliveHandler`.
+
+    .. versionadded:: 0.2.5
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.recent_ack_latencies = deque(maxlen=20)
+        self.msg = 'Keeping shard ID %s voice websocket alive with timestamp %s.'
+        self.behind_msg = 'High socket latency, shard ID %s heartbeat is %.1fs behind'
+
+    def get_payload(self):
+        return {
+            'op': self.ws.HEARTBEAT,
+            'd': int(time.time() * 1000)
+        }
+
+    def ack(self) -> None:
+        ack_time = time.perf_counter()
+        self._last_ack = ack_time
+        self._last_recv = ack_time
+        self.latency = ack_time - self._last_send
+        self.recent_ack_latencies.append(self.latency)
+
+
+class _ZlibStreamDecompressor:
+    """Inflates a ``zlib-stream`` gateway connection.
+
+    A message ends with a frame that ends in a zlib sync flush. Messages that
+    arrive in a single frame are inflated straight from that frame, and messages
+    that are split over several frames are collected into a buffer that's reused
+    between messages rather than being allocated again for each one.
+    """
+
+    __slots__ = ('_zlib', '_buffer', '_length')
+
+    SUFFIX = b'\x00\x00\xff\xff'
+    # buffers that have grown past this (for a large GUILD_CREATE, say) aren't kept around
+    MAX_RETAINED_BUFFER = 1024 * 1024
+
+    def __init__(self) -> None:
+        self._zlib = zlib.decompressobj()
+        self._buffer: bytearray = bytearray()
+        self._length: int = 0
+
+    def decompress(self, data: bytes) -> Optional[bytes]:
+        complete = data[-4:] == self.SUFFIX
+        if complete and not self._length:
+            return self._zlib.decompress(data)
+
+        # overwrite the space left from earlier messages before growing the buffer
+        end = self._length + len(data)
+        if end <= len(self._buffer):
+            self._buffer[self._length:end] = data
+        else:
+            self._buffer[self._length:] = data
+        self._length = end
+        if not complete:
+            return None
+
+        with memoryview(self._buffer) as view, view[:self._length] as message:
+            inflated = self._zlib.decompress(message)
+        self._length = 0
+        if len(self._buffer) > self.MAX_RETAINED_BUFFER:
+            self._buffer = bytearray()
+        return inflated
+
+
+class _ZstdStreamDecompressor:
+    """Decompresses a ``zstd-stream`` gateway connection, where every message
+    is flushed as it's sent so each one can be decompressed as it arrives."""
+
+    __slots__ = ('_zstd',)
+
+    def __init__(self) -> None:
+        self._zstd = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes) -> Optional[bytes]:
+        return self._zstd.decompress(data) or None
+
+
+_GATEWAY_DECOMPRESSORS: Dict[Optional[str], Callable[[], Any]] = {
+    'zlib-stream': _ZlibStreamDecompressor,
+    'zstd-stream': _ZstdStreamDecompressor,
+    None: lambda: None,
+}
+
+
+def _gateway_url(url: str, compress: Optional[str]) -> str:
+    # Resume URLs are given without any query parameters, and the compression
+    # is picked by the client rather than by whatever fetched the URL
+    parts = urllib.parse.urlsplit(url)
+    query = dict(urllib.parse.parse_qsl(parts.query))
+    query.setdefault('encoding', 'json')
+    query.setdefault('v', '9')
+    query.pop('compress', None)
+    if compress is not None:
+        query['compress'] = compress
+    return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+
 class DiscordClientWebSocketResponse(aiohttp.ClientWebSocketResponse):
 
     async def close(self, *, code: int = 4000, message: bytes = b'') -> bool:
@@ -315,10 +753,10 @@ class DiscordWebSocket:
         self.session_id = None
         self.sequence = None
         self.resume_url: Optional[str] = None
-        self._zlib = zlib.decompressobj()
-        self._buffer = bytearray()
+        self._decompressor: Optional[Any] = _ZlibStreamDecompressor()
         self._close_code = None
         self._rate_limiter = GatewayRatelimiter()
+        self._send_queue = GatewaySendQueue(self.socket.send_str, self._rate_limiter, on_sent=self._count_sent)
 
         # type hinting stuff
         self.client: Optional[Client] = None
@@ -341,6 +779,8 @@ class DiscordWebSocket:
         return self._rate_limiter.is_ratelimited()
 
     def debug_log_receive(self, data, /):
+        if type(data) is bytes:
+            data = data.decode('utf-8')
         self._dispatch('socket_raw_receive', data)
 
     def log_receive(self, _, /):
@@ -362,9 +802,11 @@ class DiscordWebSocket:
         This is for internal use only.
         """
 
-        gateway = gateway or await client.http.get_gateway()
+        compress = client._connection.gateway_compression
+        gateway = _gateway_url(gateway or await client.http.get_gateway(), compress)
         socket = await client.http.ws_connect(gateway)
         ws = cls(socket, loop=client.loop)
+        ws._decompressor = _GATEWAY_DECOMPRESSORS[compress]()
 
         # dynamically add attributes needed
         ws.client = client
@@ -382,6 +824,7 @@ class DiscordWebSocket:
         ws.session_id = session
         ws.sequence = sequence
         ws._max_heartbeat_timeout = client._connection.heartbeat_timeout
+        client._connection.gateway_send_queues[shard_id] = ws._send_queue
         client.ws = ws
 
         if client._enable_debug_events:
@@ -465,7 +908,7 @@ class DiscordWebSocket:
             payload['d']['intents'] = state._intents.value
 
         await self.call_hooks('before_identify', self.shard_id, initial=self._initial_identify)
-        await self.send_as_json(payload)
+        await self.send_as_json(payload, priority=GatewaySendQueue.CRITICAL)
         _log.info('Shard ID %s has sent the IDENTIFY payload.', self.shard_id)
 
     async def resume(self):
@@ -492,18 +935,15 @@ class DiscordWebSocket:
                 'token': self.token
             }
         }
-        await self.send_as_json(payload)
+        await self.send_as_json(payload, priority=GatewaySendQueue.CRITICAL)
         _log.info('Shard ID %s has sent the RESUME payload.', self.shard_id)
 
     async def received_message(self, msg, /):
         if type(msg) is bytes:
-            self._buffer.extend(msg)
-
-            if len(msg) < 4 or msg[-4:] != b'\x00\x00\xff\xff':
+            # the inflated bytes are parsed as they are, without decoding them to a str first
+            msg = self._decompressor.decompress(msg)
+            if msg is None:
                 return
-            msg = self._zlib.decompress(self._buffer)
-            msg = msg.decode('utf-8')
-            self._buffer = bytearray()
 
         self.log_receive(msg)
         msg = utils._from_json(msg)
@@ -511,6 +951,8 @@ class DiscordWebSocket:
         _log.debug('For Shard ID %s: WebSocket Event: %s', self.shard_id, msg)
         event = msg.get('t')
         if event:
+            counters = self._connection.gateway_events_received
+            counters[event] = counters.get(event, 0) + 1
             self._dispatch('socket_event', event, msg.get('d', dict()))
 
         op = msg.get('op')
@@ -542,14 +984,17 @@ class DiscordWebSocket:
             if op == self.HEARTBEAT:
                 if self._keep_alive:
                     beat = self._keep_alive.get_payload()
-                    await self.send_as_json(beat)
+                    await self.send_as_json(beat, priority=GatewaySendQueue.CRITICAL)
                 return
 
             if op == self.HELLO:
                 interval = data['heartbeat_interval'] / 1000.0
-                self._keep_alive = KeepAliveHandler(ws=self, interval=interval, shard_id=self.shard_id)
+                if self._connection.heartbeat_mode == 'asyncio':
+                    self._keep_alive = AsyncKeepAliveHandler(ws=self, interval=interval, shard_id=self.shard_id)
+                else:
+                    self._keep_alive = KeepAliveHandler(ws=self, interval=interval, shard_id=self.shard_id)
                 # send a heartbeat immediately
-                await self.send_as_json(self._keep_alive.get_payload())
+                await self.send_as_json(self._keep_alive.get_payload(), priority=GatewaySendQueue.CRITICAL)
                 self._keep_alive.start()
                 return
 
@@ -667,23 +1112,27 @@ class DiscordWebSocket:
                 _log.info('Websocket closed with %s, cannot reconnect.', code)
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id, code=code) from None
 
-    async def debug_send(self, data, /):
-        await self._rate_limiter.block()
+    async def debug_send(self, data, /, *, priority=GatewaySendQueue.NORMAL, key=None, payload=None):
         self._dispatch('socket_raw_send', data)
-        await self.socket.send_str(data)
+        await self._send_queue.put(data, priority=priority, key=key, payload=payload)
 
-    async def send(self, data, /):
-        await self._rate_limiter.block()
-        await self.socket.send_str(data)
+    async def send(self, data, /, *, priority=GatewaySendQueue.NORMAL, key=None, payload=None):
+        await self._send_queue.put(data, priority=priority, key=key, payload=payload)
 
-    async def send_as_json(self, data):
+    def _count_sent(self, data, /):
+        counters = self._connection.gateway_payloads_sent
+        op = data.get('op')
+        counters[op] = counters.get(op, 0) + 1
+
+    async def send_as_json(self, data, *, priority=GatewaySendQueue.NORMAL, key=None):
         try:
-            await self.send(utils._to_json(data))
+            await self.send(utils._to_json(data), priority=priority, key=key, payload=data)
         except RuntimeError as exc:
             if not self._can_handle_close():
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id) from exc
 
     async def send_heartbeat(self, data):
+        self._count_sent(data)
         # This bypasses the rate limit handling code since it has a higher priority
         try:
             await self.socket.send_str(utils._to_json(data))
@@ -714,7 +1163,7 @@ class DiscordWebSocket:
 
         sent = utils._to_json(payload)
         _log.debug('Sending "%s" to change status', sent)
-        await self.send(sent)
+        await self.send(sent, key='presence', payload=payload)
 
     async def request_chunks(self, guild_id, query=None, *, limit, user_ids=None, presences=False, nonce=None):
         payload = {
@@ -735,8 +1184,11 @@ class DiscordWebSocket:
         if query is not None:
             payload['d']['query'] = query
 
-
-        await self.send_as_json(payload)
+        # Chunking whole guilds can wait behind anything else we're sending
+        if user_ids or query:
+            await self.send_as_json(payload)
+        else:
+            await self.send_as_json(payload, priority=GatewaySendQueue.BULK)
 
     async def voice_state(self, guild_id, channel_id, self_mute=False, self_deaf=False):
         payload = {
@@ -750,7 +1202,7 @@ class DiscordWebSocket:
         }
 
         _log.debug('Updating our voice state to %s.', payload)
-        await self.send_as_json(payload)
+        await self.send_as_json(payload, priority=GatewaySendQueue.CRITICAL, key=('voice_state', guild_id))
 
     async def close(self, code=4000):
         if self._keep_alive:
@@ -918,7 +1370,10 @@ class DiscordVoiceWebSocket:
             await self.load_secret_key(data)
         elif op == self.HELLO:
             interval = data['heartbeat_interval'] / 1000.0
-            self._keep_alive = VoiceKeepAliveHandler(ws=self, interval=min(interval, 5.0))
+            if self._connection._state.heartbeat_mode == 'asyncio':
+                self._keep_alive = VoiceAsyncKeepAliveHandler(ws=self, interval=min(interval, 5.0))
+            else:
+                self._keep_alive = VoiceKeepAliveHandler(ws=self, interval=min(interval, 5.0))
             self._keep_alive.start()
 
         await self._hook(self, msg)
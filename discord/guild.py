@@ -274,6 +274,7 @@ class Guild(Hashable):
         '_public_updates_channel_id',
         '_stage_instances',
         '_threads',
+        '_permissions_cache',
     )
 
     _PREMIUM_GUILD_LIMITS: ClassVar[Dict[Optional[int], _GuildLimit]] = {
@@ -384,6 +385,18 @@ class Guild(Hashable):
 
         self._roles[role.id] = role
 
+    def _invalidate_permissions(self, *, channel_id: Optional[int] = None, member_id: Optional[int] = None) -> None:
+        # Clears the cached permissions for the given channel and/or member,
+        # or for everything if neither is given
+        if channel_id is None and member_id is None:
+            self._permissions_cache.clear()
+            return
+        if channel_id is not None:
+            self._permissions_cache.pop(channel_id, None)
+        if member_id is not None:
+            for _, channel_cache in self._permissions_cache.values():
+                channel_cache.pop(member_id, None)
+
     def _remove_role(self, role_id: int, /) -> Role:
         # this raises KeyError if it fails..
         role = self._roles.pop(role_id)
@@ -416,6 +429,7 @@ class Guild(Hashable):
         self.unavailable: bool = guild.get('unavailable', False)
         self.id: int = int(guild['id'])
         self._roles: Dict[int, Role] = {}
+        self._permissions_cache: Dict[int, Tuple[List[abc._Overwrites], Dict[int, Tuple[bytes, int]]]] = {}
         state = self._state  # speed up attribute access
         for r in guild.get('roles', []):
             role = Role(guild=self, data=r, state=state)
@@ -26,13 +26,16 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 import json
 import logging
 import sys
 from typing import (
     Any,
+    Callable,
     ClassVar,
     Coroutine,
+    Deque,
     Dict,
     Iterable,
     List,
@@ -40,12 +43,10 @@ from typing import (
     Sequence,
     TYPE_CHECKING,
     Tuple,
-    Type,
     TypeVar,
     Union,
 )
 from urllib.parse import quote as _uriquote
-import weakref
 
 import aiohttp
 
@@ -90,11 +91,7 @@ if TYPE_CHECKING:
     )
     from .types.snowflake import Snowflake, SnowflakeList
 
-    from types import TracebackType
-
     T = TypeVar('T')
-    BE = TypeVar('BE', bound=BaseException)
-    MU = TypeVar('MU', bound='MaybeUnlock')
     Response = Coroutine[Any, Any, T]
 
 
@@ -132,26 +129,351 @@ class Route:
         # the bucket is just method + path w/ major parameters
         return f'{self.channel_id}:{self.guild_id}:{self.path}'
 
+    @property
+    def key(self) -> str:
+        # the key that Discord's bucket hashes are learned against
+        return f'{self.method} {self.path}'
+
+    @property
+    def major_parameters(self) -> str:
+        return f'{self.channel_id}:{self.guild_id}:{self.webhook_id}:{self.webhook_token}'
+
+
+class RequestInfo:
+    """
+    Structured information about a single HTTP request attempt, as given to
+    the hooks registered with :meth:`HTTPClient.add_request_hook`.
+
+    A hook is called once per attempt, so a request that's retried after a
+    429 or a server error is reported multiple times with an increasing
+    :attr:`retries`.
+
+    .. versionadded:: 0.2.5
+
+    Attributes
+    -----------
+    route: :class:`Route`
+        The route that was requested.
+    status: Optional[:class:`int`]
+        The status code that Discord returned, or ``None`` if the request
+        failed before a response was received.
+    bucket: :class:`str`
+        The rate limit bucket that the request was made under.
+    retries: :class:`int`
+        How many times this request had already been attempted.
+    latency: :class:`float`
+        How long the attempt took, in seconds, excluding any time spent
+        waiting on rate limits.
+    """
+
+    __slots__ = ('route', 'status', 'bucket', 'retries', 'latency')
+
+    def __init__(self, route: Route, status: Optional[int], bucket: str, retries: int, latency: float) -> None:
+        self.route: Route = route
+        self.status: Optional[int] = status
+        self.bucket: str = bucket
+        self.retries: int = retries
+        self.latency: float = latency
+
+    def __repr__(self) -> str:
+        return (
+            f'<RequestInfo method={self.method!r} path={self.path!r} status={self.status} '
+            f'retries={self.retries} latency={self.latency:.3f}>'
+        )
+
+    @property
+    def method(self) -> str:
+        """:class:`str`: The HTTP method of the request."""
+        return self.route.method
 
-class MaybeUnlock:
-    def __init__(self, lock: asyncio.Lock) -> None:
-        self.lock: asyncio.Lock = lock
-        self._unlock: bool = True
+    @property
+    def path(self) -> str:
+        """:class:`str`: The route template of the request, without its parameters filled in."""
+        return self.route.path
 
-    def __enter__(self: MU) -> MU:
-        return self
 
-    def defer(self) -> None:
-        self._unlock = False
+RequestHook = Callable[[RequestInfo], Any]
 
-    def __exit__(
-        self,
-        exc_type: Optional[Type[BE]],
-        exc: Optional[BE],
-        traceback: Optional[TracebackType],
-    ) -> None:
-        if self._unlock:
-            self.lock.release()
+
+def _call_request_hooks(hooks: List[RequestHook], info: RequestInfo) -> None:
+    for hook in hooks:
+        try:
+            hook(info)
+        except Exception:
+            _log.exception('Ignoring exception in request hook %r', hook)
+
+
+class RateLimit:
+    """
+    Tracks the request budget of a single Discord rate limit bucket.
+
+    Requests take a slot from :attr:`remaining` before they're sent and
+    give it back (or have it replaced by the value from the response headers)
+    once they complete, so that up to ``remaining`` requests can be in flight
+    against the same bucket at once. Until the first response comes back the
+    bucket's limit is unknown, so only a single request is let through.
+    """
+
+    __slots__ = ('loop', 'limit', 'remaining', 'outgoing', 'reset_at', '_waiters', '_wakeup')
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop: asyncio.AbstractEventLoop = loop
+        self.limit: int = 1
+        self.remaining: int = 1
+        self.outgoing: int = 0
+        self.reset_at: float = 0.0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    def __repr__(self) -> str:
+        return f'<RateLimit limit={self.limit} remaining={self.remaining} outgoing={self.outgoing}>'
+
+    def is_idle(self) -> bool:
+        """Whether the bucket has no requests in flight, nobody waiting on it, and no active reset window."""
+
+        return self.outgoing == 0 and not self._waiters and self.loop.time() >= self.reset_at
+
+    def _refill(self) -> None:
+        if self.remaining <= 0 and self.loop.time() >= self.reset_at:
+            self.remaining = max(self.limit - self.outgoing, 0)
+
+    def _wake(self) -> None:
+        self._wakeup = None
+        self._refill()
+
+        # Hand the free slots straight to whoever is waiting
+        while self._waiters and self.remaining > 0:
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self.remaining -= 1
+            self.outgoing += 1
+            future.set_result(None)
+
+        # If people are still waiting then the bucket's depleted - come back when it resets
+        if self._waiters and self._wakeup is None and self.outgoing == 0:
+            self._wakeup = self.loop.call_at(max(self.reset_at, self.loop.time()), self._wake)
+
+    async def acquire(self) -> None:
+        """
+        Wait for a free slot in the bucket and take it.
+        """
+
+        self._refill()
+        if self.remaining > 0 and not self._waiters:
+            self.remaining -= 1
+            self.outgoing += 1
+            return
+
+        future: asyncio.Future[None] = self.loop.create_future()
+        self._waiters.append(future)
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # We were given a slot but we're not going to use it
+                self.remaining += 1
+                self.outgoing -= 1
+                self._wake()
+            raise
+
+    def update(self, response: aiohttp.ClientResponse, *, use_clock: bool = False) -> bool:
+        """
+        Update the bucket from a response's rate limit headers. Returns whether
+        the response had any headers to update from.
+        """
+
+        headers = response.headers
+        remaining = headers.get('X-Ratelimit-Remaining')
+        if remaining is None:
+            return False
+
+        try:
+            self.limit = int(headers['X-Ratelimit-Limit'])
+        except (KeyError, ValueError):
+            pass
+        reset_after = utils._parse_ratelimit_header(response, use_clock=use_clock)
+        self.reset_at = self.loop.time() + reset_after
+
+        # Anything else still in flight will have taken from the budget too
+        self.remaining = max(int(remaining) - (self.outgoing - 1), 0)
+        return True
+
+    def delay(self, retry_after: float) -> None:
+        """
+        Mark the bucket as depleted for at least the next ``retry_after`` seconds.
+        """
+
+        self.remaining = 0
+        self.reset_at = max(self.reset_at, self.loop.time() + retry_after)
+
+    def release(self, *, updated: bool = False) -> None:
+        """
+        Give back the slot taken by :meth:`acquire`. If the bucket wasn't
+        :meth:`updated <update>` from the response then the slot is returned
+        to the budget as-is.
+        """
+
+        self.outgoing -= 1
+        if not updated:
+            self.remaining += 1
+        self._wake()
+
+
+class RateLimitBackend:
+    """
+    The base class for where an :class:`HTTPClient` keeps its rate limit state.
+
+    The default, :class:`MemoryRateLimitBackend`, keeps everything inside of
+    the current process. Subclasses can share some or all of that state with
+    other processes (for example, clusters sharing the same token) by overriding
+    these methods.
+    """
+
+    async def acquire(self, route: Route) -> Tuple[str, RateLimit]:
+        """
+        Wait until a request can be made for the given route, and take a
+        slot from its bucket.
+
+        Returns the bucket key and the rate limit that the slot was taken from,
+        which are then passed back into the other methods.
+        """
+
+        raise NotImplementedError()
+
+    async def update(
+            self,
+            route: Route,
+            bucket: str,
+            ratelimit: RateLimit,
+            response: aiohttp.ClientResponse,
+            *,
+            use_clock: bool = False) -> Tuple[str, bool]:
+        """
+        Update the rate limit state from a response.
+
+        Returns the (possibly newly learned) bucket key for the route, and
+        whether the response had any rate limit headers to update from.
+        """
+
+        raise NotImplementedError()
+
+    async def release(self, bucket: str, ratelimit: RateLimit, *, updated: bool = False) -> None:
+        """
+        Give back a slot taken by :meth:`acquire`.
+        """
+
+        raise NotImplementedError()
+
+    async def delay(self, bucket: str, ratelimit: RateLimit, retry_after: float) -> None:
+        """
+        Mark a bucket as depleted for at least ``retry_after`` seconds.
+        """
+
+        raise NotImplementedError()
+
+    async def wait_global(self) -> None:
+        """
+        Wait until any global rate limit is over.
+        """
+
+        raise NotImplementedError()
+
+    async def set_global(self, retry_after: float) -> None:
+        """
+        Stop any requests from being made for the next ``retry_after`` seconds.
+        """
+
+        raise NotImplementedError()
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    A rate limit backend that keeps all of its state in the current process.
+    This is the default for :class:`HTTPClient`.
+    """
+
+    def __init__(self, *, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop() if loop is None else loop
+        self._buckets: Dict[str, RateLimit] = {}
+        self._bucket_hashes: Dict[str, str] = {}
+        self._bucket_prune_size: int = 1024
+        self._global_over: asyncio.Event = asyncio.Event()
+        self._global_over.set()
+
+    async def get_bucket_hash(self, route: Route) -> Optional[str]:
+        return self._bucket_hashes.get(route.key)
+
+    async def set_bucket_hash(self, route: Route, bucket_hash: str) -> None:
+        self._bucket_hashes[route.key] = bucket_hash
+
+    async def acquire(self, route: Route) -> Tuple[str, RateLimit]:
+        # Routes whose bucket hash we don't know yet are keyed by the
+        # method and route itself until Discord tells us otherwise
+        bucket_hash = await self.get_bucket_hash(route)
+        if bucket_hash is None:
+            bucket = f'{route.key}:{route.major_parameters}'
+        else:
+            bucket = f'{bucket_hash}:{route.major_parameters}'
+        try:
+            ratelimit = self._buckets[bucket]
+        except KeyError:
+            if len(self._buckets) >= self._bucket_prune_size:
+                self._prune_buckets()
+            self._buckets[bucket] = ratelimit = RateLimit(self.loop)
+        await ratelimit.acquire()
+
+        # The bucket hash may have been learned while we were waiting
+        if bucket_hash is None:
+            bucket_hash = self._bucket_hashes.get(route.key)
+            if bucket_hash is not None:
+                bucket = f'{bucket_hash}:{route.major_parameters}'
+        return bucket, ratelimit
+
+    async def update(
+            self,
+            route: Route,
+            bucket: str,
+            ratelimit: RateLimit,
+            response: aiohttp.ClientResponse,
+            *,
+            use_clock: bool = False) -> Tuple[str, bool]:
+        bucket_hash = response.headers.get('X-Ratelimit-Bucket')
+        if bucket_hash is not None:
+            await self.set_bucket_hash(route, bucket_hash)
+            new_bucket = f'{bucket_hash}:{route.major_parameters}'
+            if new_bucket != bucket:
+                # Move the rate limit that was being used for the route over
+                # to its real key, unless it's already shared with another route
+                self._buckets.setdefault(new_bucket, ratelimit)
+                bucket = new_bucket
+        return bucket, ratelimit.update(response, use_clock=use_clock)
+
+    async def release(self, bucket: str, ratelimit: RateLimit, *, updated: bool = False) -> None:
+        ratelimit.release(updated=updated)
+
+    async def delay(self, bucket: str, ratelimit: RateLimit, retry_after: float) -> None:
+        ratelimit.delay(retry_after)
+
+    async def wait_global(self) -> None:
+        if not self._global_over.is_set():
+            await self._global_over.wait()
+
+    async def set_global(self, retry_after: float) -> None:
+        if not self._global_over.is_set():
+            return
+        self._global_over.clear()
+        self.loop.call_later(retry_after, self._global_over.set)
+
+    def _prune_buckets(self) -> None:
+        """
+        Remove any rate limits that aren't doing anything so that the
+        bucket cache doesn't grow forever.
+        """
+
+        self._buckets = {k: v for k, v in self._buckets.items() if not v.is_idle()}
+        self._bucket_prune_size = max(1024, len(self._buckets) * 2)
 
 
 # For some reason, the Discord voice websocket expects this header to be
@@ -170,18 +492,18 @@ class HTTPClient:
         proxy_auth: Optional[aiohttp.BasicAuth] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
         unsync_clock: bool = True,
+        ratelimiter: Optional[RateLimitBackend] = None,
     ) -> None:
         self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop() if loop is None else loop
         self.connector = connector
         self.__session: aiohttp.ClientSession = MISSING  # filled in static_login
-        self._locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
-        self._global_over: asyncio.Event = asyncio.Event()
-        self._global_over.set()
+        self.ratelimiter: RateLimitBackend = ratelimiter or MemoryRateLimitBackend(loop=self.loop)
         self.token: Optional[str] = None
         self.bot_token: bool = False
         self.proxy: Optional[str] = proxy
         self.proxy_auth: Optional[aiohttp.BasicAuth] = proxy_auth
         self.use_clock: bool = not unsync_clock
+        self.request_hooks: List[RequestHook] = []
 
         user_agent = 'DiscordBot (https://github.com/Voxel-Fox-Ltd/Novus {0}) Python/{1[0]}.{1[1]} aiohttp/{2}'
         self.user_agent: str = user_agent.format(__version__, sys.version_info, aiohttp.__version__)
@@ -193,6 +515,38 @@ class HTTPClient:
                 ws_response_class=DiscordClientWebSocketResponse
             )
 
+    def add_request_hook(self, hook: RequestHook) -> None:
+        """
+        Add a hook that's called with a :class:`RequestInfo` after every
+        request attempt made through this client.
+
+        Hooks are called synchronously in the request path, so anything
+        expensive should be scheduled elsewhere rather than done inline.
+        Exceptions raised by a hook are logged and ignored.
+
+        .. versionadded:: 0.2.5
+
+        Parameters
+        -----------
+        hook: Callable[[:class:`RequestInfo`], Any]
+            The hook to add.
+        """
+
+        self.request_hooks.append(hook)
+
+    def remove_request_hook(self, hook: RequestHook) -> None:
+        """
+        Remove a hook previously added with :meth:`add_request_hook`. If the
+        hook isn't registered then nothing happens.
+
+        .. versionadded:: 0.2.5
+        """
+
+        try:
+            self.request_hooks.remove(hook)
+        except ValueError:
+            pass
+
     async def ws_connect(self, url: str, *, compress: int = 0) -> aiohttp.ClientWebSocketResponse:
         kwargs = {
             'proxy_auth': self.proxy_auth,
@@ -214,16 +568,9 @@ class HTTPClient:
             files: Optional[Sequence[File]] = None,
             form: Optional[Iterable[Dict[str, Any]]] = None,
             **kwargs: Any) -> Any:
-        bucket = route.bucket
         method = route.method
         url = route.url
 
-        lock = self._locks.get(bucket)
-        if lock is None:
-            lock = asyncio.Lock()
-            if bucket is not None:
-                self._locks[bucket] = lock
-
         # header creation
         headers: Dict[str, str] = {
             'User-Agent': self.user_agent,
@@ -252,106 +599,110 @@ class HTTPClient:
         if self.proxy_auth is not None:
             kwargs['proxy_auth'] = self.proxy_auth
 
-        if not self._global_over.is_set():
-            # wait until the global lock is complete
-            await self._global_over.wait()
-
         response: Optional[aiohttp.ClientResponse] = None
         data: Optional[Union[Dict[str, Any], str]] = None
-        await lock.acquire()
-        with MaybeUnlock(lock) as maybe_lock:
-            for tries in range(5):
-                if files:
-                    for f in files:
-                        f.reset(seek=tries)
-
-                if form:
-                    form_data = aiohttp.FormData()
-                    for params in form:
-                        form_data.add_field(**params)
-                    kwargs['data'] = form_data
-
-                try:
-                    async with self.__session.request(method, url, **kwargs) as response:
-                        _log.debug('%s %s with %s has returned %s', method, url, kwargs.get('data'), response.status)
-
-                        # even errors have text involved in them so this is safe to call
-                        data = await json_or_text(response)
-
-                        # check if we have rate limit header information
-                        remaining = response.headers.get('X-Ratelimit-Remaining')
-                        if remaining == '0' and response.status != 429:
-                            # we've depleted our current bucket
-                            delta = utils._parse_ratelimit_header(response, use_clock=self.use_clock)
-                            _log.debug('A rate limit bucket has been exhausted (bucket: %s, retry: %s).', bucket, delta)
-                            maybe_lock.defer()
-                            self.loop.call_later(delta, lock.release)
-
-                        # the request was successful so just return the text/json
-                        if 300 > response.status >= 200:
-                            _log.debug('%s %s has received %s', method, url, data)
-                            return data
-
-                        # we are being rate limited
-                        if response.status == 429:
-                            if not response.headers.get('Via') or isinstance(data, str):
-                                # Banned by Cloudflare more than likely.
-                                raise HTTPException(response, data)
-
-                            fmt = 'We are being rate limited. Retrying in %.2f seconds. Handled under the bucket "%s"'
-
-                            # sleep a bit
-                            retry_after: float = data['retry_after']
-                            _log.warning(fmt, retry_after, bucket)
-
-                            # check if it's a global rate limit
-                            is_global = data.get('global', False)
-                            if is_global:
-                                _log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
-                                self._global_over.clear()
-
-                            await asyncio.sleep(retry_after)
-                            _log.debug('Done sleeping for the rate limit. Retrying...')
-
-                            # release the global lock now that the
-                            # global rate limit has passed
-                            if is_global:
-                                self._global_over.set()
-                                _log.debug('Global rate limit is now over.')
-
-                            continue
-
-                        # we've received a 500, 502, or 504, unconditional retry
-                        if response.status in {500, 502, 504}:
-                            await asyncio.sleep(1 + tries * 2)
-                            continue
-
-                        # the usual error cases
-                        if response.status == 403:
-                            raise Forbidden(response, data)
-                        elif response.status == 404:
-                            raise NotFound(response, data)
-                        elif response.status >= 500:
-                            raise DiscordServerError(response, data)
-                        else:
+        for tries in range(5):
+            if files:
+                for f in files:
+                    f.reset(seek=tries)
+
+            if form:
+                form_data = aiohttp.FormData()
+                for params in form:
+                    form_data.add_field(**params)
+                kwargs['data'] = form_data
+
+            # wait until any global rate limit is over, and then for a slot in the bucket
+            await self.ratelimiter.wait_global()
+            bucket, ratelimit = await self.ratelimiter.acquire(route)
+            updated = False
+            status: Optional[int] = None
+            started = self.loop.time()
+            finished: Optional[float] = None
+            try:
+                async with self.__session.request(method, url, **kwargs) as response:
+                    status = response.status
+                    _log.debug('%s %s with %s has returned %s', method, url, kwargs.get('data'), response.status)
+
+                    # even errors have text involved in them so this is safe to call
+                    data = await json_or_text(response)
+                    finished = self.loop.time()
+
+                    # check if we have rate limit header information
+                    bucket, updated = await self.ratelimiter.update(
+                        route, bucket, ratelimit, response, use_clock=self.use_clock,
+                    )
+                    if updated and ratelimit.remaining == 0 and response.status != 429:
+                        # we've depleted our current bucket
+                        _log.debug(
+                            'A rate limit bucket has been exhausted (bucket: %s, retry: %s).',
+                            bucket, ratelimit.reset_at - self.loop.time(),
+                        )
+
+                    # the request was successful so just return the text/json
+                    if 300 > response.status >= 200:
+                        _log.debug('%s %s has received %s', method, url, data)
+                        return data
+
+                    # we are being rate limited
+                    if response.status == 429:
+                        if not response.headers.get('Via') or isinstance(data, str):
+                            # Banned by Cloudflare more than likely.
                             raise HTTPException(response, data)
 
-                # This is handling exceptions from the request
-                except OSError as e:
-                    # Connection reset by peer
-                    if tries < 4 and e.errno in (54, 10054):
-                        await asyncio.sleep(1 + tries * 2)
-                        continue
-                    raise
+                        fmt = 'We are being rate limited. Retrying in %.2f seconds. Handled under the bucket "%s"'
 
-            if response is not None:
-                # We've run out of retries, raise.
-                if response.status >= 500:
-                    raise DiscordServerError(response, data)
+                        retry_after: float = data['retry_after']
+                        _log.warning(fmt, retry_after, bucket)
 
-                raise HTTPException(response, data)
+                        # check if it's a global rate limit
+                        is_global = data.get('global', False)
+                        if is_global:
+                            _log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
+                            await self.ratelimiter.set_global(retry_after)
+                        else:
+                            await self.ratelimiter.delay(bucket, ratelimit, retry_after)
 
-            raise RuntimeError('Unreachable code in HTTP handling')
+                        # the retry will wait until the rate limit is over
+                        continue
+
+                    # we've received a 500, 502, or 504, unconditional retry
+                    if response.status in {500, 502, 504}:
+                        await asyncio.sleep(1 + tries * 2)
+                        continue
+
+                    # the usual error cases
+                    if response.status == 403:
+                        raise Forbidden(response, data)
+                    elif response.status == 404:
+                        raise NotFound(response, data)
+                    elif response.status >= 500:
+                        raise DiscordServerError(response, data)
+                    else:
+                        raise HTTPException(response, data)
+
+            # This is handling exceptions from the request
+            except OSError as e:
+                # Connection reset by peer
+                if tries < 4 and e.errno in (54, 10054):
+                    await asyncio.sleep(1 + tries * 2)
+                    continue
+                raise
+
+            finally:
+                await self.ratelimiter.release(bucket, ratelimit, updated=updated)
+                if self.request_hooks:
+                    info = RequestInfo(route, status, bucket, tries, (finished or self.loop.time()) - started)
+                    _call_request_hooks(self.request_hooks, info)
+
+        if response is not None:
+            # We've run out of retries, raise.
+            if response.status >= 500:
+                raise DiscordServerError(response, data)
+
+            raise HTTPException(response, data)
+
+        raise RuntimeError('Unreachable code in HTTP handling')
 
     async def get_from_cdn(self, url: str) -> bytes:
         async with self.__session.get(url) as resp:
@@ -1967,6 +2318,11 @@ class HTTPClient:
         return value.format(data['url'], encoding)
 
     async def get_bot_gateway(self, *, encoding: str = 'json', zlib: bool = True) -> Tuple[int, str]:
+        shards, gateway, _ = await self.get_bot_gateway_info(encoding=encoding, zlib=zlib)
+        return shards, gateway
+
+    async def get_bot_gateway_info(self, *, encoding: str = 'json', zlib: bool = True) -> Tuple[int, str, int]:
+        # returns the recommended shard count, the gateway URL, and the max_concurrency of the session start limit
         try:
             data = await self.request(Route('GET', '/gateway/bot'))
         except HTTPException as exc:
@@ -1976,7 +2332,8 @@ class HTTPClient:
             value = '{0}?encoding={1}&v=9&compress=zlib-stream'
         else:
             value = '{0}?encoding={1}&v=9'
-        return data['shards'], value.format(data['url'], encoding)
+        max_concurrency = data.get('session_start_limit', {}).get('max_concurrency', 1)
+        return data['shards'], value.format(data['url'], encoding), max_concurrency
 
     def get_user(self, user_id: Snowflake) -> Response[user.User]:
         return self.request(Route('GET', '/users/{user_id}', user_id=user_id))
@@ -1322,12 +1322,52 @@ class HTTPInteractionResponse(InteractionResponse):
         '_parent',
         '_aiohttp_request',
         '_aiohttp_response',
+        '_written',
     )
 
     def __init__(self, aiohttp_response: web.Request, parent: Interaction):
         super().__init__(parent)
         self._aiohttp_request: web.Request = aiohttp_response
         self._aiohttp_response: web.StreamResponse = web.StreamResponse()
+        self._written: asyncio.Future[None] = asyncio.get_event_loop().create_future()
+
+    async def _write_response(self, data: bytes, *, headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Write the given data as the body of the HTTP response, and let
+        whoever is waiting for the response know that it's been written.
+        """
+
+        if headers is None:
+            self._aiohttp_response.headers["Content-Type"] = "application/json"
+        else:
+            self._aiohttp_response.headers.update(headers)
+        try:
+            await self._aiohttp_response.prepare(self._aiohttp_request)
+            await self._aiohttp_response.write(data)
+            await self._aiohttp_response.write_eof()
+        finally:
+            if not self._written.done():
+                self._written.set_result(None)
+
+    async def wait_until_written(self, timeout: Optional[float] = None) -> bool:
+        """
+        |coro|
+
+        Wait until a response has been written back to the HTTP request.
+
+        Parameters
+        -----------
+        timeout: Optional[:class:`float`]
+            The maximum number of seconds to wait for.
+
+        Returns
+        --------
+        :class:`bool`
+            Whether or not the response was written within the timeout.
+        """
+
+        await asyncio.wait((self._written,), timeout=timeout)
+        return self._written.done()
 
     async def defer(self, *, ephemeral: bool = False) -> None:
         """
@@ -1366,10 +1406,7 @@ class HTTPInteractionResponse(InteractionResponse):
             payload = {"type": defer_type}
             if data:
                 payload["data"] = data
-            self._aiohttp_response.headers["Content-Type"] = "application/json"
-            await self._aiohttp_response.prepare(self._aiohttp_request)
-            await self._aiohttp_response.write(json.dumps(payload).encode())
-            await self._aiohttp_response.write_eof()
+            await self._write_response(json.dumps(payload).encode())
             self._responded = True
 
     async def defer_update(self) -> None:
@@ -1400,10 +1437,7 @@ class HTTPInteractionResponse(InteractionResponse):
 
         if defer_type:
             payload = {"type": defer_type}
-            self._aiohttp_response.headers["Content-Type"] = "application/json"
-            await self._aiohttp_response.prepare(self._aiohttp_request)
-            await self._aiohttp_response.write(json.dumps(payload).encode())
-            await self._aiohttp_response.write_eof()
+            await self._write_response(json.dumps(payload).encode())
             self._responded = True
 
     async def pong(self) -> None:
@@ -1428,10 +1462,7 @@ class HTTPInteractionResponse(InteractionResponse):
         parent = self._parent
         if parent.type is InteractionType.ping:
             payload = {"type": InteractionResponseType.pong.value}
-            self._aiohttp_response.headers["Content-Type"] = "application/json"
-            await self._aiohttp_response.prepare(self._aiohttp_request)
-            await self._aiohttp_response.write(json.dumps(payload).encode())
-            await self._aiohttp_response.write_eof()
+            await self._write_response(json.dumps(payload).encode())
             self._responded = True
 
     async def send_message(
@@ -1531,10 +1562,7 @@ class HTTPInteractionResponse(InteractionResponse):
         if not to_send:
             raise AssertionError
 
-        self._aiohttp_response.headers.update(headers)
-        await self._aiohttp_response.prepare(self._aiohttp_request)
-        await self._aiohttp_response.write(to_send)
-        await self._aiohttp_response.write_eof()
+        await self._write_response(to_send, headers=headers)
 
         self._responded = True
 
@@ -1572,10 +1600,7 @@ class HTTPInteractionResponse(InteractionResponse):
             },
         }
 
-        self._aiohttp_response.headers["Content-Type"] = "application/json"
-        await self._aiohttp_response.prepare(self._aiohttp_request)
-        await self._aiohttp_response.write(json.dumps(payload).encode())
-        await self._aiohttp_response.write_eof()
+        await self._write_response(json.dumps(payload).encode())
 
         self._responded = True
 
@@ -1611,10 +1636,7 @@ class HTTPInteractionResponse(InteractionResponse):
             "data": modal.to_dict(),
         }
 
-        self._aiohttp_response.headers["Content-Type"] = "application/json"
-        await self._aiohttp_response.prepare(self._aiohttp_request)
-        await self._aiohttp_response.write(json.dumps(payload).encode())
-        await self._aiohttp_response.write_eof()
+        await self._write_response(json.dumps(payload).encode())
 
         self._responded = True
 
@@ -1723,10 +1745,7 @@ class HTTPInteractionResponse(InteractionResponse):
             "type": InteractionResponseType.message_update.value,
             "data": payload,
         }
-        self._aiohttp_response.headers["Content-Type"] = "application/json"
-        await self._aiohttp_response.prepare(self._aiohttp_request)
-        await self._aiohttp_response.write(json.dumps(data).encode())
-        await self._aiohttp_response.write_eof()
+        await self._write_response(json.dumps(data).encode())
 
         self._responded = True
 
@@ -0,0 +1,155 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Optional, TypedDict
+
+
+__all__ = (
+    'SessionStore',
+    'FileSessionStore',
+)
+
+
+class GatewaySession(TypedDict):
+    session_id: str
+    sequence: Optional[int]
+    resume_url: Optional[str]
+    shard_count: Optional[int]
+    saved_at: float
+
+
+class SessionStore:
+    """
+    The base class for where a :class:`Client` keeps its gateway sessions between
+    restarts, so that its shards can RESUME rather than IDENTIFY when it starts
+    back up.
+
+    Sessions are saved for each shard when the client is closed, and are loaded
+    (and removed) when that shard next connects. If Discord has already invalidated
+    the session then the shard falls back to identifying as normal.
+
+    .. versionadded:: 0.2.5
+
+    Parameters
+    -----------
+    max_age: :class:`float`
+        How long a saved session can be used for, in seconds. Discord only keeps
+        sessions open for a short time after their connection is closed, so older
+        sessions are ignored rather than spending a connection on a failed RESUME.
+    """
+
+    def __init__(self, *, max_age: float = 120.0) -> None:
+        self.max_age: float = max_age
+
+    def is_fresh(self, session: GatewaySession) -> bool:
+        """Whether the given session was saved recently enough to be resumed."""
+        return time.time() - session.get('saved_at', 0) <= self.max_age
+
+    async def load(self, shard_id: Optional[int]) -> Optional[GatewaySession]:
+        """|coro|
+
+        Get the session saved for the given shard, if there is one that
+        hasn't expired.
+        """
+
+        raise NotImplementedError()
+
+    async def save(self, shard_id: Optional[int], session: GatewaySession) -> None:
+        """|coro|
+
+        Save the session for the given shard, replacing any that was there before.
+        """
+
+        raise NotImplementedError()
+
+    async def delete(self, shard_id: Optional[int]) -> None:
+        """|coro|
+
+        Remove the session saved for the given shard, if there is one.
+        """
+
+        raise NotImplementedError()
+
+
+class FileSessionStore(SessionStore):
+    """
+    A :class:`SessionStore` that keeps the sessions for every shard in a
+    single JSON file. This is suitable for a process that's restarted on
+    the same machine.
+
+    .. versionadded:: 0.2.5
+
+    Parameters
+    -----------
+    path: :class:`str`
+        The file to store the sessions in. It's created if it doesn't exist.
+    max_age: :class:`float`
+        How long a saved session can be used for, in seconds.
+    """
+
+    def __init__(self, path: str, *, max_age: float = 120.0) -> None:
+        super().__init__(max_age=max_age)
+        self.path: str = path
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path) as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        # write to a temporary file first so a crash never leaves a half-written store
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as fp:
+            json.dump(data, fp)
+        os.replace(temp_path, self.path)
+
+    async def load(self, shard_id: Optional[int]) -> Optional[GatewaySession]:
+        async with self._lock:
+            session = self._read().get(str(shard_id))
+        if session is None or not self.is_fresh(session):
+            return None
+        return session
+
+    async def save(self, shard_id: Optional[int], session: GatewaySession) -> None:
+        async with self._lock:
+            data = self._read()
+            data[str(shard_id)] = session
+            # drop anything that couldn't be resumed anyway
+            data = {i: o for i, o in data.items() if self.is_fresh(o)}
+            self._write(data)
+
+    async def delete(self, shard_id: Optional[int]) -> None:
+        async with self._lock:
+            data = self._read()
+            if data.pop(str(shard_id), None) is not None:
+                self._write(data)
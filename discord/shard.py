@@ -25,6 +25,7 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
 
 import aiohttp
@@ -102,6 +103,7 @@ class Shard:
         self._reconnect = client._reconnect
         self._backoff: ExponentialBackoff = ExponentialBackoff()
         self._task: Optional[asyncio.Task] = None
+        self.connect_time: Optional[float] = None
         self._handled_exceptions: Tuple[Type[Exception], ...] = (
             OSError,
             HTTPException,
@@ -123,9 +125,9 @@ class Shard:
         if self._task is not None and not self._task.done():
             self._task.cancel()
 
-    async def close(self) -> None:
+    async def close(self, *, code: int = 1000) -> None:
         self._cancel_task()
-        await self.ws.close(code=1000)
+        await self.ws.close(code=code)
 
     async def disconnect(self) -> None:
         await self.close()
@@ -182,6 +184,7 @@ class Shard:
         self._dispatch('disconnect')
         self._dispatch('shard_disconnect', self.id)
         _log.info('Got a request to %s the websocket at Shard ID %s.', exc.op, self.id)
+        started = self.loop.time()
         try:
             coro = DiscordWebSocket.from_client(
                 self._client,
@@ -199,10 +202,12 @@ class Shard:
         except Exception as e:
             self._queue_put(EventItem(EventType.terminate, self, e))
         else:
+            self.connect_time = self.loop.time() - started
             self.launch()
 
     async def reconnect(self) -> None:
         self._cancel_task()
+        started = self.loop.time()
         try:
             coro = DiscordWebSocket.from_client(self._client, shard_id=self.id)
             self.ws = await asyncio.wait_for(coro, timeout=60.0)
@@ -213,6 +218,7 @@ class Shard:
         except Exception as e:
             self._queue_put(EventItem(EventType.terminate, self, e))
         else:
+            self.connect_time = self.loop.time() - started
             self.launch()
 
 
@@ -278,6 +284,15 @@ class ShardInfo:
         """:class:`float`: Measures latency between a HEARTBEAT and a HEARTBEAT_ACK in seconds for this shard."""
         return self._parent.ws.latency
 
+    @property
+    def connect_time(self) -> Optional[float]:
+        """Optional[:class:`float`]: How long, in seconds, this shard's most recent connection
+        took to be established, including any time spent waiting to IDENTIFY.
+
+        .. versionadded:: 0.2.5
+        """
+        return self._parent.connect_time
+
     def is_ws_ratelimited(self) -> bool:
         """:class:`bool`: Whether the websocket is currently rate limited.
 
@@ -386,8 +401,11 @@ class AutoShardedClient(Client):
         return {shard_id: ShardInfo(parent, self.shard_count) for shard_id, parent in self.__shards.items()}
 
     async def launch_shard(self, gateway: str, shard_id: int, *, initial: bool = False) -> None:
+        started = self.loop.time()
+        ws_params = {'initial': initial, 'gateway': gateway}
+        ws_params.update(await self._load_gateway_session(shard_id) or {})
         try:
-            coro = DiscordWebSocket.from_client(self, initial=initial, gateway=gateway, shard_id=shard_id)
+            coro = DiscordWebSocket.from_client(self, shard_id=shard_id, **ws_params)
             ws = await asyncio.wait_for(coro, timeout=180.0)
         except Exception:
             _log.exception('Failed to connect for shard_id: %s. Retrying...', shard_id)
@@ -396,22 +414,39 @@ class AutoShardedClient(Client):
 
         # keep reading the shard while others connect
         self.__shards[shard_id] = ret = Shard(ws, self, self.__queue.put_nowait)
+        ret.connect_time = self.loop.time() - started
+        _log.info('Shard ID %s connected in %.2f seconds.', shard_id, ret.connect_time)
         ret.launch()
 
     async def launch_shards(self) -> None:
+        shard_count, gateway, max_concurrency = await self.http.get_bot_gateway_info()
         if self.shard_count is None:
-            self.shard_count, gateway = await self.http.get_bot_gateway()
-        else:
-            gateway = await self.http.get_gateway()
+            self.shard_count = shard_count
 
         self._connection.shard_count = self.shard_count
 
         shard_ids = self.shard_ids or range(self.shard_count)
         self._connection.shard_ids = shard_ids
 
+        # Discord lets one shard from each of the max_concurrency rate limit
+        # buckets identify every 5 seconds, so launch the shards in rounds that
+        # take one shard from every bucket. The rounds are spaced out by the
+        # before_identify hook, the same as when shards connect one by one.
+        buckets: Dict[int, List[int]] = {}
         for shard_id in shard_ids:
-            initial = shard_id == shard_ids[0]
-            await self.launch_shard(gateway, shard_id, initial=initial)
+            buckets.setdefault(shard_id % max_concurrency, []).append(shard_id)
+        rounds = itertools.zip_longest(*buckets.values())
+
+        _log.info(
+            'Launching %s shards in %s rounds with a max_concurrency of %s.',
+            len(shard_ids), max((len(i) for i in buckets.values()), default=0), max_concurrency,
+        )
+        for index, shard_round in enumerate(rounds):
+            await asyncio.gather(*(
+                self.launch_shard(gateway, shard_id, initial=index == 0)
+                for shard_id in shard_round
+                if shard_id is not None
+            ))
 
         self._connection.shards_launched.set()
 
@@ -455,13 +490,24 @@ class AutoShardedClient(Client):
             except Exception:
                 pass
 
-        to_close = [asyncio.ensure_future(shard.close(), loop=self.loop) for shard in self.__shards.values()]
+        to_close = [asyncio.ensure_future(self._close_shard(shard), loop=self.loop) for shard in self.__shards.values()]
         if to_close:
             await asyncio.wait(to_close)
 
+        await self._write_cache_snapshot()
+
         await self.http.close()
         self.__queue.put_nowait(EventItem(EventType.clean_close, None, None))
 
+    @property
+    def _snapshot_shard_ids(self) -> Optional[List[int]]:
+        return None if self.shard_ids is None else list(self.shard_ids)
+
+    async def _close_shard(self, shard: Shard) -> None:
+        # closing with 1000 invalidates the session, so use a different code if it's been saved
+        saved = await self._save_gateway_session(shard.ws)
+        await shard.close(code=4000 if saved else 1000)
+
     async def change_presence(
         self,
         *,
@@ -0,0 +1,353 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+# Snapshots of the guild cache, so that it can be rebuilt when a client restarts
+# rather than waiting for every GUILD_CREATE to be sent again.
+#
+# A snapshot is a gzipped file of lines. The first line is a JSON header, and
+# every line after it is a guild as "<guild id>\t<guild payload as JSON>". The
+# payloads are rebuilt from the cached objects in the same shape that the gateway
+# sends them in, so that they can be loaded through the usual constructors, and
+# the guild ID prefix lets guilds be skipped without parsing their JSON.
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import gzip
+import itertools
+import os
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Collection, Dict, List, Optional
+
+from . import utils
+from .utils import MISSING
+
+if TYPE_CHECKING:
+    from .abc import GuildChannel
+    from .emoji import Emoji
+    from .guild import Guild
+    from .member import Member
+    from .role import Role
+    from .stage_instance import StageInstance
+    from .state import ConnectionState
+    from .sticker import GuildSticker
+    from .threads import Thread
+    from .user import BaseUser
+
+SNAPSHOT_VERSION = 1
+
+
+def _raw(value: Any) -> Any:
+    # Enums and datetimes back into the values that the gateway sends them as
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return getattr(value, 'value', value)
+
+
+def _user_payload(user: BaseUser) -> Dict[str, Any]:
+    return {
+        'id': user.id,
+        'username': user.name,
+        'global_name': user.global_name,
+        'discriminator': user.discriminator,
+        'avatar': user._avatar,
+        'banner': user._banner,
+        'accent_color': user._accent_colour,
+        'public_flags': user._public_flags,
+        'bot': user.bot,
+        'system': user.system,
+    }
+
+
+def _member_payload(member: Member) -> Dict[str, Any]:
+    return {
+        'user': _user_payload(member._user),
+        'roles': list(member._roles),
+        'joined_at': _raw(member.joined_at),
+        'premium_since': _raw(member.premium_since),
+        'nick': member.nick,
+        'pending': member.pending,
+        'avatar': member._avatar,
+        'communication_disabled_until': _raw(member.communication_disabled_until),
+    }
+
+
+def _role_payload(role: Role) -> Dict[str, Any]:
+    data = {
+        'id': role.id,
+        'name': role.name,
+        'permissions': str(role._permissions),
+        'position': role.position,
+        'color': role._colour,
+        'hoist': role.hoist,
+        'managed': role.managed,
+        'mentionable': role.mentionable,
+        'unicode_emoji': role.unicode_emoji,
+        'icon': role._icon,
+    }
+    tags = role.tags
+    if tags is not None:
+        data['tags'] = {'bot_id': tags.bot_id, 'integration_id': tags.integration_id}
+        if tags._premium_subscriber is not MISSING:
+            data['tags']['premium_subscriber'] = tags._premium_subscriber
+    return data
+
+
+def _emoji_payload(emoji: Emoji) -> Dict[str, Any]:
+    return {
+        'id': emoji.id,
+        'name': emoji.name,
+        'require_colons': emoji.require_colons,
+        'managed': emoji.managed,
+        'animated': emoji.animated,
+        'available': emoji.available,
+        'roles': list(emoji._roles),
+        'user': _user_payload(emoji.user) if emoji.user else None,
+    }
+
+
+def _sticker_payload(sticker: GuildSticker) -> Dict[str, Any]:
+    return {
+        'id': sticker.id,
+        'name': sticker.name,
+        'description': sticker.description,
+        'format_type': _raw(sticker.format),
+        'available': sticker.available,
+        'guild_id': sticker.guild_id,
+        'tags': sticker.emoji,
+        'user': _user_payload(sticker.user) if sticker.user else None,
+    }
+
+
+# (payload key, attribute) for everything that the guild channel types read in their _update
+_CHANNEL_FIELDS = (
+    ('name', 'name'),
+    ('parent_id', 'category_id'),
+    ('position', 'position'),
+    ('nsfw', 'nsfw'),
+    ('topic', 'topic'),
+    ('rate_limit_per_user', 'slowmode_delay'),
+    ('last_message_id', 'last_message_id'),
+    ('default_auto_archive_duration', 'default_auto_archive_duration'),
+    ('rtc_region', 'rtc_region'),
+    ('video_quality_mode', 'video_quality_mode'),
+    ('bitrate', 'bitrate'),
+    ('user_limit', 'user_limit'),
+    ('template', 'template'),
+)
+
+
+def _channel_payload(channel: GuildChannel) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        'id': channel.id,
+        'type': _raw(getattr(channel, '_type', None) or channel.type),
+        'permission_overwrites': [i._asdict() for i in channel._overwrites],
+    }
+    for key, attr in _CHANNEL_FIELDS:
+        value = getattr(channel, attr, MISSING)
+        if value is not MISSING:
+            data[key] = _raw(value)
+    tags = getattr(channel, 'available_tags', None)
+    if tags is not None:
+        data['available_tags'] = [
+            {'id': i.id, 'name': i.name, 'emoji_name': i.emoji_name, 'emoji_id': i.emoji_id}
+            for i in tags
+        ]
+    return data
+
+
+def _thread_payload(thread: Thread) -> Dict[str, Any]:
+    return {
+        'id': thread.id,
+        'parent_id': thread.parent_id,
+        'owner_id': thread.owner_id,
+        'name': thread.name,
+        'type': _raw(thread._type),
+        'last_message_id': thread.last_message_id,
+        'rate_limit_per_user': thread.slowmode_delay,
+        'message_count': thread.message_count,
+        'member_count': thread.member_count,
+        'applied_tags': thread.applied_tags,
+        'thread_metadata': {
+            'archived': thread.archived,
+            'archiver_id': thread.archiver_id,
+            'auto_archive_duration': thread.auto_archive_duration,
+            'archive_timestamp': _raw(thread.archive_timestamp),
+            'locked': thread.locked,
+            'invitable': thread.invitable,
+        },
+    }
+
+
+def _stage_instance_payload(instance: StageInstance) -> Dict[str, Any]:
+    return {
+        'id': instance.id,
+        'guild_id': instance.guild.id,
+        'channel_id': instance.channel_id,
+        'topic': instance.topic,
+        'privacy_level': _raw(instance.privacy_level),
+        'discoverable_disabled': instance.discoverable_disabled,
+    }
+
+
+def guild_to_payload(guild: Guild, *, members: bool = True) -> Dict[str, Any]:
+    """Rebuild the GUILD_CREATE payload for a cached guild, without its presences or voice states."""
+
+    data: Dict[str, Any] = {
+        'id': guild.id,
+        'name': guild.name,
+        'region': _raw(guild.region),
+        'verification_level': _raw(guild.verification_level),
+        'default_message_notifications': _raw(guild.default_notifications),
+        'explicit_content_filter': _raw(guild.explicit_content_filter),
+        'afk_timeout': guild.afk_timeout,
+        'afk_channel_id': guild.afk_channel.id if guild.afk_channel else None,
+        'icon': guild._icon,
+        'banner': guild._banner,
+        'splash': guild._splash,
+        'discovery_splash': guild._discovery_splash,
+        'unavailable': guild.unavailable,
+        'owner_id': guild.owner_id,
+        'mfa_level': _raw(guild.mfa_level),
+        'features': guild.features,
+        'system_channel_id': guild._system_channel_id,
+        'system_channel_flags': guild._system_channel_flags,
+        'rules_channel_id': guild._rules_channel_id,
+        'public_updates_channel_id': guild._public_updates_channel_id,
+        'description': guild.description,
+        'max_presences': guild.max_presences,
+        'max_members': guild.max_members,
+        'max_video_channel_users': guild.max_video_channel_users,
+        'premium_tier': guild.premium_tier,
+        'premium_subscription_count': guild.premium_subscription_count,
+        'preferred_locale': guild.preferred_locale,
+        'nsfw_level': _raw(guild.nsfw_level),
+        'roles': [_role_payload(i) for i in guild._roles.values()],
+        'emojis': [_emoji_payload(i) for i in guild.emojis],
+        'stickers': [_sticker_payload(i) for i in guild.stickers],
+        'channels': [_channel_payload(i) for i in guild._channels.values()],
+        'threads': [_thread_payload(i) for i in guild._threads.values()],
+        'stage_instances': [_stage_instance_payload(i) for i in guild._stage_instances.values()],
+    }
+    member_count = getattr(guild, '_member_count', None)
+    if member_count is not None:
+        data['member_count'] = member_count
+    if guild._large is not None:
+        data['large'] = guild._large
+    if members:
+        data['members'] = [_member_payload(i) for i in guild._members.values()]
+    return data
+
+
+async def write_snapshot(
+    state: ConnectionState,
+    path: str,
+    *,
+    members: bool = True,
+    chunk_size: int = 100,
+) -> int:
+    """Write every cached guild to a snapshot file, returning the number of guilds written.
+
+    Guilds are serialised on the event loop ``chunk_size`` at a time, and are
+    compressed and written in an executor so the loop isn't blocked for the
+    whole write.
+    """
+
+    loop = asyncio.get_running_loop()
+    temp_path = f'{path}.tmp'
+    fp = await loop.run_in_executor(None, gzip.open, temp_path, 'wb')
+    written = 0
+    try:
+        header = {
+            'version': SNAPSHOT_VERSION,
+            'saved_at': time.time(),
+            'user': _user_payload(state.user) if state.user else None,
+            'application_id': state.application_id,
+            'shard_count': state.shard_count,
+        }
+        lines = [utils._to_json(header)]
+        guilds = iter(list(state._guilds.values()))
+        while True:
+            chunk_guilds = list(itertools.islice(guilds, chunk_size))
+            if not chunk_guilds and not lines:
+                break
+            for guild in chunk_guilds:
+                if guild.unavailable:
+                    continue
+                lines.append(f'{guild.id}\t{utils._to_json(guild_to_payload(guild, members=members))}')
+            if not lines:
+                continue
+            written += len(lines)
+            chunk = ('\n'.join(lines) + '\n').encode('utf-8')
+            lines = []
+            await loop.run_in_executor(None, fp.write, chunk)
+    finally:
+        await loop.run_in_executor(None, fp.close)
+    os.replace(temp_path, path)
+    return written - 1
+
+
+async def read_snapshot(
+    path: str,
+    *,
+    guild_ids: Optional[Collection[int]] = None,
+    shard_ids: Optional[Collection[int]] = None,
+    shard_count: Optional[int] = None,
+    chunk_size: int = 100,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream the header and then each guild payload from a snapshot file.
+
+    Guilds that aren't in ``guild_ids``, or that don't belong to one of ``shard_ids``
+    out of ``shard_count`` shards (defaulting to the count in the header), are
+    skipped without being parsed.
+    """
+
+    loop = asyncio.get_running_loop()
+    fp = await loop.run_in_executor(None, gzip.open, path, 'rb')
+    try:
+        header_line = await loop.run_in_executor(None, fp.readline)
+        header = utils._from_json(header_line)
+        if header.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f'unsupported snapshot version {header.get("version")!r}')
+        yield header
+
+        shard_count = shard_count or header.get('shard_count') or 1
+        while True:
+            lines: List[bytes] = await loop.run_in_executor(None, lambda: list(itertools.islice(fp, chunk_size)))
+            if not lines:
+                break
+            for line in lines:
+                guild_id, _, payload = line.partition(b'\t')
+                guild_id = int(guild_id)
+                if guild_ids is not None and guild_id not in guild_ids:
+                    continue
+                if shard_ids is not None and (guild_id >> 22) % shard_count not in shard_ids:
+                    continue
+                yield utils._from_json(payload)
+
+            # let everything else run between chunks
+            await asyncio.sleep(0)
+    finally:
+        await loop.run_in_executor(None, fp.close)
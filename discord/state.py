@@ -25,12 +25,12 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
-from collections import deque, OrderedDict
+from collections import OrderedDict
 import copy
 import datetime
 import itertools
 import logging
-from typing import Dict, Optional, TYPE_CHECKING, Union, Callable, Any, List, TypeVar, Coroutine, Sequence, Tuple, Deque
+from typing import Dict, Optional, TYPE_CHECKING, Union, Callable, Any, Collection, List, TypeVar, Coroutine, Sequence, Set, Tuple, Iterator
 import inspect
 
 import os
@@ -57,6 +57,8 @@ from .interactions import Interaction
 from .stage_instance import StageInstance
 from .threads import Thread, ThreadMember
 from .sticker import GuildSticker
+from .snapshot import read_snapshot, write_snapshot
+from .gateway import has_zstd
 
 if TYPE_CHECKING:
     from .abc import PrivateChannel
@@ -65,7 +67,7 @@ if TYPE_CHECKING:
     from .http import HTTPClient
     from .voice_client import VoiceProtocol
     from .client import Client
-    from .gateway import DiscordWebSocket
+    from .gateway import DiscordWebSocket, GatewaySendQueue
 
     from .types.activity import Activity as ActivityPayload
     from .types.channel import DMChannel as DMChannelPayload
@@ -128,6 +130,120 @@ class ChunkRequest:
                 future.set_result(self.buffer)
 
 
+class MessageCache:
+    """
+    The internal message cache. Messages are indexed by their ID and kept in
+    the order that they were added, so lookups, removals and evicting the oldest
+    message are all constant time.
+
+    Optional per-channel and per-guild limits can be set so that one busy
+    channel or guild can't push everyone else's messages out of the cache.
+    """
+
+    __slots__ = ('max_messages', 'max_channel_messages', 'max_guild_messages', '_messages', '_channels', '_guilds')
+
+    def __init__(
+        self,
+        max_messages: int,
+        *,
+        max_channel_messages: Optional[int] = None,
+        max_guild_messages: Optional[int] = None,
+    ) -> None:
+        self.max_messages: int = max_messages
+        self.max_channel_messages: Optional[int] = max_channel_messages
+        self.max_guild_messages: Optional[int] = max_guild_messages
+        self._messages: OrderedDict[int, Message] = OrderedDict()
+        self._channels: Dict[int, OrderedDict[int, Message]] = {}
+        self._guilds: Dict[int, OrderedDict[int, Message]] = {}
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self._messages.values())
+
+    def __reversed__(self) -> Iterator[Message]:
+        return reversed(self._messages.values())
+
+    def __contains__(self, message: Any) -> bool:
+        return self._messages.get(getattr(message, 'id', None)) is message
+
+    def __getitem__(self, idx: int) -> Message:
+        if idx < 0:
+            idx = len(self._messages) + idx
+        if not 0 <= idx < len(self._messages):
+            raise IndexError('message cache index out of range')
+        if idx >= len(self._messages) // 2:
+            return next(itertools.islice(reversed(self._messages.values()), len(self._messages) - idx - 1, None))
+        return next(itertools.islice(self._messages.values(), idx, None))
+
+    def index(self, value: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        start, stop, _ = slice(start, stop).indices(len(self._messages))
+        for idx, message in enumerate(itertools.islice(self._messages.values(), start, stop), start):
+            if message is value or message == value:
+                return idx
+        raise ValueError(f'{value!r} is not in the message cache')
+
+    def count(self, value: Any) -> int:
+        return sum(1 for message in self._messages.values() if message is value or message == value)
+
+    def get(self, message_id: Optional[int]) -> Optional[Message]:
+        return self._messages.get(message_id)  # type: ignore
+
+    def append(self, message: Message) -> None:
+        self.remove(message.id)
+        self._messages[message.id] = message
+
+        channel = self._channels.setdefault(message.channel.id, OrderedDict())
+        channel[message.id] = message
+        if self.max_channel_messages is not None and len(channel) > self.max_channel_messages:
+            self.remove(next(iter(channel)))
+
+        guild_id = message.guild.id if message.guild is not None else None
+        if guild_id is not None:
+            guild = self._guilds.setdefault(guild_id, OrderedDict())
+            guild[message.id] = message
+            if self.max_guild_messages is not None and len(guild) > self.max_guild_messages:
+                self.remove(next(iter(guild)))
+
+        if len(self._messages) > self.max_messages:
+            self.remove(next(iter(self._messages)))
+
+    def remove(self, message_id: int) -> Optional[Message]:
+        message = self._messages.pop(message_id, None)
+        if message is None:
+            return None
+
+        channel_id = message.channel.id
+        channel = self._channels.get(channel_id)
+        if channel is not None:
+            channel.pop(message_id, None)
+            if not channel:
+                del self._channels[channel_id]
+
+        if message.guild is not None:
+            guild_id = message.guild.id
+            guild = self._guilds.get(guild_id)
+            if guild is not None:
+                guild.pop(message_id, None)
+                if not guild:
+                    del self._guilds[guild_id]
+
+        return message
+
+    def remove_guild(self, guild_id: int) -> None:
+        guild = self._guilds.pop(guild_id, None)
+        if guild is None:
+            return
+        for message_id in list(guild):
+            self.remove(message_id)
+
+    def clear(self) -> None:
+        self._messages.clear()
+        self._channels.clear()
+        self._guilds.clear()
+
+
 _log = logging.getLogger(__name__)
 
 
@@ -159,6 +275,8 @@ class ConnectionState:
         self.max_messages: Optional[int] = options.get('max_messages', 1000)
         if self.max_messages is not None and self.max_messages <= 0:
             self.max_messages = 1000
+        self.max_channel_messages: Optional[int] = options.get('max_channel_messages')
+        self.max_guild_messages: Optional[int] = options.get('max_guild_messages')
 
         self.dispatch: Callable = dispatch
         self.handlers: Dict[str, Callable] = handlers
@@ -170,6 +288,14 @@ class ConnectionState:
         self.guild_ready_timeout: float = options.get('guild_ready_timeout', 2.0)
         if self.guild_ready_timeout < 0:
             raise ValueError('guild_ready_timeout cannot be negative')
+        self.heartbeat_mode: str = options.get('heartbeat_mode', 'thread')
+        if self.heartbeat_mode not in ('thread', 'asyncio'):
+            raise ValueError('heartbeat_mode must be either \'thread\' or \'asyncio\'')
+        self.gateway_compression: Optional[str] = options.get('gateway_compression', 'zlib-stream')
+        if self.gateway_compression not in ('zlib-stream', 'zstd-stream', None):
+            raise ValueError('gateway_compression must be \'zlib-stream\', \'zstd-stream\' or None')
+        if self.gateway_compression == 'zstd-stream' and not has_zstd:
+            raise RuntimeError('zstandard library needed in order to use zstd-stream compression')
 
         allowed_mentions = options.get('allowed_mentions')
 
@@ -177,7 +303,17 @@ class ConnectionState:
             raise TypeError('allowed_mentions parameter must be AllowedMentions')
 
         self.allowed_mentions: Optional[AllowedMentions] = allowed_mentions
-        self._chunk_requests: Dict[Union[int, str], ChunkRequest] = {}
+        self._chunk_requests: Dict[Union[int, str, Tuple[Any, ...]], ChunkRequest] = {}
+
+        # gateway traffic counters, incremented by the websockets as frames come and go
+        self.gateway_events_received: Dict[str, int] = {}
+        self.gateway_payloads_sent: Dict[int, int] = {}
+        # the send queue for each shard's websocket, so their depths can be reported
+        self.gateway_send_queues: Dict[Optional[int], GatewaySendQueue] = {}
+        # the shards that are resuming a session saved by a previous process, and whether
+        # any shard has identified instead - READY is dispatched on RESUMED if none have
+        self._restored_sessions: Set[Optional[int]] = set()
+        self._identified: bool = False
 
         activity = options.get('activity', None)
         if activity:
@@ -234,6 +370,17 @@ class ConnectionState:
 
         self.clear()
 
+    def consume_gateway_counters(self) -> Tuple[Dict[str, int], Dict[int, int]]:
+        """
+        Returns how many of each dispatch event (by ``t``) have been received and
+        how many of each payload (by ``op``) have been sent since the last call,
+        resetting both counters.
+        """
+
+        received, sent = self.gateway_events_received, self.gateway_payloads_sent
+        self.gateway_events_received, self.gateway_payloads_sent = {}, {}
+        return received, sent
+
     def clear(self) -> None:
         self.user: Optional[ClientUser] = None
         # Originally, this code used WeakValueDictionary to maintain references to the
@@ -252,6 +399,8 @@ class ConnectionState:
         self._emojis: Dict[int, Emoji] = {}
         self._stickers: Dict[int, GuildSticker] = {}
         self._guilds: Dict[int, Guild] = {}
+        # guilds loaded from a snapshot that haven't been refreshed by a GUILD_CREATE yet
+        self._snapshot_guilds: Set[int] = set()
 
         self._voice_clients: Dict[int, VoiceProtocol] = {}
 
@@ -260,9 +409,13 @@ class ConnectionState:
         # extra dict to look up private channels by user id
         self._private_channels_by_user: Dict[int, DMChannel] = {}
         if self.max_messages is not None:
-            self._messages: Optional[Deque[Message]] = deque(maxlen=self.max_messages)
+            self._messages: Optional[MessageCache] = MessageCache(
+                self.max_messages,
+                max_channel_messages=self.max_channel_messages,
+                max_guild_messages=self.max_guild_messages,
+            )
         else:
-            self._messages: Optional[Deque[Message]] = None
+            self._messages: Optional[MessageCache] = None
 
     def process_chunk_requests(self, guild_id: int, nonce: Optional[str], members: List[Member], complete: bool) -> None:
         removed = []
@@ -438,13 +591,88 @@ class ConnectionState:
                 self._private_channels_by_user.pop(recipient.id, None)
 
     def _get_message(self, msg_id: Optional[int]) -> Optional[Message]:
-        return utils.find(lambda m: m.id == msg_id, reversed(self._messages)) if self._messages else None
+        return self._messages.get(msg_id) if self._messages else None
 
     def _add_guild_from_data(self, data: GuildPayload) -> Guild:
         guild = Guild(data=data, state=self)
         self._add_guild(guild)
         return guild
 
+    async def save_snapshot(self, path: str, *, members: bool = True) -> int:
+        return await write_snapshot(self, path, members=members)
+
+    async def load_snapshot(
+        self,
+        path: str,
+        *,
+        guild_ids: Optional[Collection[int]] = None,
+        shard_ids: Optional[Collection[int]] = None,
+        members: bool = True,
+    ) -> int:
+        snapshot = read_snapshot(path, guild_ids=guild_ids, shard_ids=shard_ids, shard_count=self.shard_count)
+        header = await snapshot.__anext__()
+        if self.user is None and header.get('user'):
+            self.user = ClientUser(state=self, data=header['user'])
+        if self.application_id is None:
+            self.application_id = header.get('application_id')
+
+        loaded = 0
+        async for data in snapshot:
+            if not members:
+                data.pop('members', None)
+            guild = self._add_guild_from_data(data)
+            self._snapshot_guilds.add(guild.id)
+            loaded += 1
+        return loaded
+
+    def _keep_snapshot_guild(self, guild: Guild) -> None:
+        # A guild loaded from a snapshot is kept through READY until its
+        # GUILD_CREATE arrives, rather than replaced with an unavailable guild
+        self._add_guild(guild)
+        self._snapshot_guilds.add(guild.id)
+        for emoji in guild.emojis:
+            self._emojis[emoji.id] = emoji
+        for sticker in guild.stickers:
+            self._stickers[sticker.id] = sticker
+        for member in guild._members.values():
+            self._users.setdefault(member.id, member._user)
+
+    def _refresh_snapshot_guild(self, guild: Guild, data: GuildPayload) -> Guild:
+        # Update a guild loaded from a snapshot in place, keeping the members that
+        # were loaded with it so that they're usable before the guild is chunked
+        self._snapshot_guilds.discard(guild.id)
+        for emoji in guild.emojis:
+            self._emojis.pop(emoji.id, None)
+        for sticker in guild.stickers:
+            self._stickers.pop(sticker.id, None)
+        guild._channels.clear()
+        guild._threads.clear()
+        guild._voice_states.clear()
+        guild._from_data(data)
+        return guild
+
+    def _drop_snapshot_guilds(self, guilds: List[Guild]) -> None:
+        # Remove guilds loaded from a snapshot that READY no longer lists, since
+        # we were removed from them while offline, along with any users that
+        # were only cached through them
+        if not guilds:
+            return
+        dropped_users: Set[int] = set()
+        for guild in guilds:
+            self._snapshot_guilds.discard(guild.id)
+            if self._messages is not None:
+                self._messages.remove_guild(guild.id)
+            self._remove_guild(guild)
+            dropped_users.update(guild._members)
+
+        dropped_users.discard(self.self_id)  # type: ignore
+        for guild in self._guilds.values():
+            if not dropped_users:
+                return
+            dropped_users.difference_update(guild._members)
+        for user_id in dropped_users:
+            self._users.pop(user_id, None)
+
     def _guild_needs_chunking(self, guild: Guild) -> bool:
         # If presences are enabled then we get back the old guild.large behaviour
         return self._chunk_guilds and not guild.chunked and not (self._intents.presences and not guild.large)
@@ -473,17 +701,28 @@ class ConnectionState:
         if ws is None:
             raise RuntimeError('Somehow do not have a websocket for this guild_id')
 
-        request = ChunkRequest(guild.id, self.loop, self._get_guild, cache=cache)
-        self._chunk_requests[request.nonce] = request
+        # Identical queries that are still running share one request
+        key = (guild_id, query, limit, tuple(user_ids or ()), presences, cache)
+        request = self._chunk_requests.get(key)
 
         try:
-            # start the query operation
-            await ws.request_chunks(
-                guild_id, query=query, limit=limit, user_ids=user_ids, presences=presences, nonce=request.nonce
-            )
+            if request is None:
+                request = ChunkRequest(guild.id, self.loop, self._get_guild, cache=cache)
+                self._chunk_requests[key] = request
+
+                # start the query operation
+                try:
+                    await ws.request_chunks(
+                        guild_id, query=query, limit=limit, user_ids=user_ids, presences=presences, nonce=request.nonce
+                    )
+                except BaseException:
+                    del self._chunk_requests[key]
+                    raise
             return await asyncio.wait_for(request.wait(), timeout=30.0)
         except asyncio.TimeoutError:
             _log.warning('Timed out waiting for chunks with query %r and limit %d for guild_id %d', query, limit, guild_id)
+            if self._chunk_requests.get(key) is request:
+                del self._chunk_requests[key]
             raise
 
     async def _delay_ready(self) -> None:
@@ -532,11 +771,28 @@ class ConnectionState:
         finally:
             self._ready_task = None
 
+    def _restoring_session(self, shard_id: Optional[int], restored: bool) -> None:
+        if restored:
+            self._restored_sessions.add(shard_id)
+        else:
+            self._identified = True
+
+    def _resumed_restored_session(self, shard_id: Optional[int]) -> bool:
+        # Whether the last of the restored sessions has resumed, in which case
+        # nothing else is going to dispatch READY
+        if shard_id not in self._restored_sessions:
+            return False
+        self._restored_sessions.discard(shard_id)
+        return not self._restored_sessions and not self._identified and self._ready_task is None
+
     def parse_ready(self, data) -> None:
+        self._restored_sessions.discard(data.get('__shard_id__'))
+        self._identified = True
         if self._ready_task is not None:
             self._ready_task.cancel()
 
         self._ready_state = asyncio.Queue()
+        snapshot_guilds = {i: self._guilds[i] for i in self._snapshot_guilds if i in self._guilds}
         self.clear()
         self.user = ClientUser(state=self, data=data['user'])
         self.store_user(data['user'])
@@ -552,13 +808,20 @@ class ConnectionState:
                 self.application_flags = ApplicationFlags._from_value(application['flags'])  # type: ignore
 
         for guild_data in data['guilds']:
-            self._add_guild_from_data(guild_data)
+            snapshot_guild = snapshot_guilds.get(int(guild_data['id']))
+            if snapshot_guild is not None:
+                self._keep_snapshot_guild(snapshot_guild)
+            else:
+                self._add_guild_from_data(guild_data)
 
         self.dispatch('connect')
         self._ready_task = asyncio.create_task(self._delay_ready())
 
     def parse_resumed(self, data) -> None:
         self.dispatch('resumed')
+        if self._resumed_restored_session(data.get('__shard_id__')):
+            self.call_handlers('ready')
+            self.dispatch('ready')
 
     def parse_message_create(self, data) -> None:
         channel, _ = self._get_guild_channel(data)
@@ -578,12 +841,12 @@ class ConnectionState:
         self.dispatch('raw_message_delete', raw)
         if self._messages is not None and found is not None:
             self.dispatch('message_delete', found)
-            self._messages.remove(found)
+            self._messages.remove(found.id)
 
     def parse_message_delete_bulk(self, data) -> None:
         raw = RawBulkMessageDeleteEvent(data)
         if self._messages:
-            found_messages = [message for message in self._messages if message.id in raw.message_ids]
+            found_messages = [message for message in map(self._messages.get, raw.message_ids) if message is not None]
         else:
             found_messages = []
         raw.cached_messages = found_messages
@@ -592,7 +855,7 @@ class ConnectionState:
             self.dispatch('bulk_message_delete', found_messages)
             for msg in found_messages:
                 # self._messages won't be None here
-                self._messages.remove(msg)  # type: ignore
+                self._messages.remove(msg.id)  # type: ignore
 
     def parse_message_update(self, data) -> None:
         raw = RawMessageUpdateEvent(data)
@@ -753,6 +1016,7 @@ class ConnectionState:
             channel = guild.get_channel(channel_id)
             if channel is not None:
                 guild._remove_channel(channel)
+                guild._invalidate_permissions(channel_id=channel_id)
                 self.dispatch('guild_channel_delete', channel)
 
     def parse_channel_update(self, data) -> None:
@@ -773,6 +1037,7 @@ class ConnectionState:
             if channel is not None:
                 old_channel = copy.copy(channel)
                 channel._update(guild, data)
+                guild._invalidate_permissions(channel_id=channel_id)
                 self.dispatch('guild_channel_update', old_channel, channel)
             else:
                 _log.debug('CHANNEL_UPDATE referencing an unknown channel ID: %s. Discarding.', channel_id)
@@ -972,6 +1237,7 @@ class ConnectionState:
 
             user_id = int(data['user']['id'])
             member = guild.get_member(user_id)
+            guild._invalidate_permissions(member_id=user_id)
             if member is not None:
                 guild._remove_member(member)  # type: ignore
                 self.dispatch('member_remove', member)
@@ -986,6 +1252,7 @@ class ConnectionState:
             _log.debug('GUILD_MEMBER_UPDATE referencing an unknown guild ID: %s. Discarding.', data['guild_id'])
             return
 
+        guild._invalidate_permissions(member_id=user_id)
         member = guild.get_member(user_id)
         if member is not None:
             old_member = Member._copy(member)
@@ -1034,6 +1301,12 @@ class ConnectionState:
         self.dispatch('guild_stickers_update', guild, before_stickers, guild.stickers)
 
     def _get_create_guild(self, data):
+        guild_id = int(data['id'])
+        if guild_id in self._snapshot_guilds:
+            guild = self._get_guild(guild_id)
+            if guild is not None:
+                return self._refresh_snapshot_guild(guild, data)
+
         if data.get('unavailable') is False:
             # GUILD_CREATE with unavailable in the response
             # usually means that the guild has become available
@@ -1123,19 +1396,7 @@ class ConnectionState:
 
         # do a cleanup of the messages cache
         if self._messages is not None:
-            to_delete: List[int] = []
-
-            idx: int
-            msg: Message
-
-            for idx, msg in enumerate(self._messages):
-                if msg.guild == guild:
-                    to_delete.append(idx)
-
-            del_idx: int
-
-            for del_idx in reversed(to_delete):
-                del self._messages[del_idx]
+            self._messages.remove_guild(guild.id)
 
         self._remove_guild(guild)
         self.dispatch('guild_remove', guild)
@@ -1182,6 +1443,7 @@ class ConnectionState:
             except KeyError:
                 return
             else:
+                guild._invalidate_permissions()
                 self.dispatch('guild_role_delete', role)
         else:
             _log.debug('GUILD_ROLE_DELETE referencing an unknown guild ID: %s. Discarding.', data['guild_id'])
@@ -1195,6 +1457,7 @@ class ConnectionState:
             if role is not None:
                 old_role = copy.copy(role)
                 role._update(role_data)
+                guild._invalidate_permissions()
                 self.dispatch('guild_role_update', old_role, role)
         else:
             _log.debug('GUILD_ROLE_UPDATE referencing an unknown guild ID: %s. Discarding.', data['guild_id'])
@@ -1413,6 +1676,7 @@ class AutoShardedConnectionState(ConnectionState):
         super().__init__(*args, **kwargs)
         self.shard_ids: Union[List[int], range] = []
         self.shards_launched: asyncio.Event = asyncio.Event()
+        self._resume_ready_task: Optional[asyncio.Task] = None
 
     def _update_message_references(self) -> None:
         # self._messages won't be None when this is called
@@ -1508,6 +1772,8 @@ class AutoShardedConnectionState(ConnectionState):
         self.dispatch('ready')
 
     def parse_ready(self, data) -> None:
+        self._restored_sessions.discard(data['__shard_id__'])
+        self._identified = True
         if not hasattr(self, '_ready_state'):
             self._ready_state = asyncio.Queue()
 
@@ -1524,7 +1790,21 @@ class AutoShardedConnectionState(ConnectionState):
                 self.application_id = utils._get_as_snowflake(application, 'id')
                 self.application_flags = ApplicationFlags._from_value(application['flags'])
 
+        # snapshot guilds on this shard that READY doesn't list were left while we were offline
+        shard_id = data['__shard_id__']
+        ready_guild_ids = {int(guild_data['id']) for guild_data in data['guilds']}
+        self._drop_snapshot_guilds([
+            self._guilds[guild_id]
+            for guild_id in self._snapshot_guilds
+            if guild_id in self._guilds
+            and guild_id not in ready_guild_ids
+            and (guild_id >> 22) % self.shard_count == shard_id  # type: ignore
+        ])
+
         for guild_data in data['guilds']:
+            guild_id = int(guild_data['id'])
+            if guild_id in self._snapshot_guilds and guild_id in self._guilds:
+                continue
             self._add_guild_from_data(guild_data)
 
         if self._messages:
@@ -1539,3 +1819,18 @@ class AutoShardedConnectionState(ConnectionState):
     def parse_resumed(self, data) -> None:
         self.dispatch('resumed')
         self.dispatch('shard_resumed', data['__shard_id__'])
+        if self._resumed_restored_session(data['__shard_id__']) and self._resume_ready_task is None:
+            self._resume_ready_task = asyncio.create_task(self._ready_after_resume())
+
+    async def _ready_after_resume(self) -> None:
+        try:
+            # shards in later launch rounds may not have been restored yet, so wait for them
+            await self.shards_launched.wait()
+            if self._restored_sessions or self._identified or self._ready_task is not None:
+                return
+            for shard_id in self.shard_ids:
+                self.dispatch('shard_ready', shard_id)
+            self.call_handlers('ready')
+            self.dispatch('ready')
+        finally:
+            self._resume_ready_task = None
@@ -29,6 +29,7 @@ import logging
 import asyncio
 import json
 import re
+import time
 
 from urllib.parse import quote as urlquote
 from typing import Any, Dict, List, Literal, NamedTuple, Optional, TYPE_CHECKING, Tuple, Union, overload
@@ -43,7 +44,7 @@ from ..message import Message
 from ..enums import try_enum, WebhookType
 from ..user import BaseUser, User
 from ..asset import Asset
-from ..http import Route
+from ..http import Route, RequestInfo, RequestHook, _call_request_hooks
 from ..mixins import Hashable
 from ..channel import PartialMessageable
 
@@ -98,6 +99,16 @@ class AsyncDeferredLock:
 class AsyncWebhookAdapter:
     def __init__(self):
         self._locks: weakref.WeakValueDictionary[Any, asyncio.Lock] = weakref.WeakValueDictionary()
+        self.request_hooks: List[RequestHook] = []
+
+    def add_request_hook(self, hook: RequestHook) -> None:
+        self.request_hooks.append(hook)
+
+    def remove_request_hook(self, hook: RequestHook) -> None:
+        try:
+            self.request_hooks.remove(hook)
+        except ValueError:
+            pass
 
     async def request(
         self,
@@ -148,8 +159,12 @@ class AsyncWebhookAdapter:
                         form_data.add_field(**p)
                     to_send = form_data
 
+                status: Optional[int] = None
+                started = time.perf_counter()
+                finished: Optional[float] = None
                 try:
                     async with session.request(method, url, data=to_send, headers=headers, params=params) as response:
+                        status = response.status
                         _log.debug(
                             'Webhook ID %s with %s %s has returned status code %s',
                             webhook_id,
@@ -158,6 +173,7 @@ class AsyncWebhookAdapter:
                             response.status,
                         )
                         data = (await response.text(encoding='utf-8')) or None
+                        finished = time.perf_counter()
                         if data and response.headers['Content-Type'] == 'application/json':
                             data = json.loads(data)
 
@@ -198,6 +214,11 @@ class AsyncWebhookAdapter:
                         continue
                     raise
 
+                finally:
+                    if self.request_hooks:
+                        info = RequestInfo(route, status, str(webhook_id), attempt, (finished or time.perf_counter()) - started)
+                        _call_request_hooks(self.request_hooks, info)
+
             if response:
                 if response.status >= 500:
                     raise DiscordServerError(response, data)
@@ -53,6 +53,7 @@ extras_require = {
         'aiodns>=1.1',
         'Brotli',
         'cchardet',
+        'zstandard',
     ],
     'vbu': [
         # Main build